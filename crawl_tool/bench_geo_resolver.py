@@ -0,0 +1,51 @@
+import time
+import argparse
+import numpy as np
+from geo_resolver import RegionResolver
+
+# 기존 방식에 가까운 기준선: 점마다 모든 경계를 순서대로 검사
+def naive_resolve(resolver, lngs, lats):
+    from shapely.geometry import Point
+    result = []
+    for lng, lat in zip(lngs, lats):
+        point = Point(lng, lat)
+        result.append(next((code for code, geometry in zip(resolver.codes, resolver.geometries)
+                            if geometry.intersects(point)), None))
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="좌표 -> SIG_CD 변환 성능 측정")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--naive-points", type=int, default=2_000, help="기준선 측정에 쓸 점 개수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    resolver = RegionResolver()
+    load_time = time.perf_counter() - started
+
+    # 경계 상자 안에서 균일하게 뽑은 합성 좌표 (바다 위 점은 None이 된다)
+    rng = np.random.default_rng(args.seed)
+    minx, miny, maxx, maxy = np.array([geometry.bounds for geometry in resolver.geometries]).T
+    lngs = rng.uniform(minx.min(), maxx.max(), args.points)
+    lats = rng.uniform(miny.min(), maxy.max(), args.points)
+
+    started = time.perf_counter()
+    codes = resolver.resolve_points(lngs, lats)
+    index_time = time.perf_counter() - started
+    matched = sum(code is not None for code in codes)
+
+    n = min(args.naive_points, args.points)
+    started = time.perf_counter()
+    naive_codes = naive_resolve(resolver, lngs[:n], lats[:n])
+    naive_time = time.perf_counter() - started
+    mismatches = sum(1 for a, b in zip(codes[:n], naive_codes) if a != b)
+
+    print(f"load geojson + build index: {load_time:.3f}s")
+    print(f"STRtree: {args.points} points in {index_time:.3f}s "
+          f"({args.points / index_time:,.0f} points/s), {matched} inside a region")
+    print(f"naive:   {n} points in {naive_time:.3f}s ({n / naive_time:,.0f} points/s), "
+          f"{mismatches} mismatches against STRtree")
+
+if __name__ == "__main__":
+    main()
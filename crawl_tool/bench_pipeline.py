@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import subprocess
+import tracemalloc
+from datetime import datetime
+from instrument import peak_rss
+
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+CASES = ["unique_area", "issac_csv_collect", "filter_csv", "compare"]
+REGRESSION_THRESHOLD = 0.10  # 이전 결과보다 10% 이상 느려지거나 메모리를 더 쓰면 표시
+
+# 벤치마크 대상 함수 (모듈 import는 측정 전에 끝내 둔다), 결과 파일은 work_dir 아래에 쓴다
+def load_case(name, data_dir, work_dir):
+    if name == "unique_area":
+        import unique_area
+        return lambda: unique_area.process_all_csv(os.path.join(data_dir, "store_info"),
+                                                   os.path.join(work_dir, "unique.csv"))
+    if name == "issac_csv_collect":
+        import issac_csv_collect
+        return lambda: issac_csv_collect.process_all_csv(os.path.join(data_dir, "store_info"),
+                                                         os.path.join(work_dir, "issac.csv"))
+    if name == "filter_csv":
+        # filter_csv는 현재 폴더의 CSV를 처리하므로 입력을 작업 폴더로 복사한다
+        import filter_csv
+        brand_dir = os.path.join(work_dir, "brands")
+        shutil.copytree(os.path.join(data_dir, "brands"), brand_dir)
+        os.chdir(brand_dir)
+        return lambda: filter_csv.process_all_csv_in_directory("sample.csv")
+    if name == "compare":
+        import compare
+        return lambda: compare.compare_files(os.path.join(data_dir, "compare", "hu.csv"),
+                                             os.path.join(data_dir, "compare", "extracted_sig_data.csv"),
+                                             os.path.join(work_dir, "hu.csv"))
+    raise ValueError(f"Unknown benchmark case: {name}")
+
+# 자식 프로세스에서 실행: 시간/CPU/최대 RSS (+ tracemalloc 최대값) 측정
+def measure(name, data_dir, work_dir, trace_memory=False):
+    sys.path.insert(0, TOOL_DIR)
+    os.makedirs(work_dir, exist_ok=True)
+    run = load_case(name, data_dir, work_dir)
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    run()
+    result = {
+        "wall_s": time.perf_counter() - started,
+        "cpu_s": time.process_time() - cpu_started,
+        "peak_rss": peak_rss()
+    }
+    if trace_memory:
+        result["traced_peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+# 케이스마다 새 프로세스를 띄워서 최대 RSS가 섞이지 않게 한다
+def run_isolated(name, data_dir, work_root, trace_memory, use_cache):
+    work_dir = os.path.join(work_root, name)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    env = dict(os.environ, STORE_CACHE="1" if use_cache else "0",
+               STORE_CACHE_DIR=os.path.join(work_root, ".store_cache"))
+    command = [sys.executable, os.path.abspath(__file__), "--child", name,
+               "--data", os.path.abspath(data_dir), "--work", os.path.abspath(work_dir)]
+    if trace_memory:
+        command.append("--trace-memory")
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, encoding="utf-8")
+    if completed.returncode != 0:
+        raise Exception(f"{name} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def data_rows(data_dir):
+    info_file = os.path.join(data_dir, "synth_info.json")
+    if os.path.exists(info_file):
+        with open(info_file, mode="r", encoding="utf-8") as file:
+            return json.load(file).get("rows")
+    return None
+
+def format_bytes(value):
+    return f"{value / 1024 ** 2:.1f} MB" if value is not None else "-"
+
+# 이전 결과와 비교해 느려졌거나 메모리가 늘어난 항목을 표시
+def compare_results(previous, current, threshold=REGRESSION_THRESHOLD):
+    regressions = []
+    for name, result in current["cases"].items():
+        before = previous.get("cases", {}).get(name)
+        if not before:
+            continue
+        for metric in ("wall_s", "peak_rss", "traced_peak"):
+            old, new = before.get(metric), result.get(metric)
+            if old and new and new > old * (1 + threshold):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 데이터로 파이프라인 단계별 시간/메모리를 측정합니다.")
+    parser.add_argument("--data", default=os.path.join("bench_data", "10k"),
+                        help="synth_data.py로 만든 폴더 (없으면 --rows 크기로 생성)")
+    parser.add_argument("--rows", default="10k", help="데이터를 새로 만들 때 행 수 (10k, 1m, 10m)")
+    parser.add_argument("--cases", nargs="*", default=CASES, choices=CASES)
+    parser.add_argument("--repeat", type=int, default=1, help="케이스별 반복 횟수 (최소값 기록)")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc으로 Python 할당 최대값도 측정 (느려짐)")
+    parser.add_argument("--cache", action="store_true", help="Parquet 캐시(store_cache) 사용")
+    parser.add_argument("--work", default=None, help="결과 파일을 쓸 폴더 (기본: <data>/_work)")
+    parser.add_argument("--output", default=None, help="결과 JSON (기본: bench_results/<시각>.json)")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.data, args.work, args.trace_memory)))
+        return
+
+    if not os.path.isdir(args.data):
+        sys.path.insert(0, TOOL_DIR)
+        import synth_data
+        synth_data.generate(args.data, synth_data.parse_rows(args.rows))
+
+    work_root = args.work or os.path.join(args.data, "_work")
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "data": os.path.abspath(args.data),
+        "rows": data_rows(args.data),
+        "cache": args.cache,
+        "cases": {}
+    }
+    for name in args.cases:
+        runs = [run_isolated(name, args.data, work_root, args.trace_memory, args.cache) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["wall_s"])
+        best["runs"] = [run["wall_s"] for run in runs]
+        results["cases"][name] = best
+        print(f"{name:<20}{best['wall_s']:>9.3f}s wall{best['cpu_s']:>9.3f}s cpu  "
+              f"peak RSS {format_bytes(best['peak_rss'])}"
+              + (f", traced {format_bytes(best['traced_peak'])}" if "traced_peak" in best else ""))
+
+    output = args.output or os.path.join("bench_results", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, mode="w", encoding="utf-8") as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, mode="r", encoding="utf-8") as file:
+            previous = json.load(file)
+        regressions = compare_results(previous, results)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old:.3f} -> {new:.3f} (+{new / old - 1:.0%})")
+        if not regressions:
+            print(f"No regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import random
+import timeit
+import pandas as pd
+from region_names import PROVINCE_ALIASES, normalize_province_series
+
+# 기존 방식: 호출할 때마다 딕셔너리를 만들고 선형 탐색
+def legacy_replace_location_name(name):
+    replacements = {
+        "서울": ["서울특별시", "서울", "서울시"],
+        "세종": ["세종특별자치시", "세종", "세종시"],
+        "울산": ["울산광역시", "울산", "울산시"],
+        "인천": ["인천광역시", "인천", "인천시"],
+        "전남": ["전라남도", "전남"],
+        "전북": ["전북특별자치도", "전라북도", "전북"],
+        "제주": ["제주특별자치도", "제주", "제주시"],
+        "충남": ["충청남도", "충남", "충남시"],
+        "충북": ["충청북도", "충북"],
+        "강원": ["강원특별자치도", "강원", "강원도", "강원시"],
+        "경기": ["경기도", "경기"],
+        "경남": ["경상남도", "경남"],
+        "경북": ["경상북도", "경북"],
+        "광주": ["광주광역시", "광주"],
+        "대구": ["대구광역시", "대구", "대구광역", "대구시"],
+        "대전": ["대전광역시", "대전", "대전시"],
+        "부산": ["부산광역시", "부산", "부산시"]
+    }
+
+    for key, values in replacements.items():
+        if name in values:
+            return key
+    return name
+
+# 상가정보의 시도명 열과 비슷한 분포의 테스트 데이터 생성
+def make_sample(rows, seed=0):
+    rng = random.Random(seed)
+    names = [values[0] for values in PROVINCE_ALIASES.values()]
+    return pd.Series([rng.choice(names) for _ in range(rows)], name='시도명')
+
+def main():
+    parser = argparse.ArgumentParser(description="시도명 통일 방식 성능 비교")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    series = make_sample(args.rows)
+
+    legacy = series.apply(legacy_replace_location_name)
+    vectorized = normalize_province_series(series)
+    assert legacy.equals(vectorized), "결과가 기존 방식과 다릅니다"
+
+    legacy_time = min(timeit.repeat(lambda: series.apply(legacy_replace_location_name),
+                                    number=1, repeat=args.repeat))
+    vectorized_time = min(timeit.repeat(lambda: normalize_province_series(series),
+                                        number=1, repeat=args.repeat))
+
+    print(f"rows: {args.rows}")
+    print(f"apply (legacy): {legacy_time:.3f}s")
+    print(f"vectorized:     {vectorized_time:.3f}s")
+    print(f"speedup:        {legacy_time / vectorized_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
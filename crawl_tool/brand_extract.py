@@ -0,0 +1,130 @@
+import os
+import re
+import csv
+import glob
+import argparse
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from region_names import normalize_province_series, SEJONG, SEJONG_AREA
+from store_reader import iter_chunks, chunksize_for_memory, parse_memory
+
+# 브랜드 코드 -> 상호명 패턴 (data/<date>/<코드>.csv 파일명과 동일한 코드 사용)
+BRAND_PATTERNS = {
+    "issac": ["이삭토스트"],
+    "bgk": ["버거킹"],
+    "kfc": ["KFC", "케이에프씨"],
+    "mcdonalds": ["맥도날드"],
+    "subway": ["써브웨이", "서브웨이"],
+    "lotteria": ["롯데리아"],
+    "momstouch": ["맘스터치"]
+}
+SOURCE_COLUMNS = ['상호명', '도로명주소', '시도명', '시군구명']
+OUTPUT_HEADER = ["store", "addr", "prov", "area", "div"]
+
+_compiled = {}
+
+# 브랜드별 패턴을 하나의 정규식으로 합친다
+# 매칭 여부 확인용(그룹 없음)과 브랜드 판별용(이름 있는 그룹) 두 가지를 만든다
+def compile_patterns(brand_patterns):
+    key = tuple((brand, tuple(patterns)) for brand, patterns in brand_patterns)
+    if key not in _compiled:
+        alternatives = []
+        named = []
+        for brand, patterns in brand_patterns:
+            joined = "|".join(re.escape(p) for p in patterns)
+            alternatives.append(joined)
+            named.append(f"(?P<{brand}>{joined})")
+        _compiled[key] = ("|".join(alternatives), re.compile("|".join(named)))
+    return _compiled[key]
+
+# chunk에서 브랜드에 해당하는 행을 store,addr,prov,area,div 형태로 변환
+def extract_chunk(chunk, brand_patterns):
+    plain, named = compile_patterns(brand_patterns)
+    names = chunk['상호명']
+    mask = names.str.contains(plain, na=False, regex=True)
+    if not mask.any():
+        return []
+
+    matched = chunk[mask].astype(object)
+    brands = matched['상호명'].map(lambda name: named.search(name).lastgroup)
+    prov = normalize_province_series(matched['시도명'])
+    area = matched['시군구명'].where(prov != SEJONG, SEJONG_AREA)
+
+    rows = []
+    for brand, store, addr, p, a in zip(brands, matched['상호명'], matched['도로명주소'], prov, area):
+        p = "" if p != p else p  # NaN 처리
+        a = "" if a != a else a
+        addr = "" if addr != addr else addr
+        rows.append((brand, [store, addr, p, a, f"{p} {a}".strip()]))
+    return rows
+
+# 파일 하나를 한 번만 읽으면서 모든 브랜드를 추출 (프로세스 풀에서 실행)
+def scan_file(file_path, brand_patterns, max_memory=None, workers=1):
+    chunksize = chunksize_for_memory(file_path, max_memory, workers)
+    results = {}
+    for chunk in iter_chunks(file_path, SOURCE_COLUMNS, chunksize):
+        for brand, row in extract_chunk(chunk, brand_patterns):
+            results.setdefault(brand, []).append(row)
+    return file_path, results
+
+# 폴더 내 모든 CSV 파일에서 브랜드별 매장을 추출하여 output_dir/<브랜드>.csv로 저장
+def extract_all(folder_path, output_dir, brand_patterns=BRAND_PATTERNS, max_memory=None, max_workers=None):
+    csv_files = sorted(glob.glob(os.path.join(folder_path, r"*.csv")))
+    brand_patterns = list(brand_patterns.items())
+    max_workers = max_workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    files = {}
+    writers = {}
+    counts = {}
+    try:
+        for brand, _ in brand_patterns:
+            path = os.path.join(output_dir, f"{brand}.csv")
+            files[brand] = open(path, mode="w", encoding="utf-8-sig", newline="")
+            writers[brand] = csv.writer(files[brand])
+            writers[brand].writerow(OUTPUT_HEADER)
+            counts[brand] = 0
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # 파일 이름 순서대로 기록해서 실행할 때마다 출력이 같게 한다 (pipeline이 해시로 단계를 건너뛸 수 있도록)
+            # 먼저 끝난 뒤쪽 파일의 결과만 앞 파일이 끝날 때까지 부모 프로세스에 남는다
+            results_in_order = executor.map(scan_file, csv_files, repeat(brand_patterns), repeat(max_memory),
+                                            repeat(max_workers))
+            for file_path, results in results_in_order:
+                print(f"Processed file: {file_path}")
+                for brand, rows in results.items():
+                    writers[brand].writerows(rows)
+                    counts[brand] += len(rows)
+    finally:
+        for file in files.values():
+            file.close()
+
+    for brand, count in counts.items():
+        print(f"{brand}: {count} stores saved to {os.path.join(output_dir, brand + '.csv')}")
+    return counts
+
+# "코드=패턴1|패턴2" 형태의 인자를 해석
+def parse_brand_args(values):
+    brand_patterns = {}
+    for value in values:
+        brand, _, patterns = value.partition("=")
+        brand_patterns[brand.strip()] = [p for p in patterns.split("|") if p]
+    return brand_patterns
+
+def main():
+    parser = argparse.ArgumentParser(description="상가정보를 한 번만 읽어 여러 브랜드 매장을 추출합니다.")
+    parser.add_argument("--folder", default=r".\소상공인시장진흥공단_상가(상권)정보_20240930",
+                        help="CSV 파일이 있는 폴더 경로")
+    parser.add_argument("--output-dir", default=".", help="브랜드별 CSV를 저장할 폴더")
+    parser.add_argument("--brand", action="append", default=[],
+                        help="추출할 브랜드 (예: issac=이삭토스트). 지정하지 않으면 기본 목록 전체")
+    parser.add_argument("--max-memory", default=None, help="전체 메모리 한도 (예: 512M, 2G)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    brand_patterns = parse_brand_args(args.brand) if args.brand else BRAND_PATTERNS
+    max_memory = parse_memory(args.max_memory) if args.max_memory else None
+    extract_all(args.folder, args.output_dir, brand_patterns, max_memory, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import os
+import re
+import csv
+import json
+import argparse
+
+# script.js와 같은 프랜차이즈 코드/광역시 목록
+BRANDS = ["bgk", "kfc", "mcdonalds", "subway", "issac", "lotteria", "momstouch"]
+METROPOLITAN_CITIES = ["서울", "부산", "인천", "대구", "대전", "광주", "울산"]
+DATA_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+AGG_DIR = "agg"
+CITY_PATTERN = re.compile(r"(.+?시)")
+SPACE_PATTERN = re.compile(r"\s+")
+
+def read_csv(file_path):
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+        return [{key.strip(): (value or "").strip() for key, value in row.items() if key}
+                for row in csv.DictReader(file)]
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+# script.js의 constructKey와 같은 규칙으로 지역 키 생성
+def region_key(prov, area, separate_district=True):
+    normalized = SPACE_PATTERN.sub("", area)
+    if prov in METROPOLITAN_CITIES:
+        return f"{prov} {normalized}"
+    if not separate_district and "구" in normalized:
+        match = CITY_PATTERN.search(normalized)
+        return f"{prov} {match.group(1)}" if match else f"{prov} {normalized}"
+    return f"{prov} {normalized}"
+
+# 매장 목록 조각 이름: hu.csv의 sig_cd, 없으면 지역 키 ("부산 영도구" -> "부산_영도구")
+def shard_id(prov, area, sig_cd=""):
+    return sig_cd or region_key(prov, area).replace(" ", "_")
+
+# 지역 키 -> 조각 이름 (sig_cd가 없는 hu.csv 행도 지역 키로 조각을 만든다)
+def build_shard_index(hu_rows):
+    shard_of = {}
+    for row in hu_rows:
+        shard_of.setdefault(region_key(row["prov"], row["area"]), shard_id(row["prov"], row["area"], row.get("sig_cd", "")))
+    return shard_of
+
+def shard_of_row(shard_index, row):
+    prov, area = row.get("prov", ""), row.get("area", "")
+    return shard_index.get(region_key(prov, area)) or shard_id(prov, area)
+
+# script.js의 getDisplayName과 같은 규칙으로 표시 이름 생성
+def display_name(prov, area, separate_district=True):
+    if prov in METROPOLITAN_CITIES:
+        return area
+    if not separate_district and "구" in area:
+        match = CITY_PATTERN.search(area)
+        return match.group(1) if match else area
+    return area
+
+# hu.csv 기준으로 지역 목록을 만들고 매장 수를 누적
+# 지역의 shards에는 그 지역에 들어간 매장이 있는 조각을 모두 넣는다 (구 없이 시 이름만 있는 매장 포함)
+def build_view(hu_rows, brand_rows, separate_district):
+    shard_index = build_shard_index(hu_rows)
+    regions = {}
+    for row in hu_rows:
+        key = region_key(row["prov"], row["area"], separate_district)
+        region = regions.get(key)
+        if region is None:
+            region = regions[key] = {
+                "key": key,
+                "prov": row["prov"],
+                "area": display_name(row["prov"], row["area"], separate_district),
+                "land": 0.0,
+                "people": 0.0,
+                "counts": [0] * len(BRANDS),
+                "shards": []
+            }
+        region["land"] += to_float(row.get("land"))
+        region["people"] += to_float(row.get("people"))
+        shard = shard_id(row["prov"], row["area"], row.get("sig_cd", ""))
+        if shard not in region["shards"]:
+            region["shards"].append(shard)
+
+    for brand_index, rows in enumerate(brand_rows):
+        for row in rows:
+            region = regions.get(region_key(row.get("prov", ""), row.get("area", ""), separate_district))
+            if region is not None:
+                region["counts"][brand_index] += 1
+                shard = shard_of_row(shard_index, row)
+                if shard not in region["shards"]:
+                    region["shards"].append(shard)
+
+    for region in regions.values():
+        region["land"] = round(region["land"], 4)
+        region["people"] = round(region["people"])
+    return list(regions.values())
+
+# 구 단위 지역별 매장 목록 조각 {조각 이름: {brand: [[이름, 주소], ...]}}
+def build_shards(hu_rows, brand_rows):
+    shard_index = build_shard_index(hu_rows)
+    shards = {}
+    for brand, rows in zip(BRANDS, brand_rows):
+        for row in rows:
+            shards.setdefault(shard_of_row(shard_index, row), {}).setdefault(brand, []).append(
+                [row.get("store", ""), row.get("addr", "")])
+    return shards
+
+# 지역마다 매장 수와 그 지역 조각들의 매장 목록 수가 같은지 확인 (다르면 상세 화면에 매장이 빠진다)
+def verify_shards(views, shards):
+    for view, regions in views.items():
+        for region in regions:
+            listed = [sum(len(shards.get(shard, {}).get(brand, [])) for shard in region["shards"]) for brand in BRANDS]
+            if listed != region["counts"]:
+                raise Exception(f"{view} view {region['key']}: counts {region['counts']} but shards list {listed}")
+    # 어느 지역에도 들어가지 않는 매장 (hu.csv에 없는 지역 이름, 예: 인천 남구)
+    covered = {shard for region in views["district"] for shard in region["shards"]}
+    orphans = {shard: sum(len(stores) for stores in shards[shard].values()) for shard in shards if shard not in covered}
+    for shard, count in orphans.items():
+        print(f"Warning: {count} stores in {shard} are not in any hu.csv region")
+
+def write_json(file_path, data):
+    with open(file_path, mode="w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+    return os.path.getsize(file_path)
+
+# data/<날짜>/ 의 CSV를 읽어 data/<날짜>/agg/ 에 집계 결과를 저장
+def build(date_dir):
+    hu_rows = read_csv(os.path.join(date_dir, "hu.csv"))
+    brand_rows = [read_csv(os.path.join(date_dir, f"{brand}.csv")) for brand in BRANDS]
+
+    output_dir = os.path.join(date_dir, AGG_DIR)
+    shard_dir = os.path.join(output_dir, "stores")
+    os.makedirs(shard_dir, exist_ok=True)
+    for name in os.listdir(shard_dir):
+        if name.endswith(".json"):
+            os.remove(os.path.join(shard_dir, name))
+
+    aggregate = {
+        "brands": BRANDS,
+        "hu": [{key: row.get(key, "") for key in ("prov", "area", "people", "land", "sig_cd")} for row in hu_rows],
+        "views": {
+            "district": build_view(hu_rows, brand_rows, True),
+            "city": build_view(hu_rows, brand_rows, False)
+        }
+    }
+    size = write_json(os.path.join(output_dir, "regions.json"), aggregate)
+
+    shards = build_shards(hu_rows, brand_rows)
+    verify_shards(aggregate["views"], shards)
+    shard_sizes = [write_json(os.path.join(shard_dir, f"{shard}.json"), stores) for shard, stores in shards.items()]
+    raw_size = sum(os.path.getsize(os.path.join(date_dir, f"{name}.csv"))
+                   for name in BRANDS + ["hu"] if os.path.exists(os.path.join(date_dir, f"{name}.csv")))
+
+    print(f"{output_dir}: regions.json {size / 1024:.1f} KB (raw CSV {raw_size / 1024:.1f} KB), "
+          f"{len(shard_sizes)} store shards, largest {max(shard_sizes, default=0) / 1024:.1f} KB")
+    return output_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="지역별 매장 수 집계 파일을 생성합니다.")
+    parser.add_argument("dates", nargs="*", help="집계할 날짜 폴더 이름 (기본: data/ 아래 전체)")
+    parser.add_argument("--data-root", default=DATA_ROOT)
+    args = parser.parse_args()
+
+    dates = args.dates or sorted(name for name in os.listdir(args.data_root)
+                                 if os.path.isfile(os.path.join(args.data_root, name, "hu.csv")))
+    for date_name in dates:
+        build(os.path.join(args.data_root, date_name))
+
+if __name__ == "__main__":
+    main()
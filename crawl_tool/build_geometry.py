@@ -0,0 +1,305 @@
+import os
+import csv
+import json
+import time
+import argparse
+
+DATA_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+GEOJSON_FILE = os.path.join(DATA_ROOT, "korea.geojson")
+HU_FILE = os.path.join(DATA_ROOT, "2024-12", "hu.csv")
+OUTPUT_DIR = os.path.join(DATA_ROOT, "geo")
+
+# 해상도 이름 -> (단순화 허용 오차(도), 좌표 양자화 격자 크기)
+RESOLUTIONS = {
+    "high": (0.0002, 100000),
+    "medium": (0.001, 30000),
+    "low": (0.003, 10000)
+}
+# 공유 경계 탐지용 격자 (원본 좌표의 미세한 오차를 흡수)
+TOPOLOGY_GRID = 1e7
+PARSE_REPEAT = 5
+
+# sig_cd -> 시도 약칭 (script.js가 조인하던 hu.csv 기준, 예: 군위군은 대구)
+def load_provinces(file_path):
+    provinces = {}
+    with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+        for row in csv.DictReader(file):
+            if row.get("sig_cd"):
+                provinces[row["sig_cd"]] = row["prov"]
+    return provinces
+
+# 좌표를 정수 격자로 맞춘 고리 목록 (닫는 점과 연속 중복점 제거)
+def snap_ring(ring):
+    points = []
+    for x, y in ring:
+        point = (round(x * TOPOLOGY_GRID), round(y * TOPOLOGY_GRID))
+        if not points or points[-1] != point:
+            points.append(point)
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+# 이웃한 점이 고리마다 다르게 나타나는 점 = 여러 경계가 만나는 접점
+def find_junctions(rings):
+    neighbors = {}
+    junctions = set()
+    for ring in rings:
+        n = len(ring)
+        for i, point in enumerate(ring):
+            pair = tuple(sorted((ring[i - 1], ring[(i + 1) % n])))
+            seen = neighbors.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+# 접점이 없는 닫힌 고리는 가장 작은 점에서 시작하도록 회전 (같은 고리를 같은 호로 인식)
+def rotate_to_min(ring):
+    start = ring.index(min(ring))
+    return ring[start:] + ring[:start]
+
+# 고리를 접점에서 잘라 호(arc) 목록으로 만든다
+def cut_ring(ring, junctions):
+    cut_points = [i for i, point in enumerate(ring) if point in junctions]
+    if not cut_points:
+        ring = rotate_to_min(ring)
+        return [ring + [ring[0]]]
+
+    start = cut_points[0]
+    ring = ring[start:] + ring[:start]
+    arcs = []
+    current = [ring[0]]
+    for point in ring[1:]:
+        current.append(point)
+        if point in junctions:
+            arcs.append(current)
+            current = [point]
+    current.append(ring[0])
+    arcs.append(current)
+    return arcs
+
+# 모든 고리를 호로 나누고, 같은 호(정방향/역방향)는 하나로 합친다
+# 반환: 호 목록, 피처별 [고리별 [호 번호]] (음수 ~i는 i번 호를 뒤집어 사용)
+def build_topology(features):
+    snapped = [[snap_ring(ring) for ring in feature["geometry"]["coordinates"]] for feature in features]
+    junctions = find_junctions([ring for rings in snapped for ring in rings if len(ring) > 2])
+
+    arcs = []
+    arc_index = {}
+    polygons = []
+    for rings in snapped:
+        polygon = []
+        for ring in rings:
+            if len(ring) < 3:
+                continue
+            refs = []
+            for arc in cut_ring(ring, junctions):
+                key = tuple(arc)
+                if key in arc_index:
+                    refs.append(arc_index[key])
+                    continue
+                reverse = tuple(reversed(arc))
+                if reverse in arc_index:
+                    refs.append(~arc_index[reverse])
+                    continue
+                arc_index[key] = len(arcs)
+                refs.append(len(arcs))
+                arcs.append(arc)
+            polygon.append(refs)
+        polygons.append(polygon)
+    return arcs, polygons
+
+def point_line_distance(point, start, end):
+    (x, y), (x1, y1), (x2, y2) = point, start, end
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+    return abs(dy * x - dx * y + x2 * y1 - y2 * x1) / (dx * dx + dy * dy) ** 0.5
+
+# Douglas-Peucker (양 끝점은 항상 유지)
+def simplify_line(points, tolerance):
+    if len(points) < 3:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance = 0
+        index = first
+        for i in range(first + 1, last):
+            distance = point_line_distance(points[i], points[first], points[last])
+            if distance > max_distance:
+                max_distance = distance
+                index = i
+        if max_distance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+# 호 단순화: 닫힌 호는 시작점에서 가장 먼 점으로 나눠서 삼각형 이상이 남도록 한다
+def simplify_arc(arc, tolerance):
+    if arc[0] != arc[-1] or len(arc) < 4:
+        return simplify_line(arc, tolerance)
+    far = max(range(len(arc)), key=lambda i: (arc[i][0] - arc[0][0]) ** 2 + (arc[i][1] - arc[0][1]) ** 2)
+    return simplify_line(arc[:far + 1], tolerance) + simplify_line(arc[far:], tolerance)[1:]
+
+def arc_points(arcs, ref):
+    return arcs[ref] if ref >= 0 else list(reversed(arcs[~ref]))
+
+# 호 번호 목록을 이어 붙여 고리 좌표로 복원
+def assemble_ring(arcs, refs):
+    ring = []
+    for ref in refs:
+        points = arc_points(arcs, ref)
+        ring.extend(points if not ring else points[1:])
+    return ring
+
+# 공유 호를 한 번씩만 단순화하므로 이웃한 지역 경계가 어긋나지 않는다
+# 너무 작아져서 고리가 무너지는 경우 해당 호들은 원본 그대로 둔다
+def simplify_topology(arcs, polygons, tolerance):
+    scaled = tolerance * TOPOLOGY_GRID
+    simplified = [simplify_arc(arc, scaled) for arc in arcs]
+    for polygon in polygons:
+        for refs in polygon:
+            if len(set(assemble_ring(simplified, refs))) < 3:
+                for ref in refs:
+                    index = ref if ref >= 0 else ~ref
+                    simplified[index] = arcs[index]
+    return simplified
+
+# 경계 상자 기준 정수 격자로 양자화하고 델타 인코딩 (TopoJSON transform 형식)
+def quantize_arcs(arcs, bbox, size):
+    x0, y0, x1, y1 = bbox
+    kx = (size - 1) / (x1 - x0) if x1 > x0 else 1
+    ky = (size - 1) / (y1 - y0) if y1 > y0 else 1
+    quantized = []
+    for arc in arcs:
+        points = []
+        for x, y in arc:
+            point = (round((x - x0) * kx), round((y - y0) * ky))
+            if not points or points[-1] != point:
+                points.append(point)
+        if len(points) == 1:
+            points.append(points[0])
+        quantized.append(points)
+    transform = {"scale": [1 / kx, 1 / ky], "translate": [x0, y0]}
+    return quantized, transform
+
+def delta_encode(points):
+    encoded = [list(points[0])]
+    for (px, py), (x, y) in zip(points, points[1:]):
+        encoded.append([x - px, y - py])
+    return encoded
+
+def feature_properties(feature, provinces):
+    properties = feature["properties"]
+    sig_cd = properties["SIG_CD"]
+    prov = provinces.get(sig_cd, "")
+    return {
+        "SIG_CD": sig_cd,
+        "SIG_KOR_NM": properties["SIG_KOR_NM"],
+        "sig_cd": sig_cd,
+        "prov": prov,
+        "name": f"{prov} {properties['SIG_KOR_NM']}"
+    }
+
+def build_resolution(features, arcs, polygons, provinces, tolerance, size, digits):
+    simplified = simplify_topology(arcs, polygons, tolerance)
+    # 격자 좌표 -> 경위도
+    degree_arcs = [[(x / TOPOLOGY_GRID, y / TOPOLOGY_GRID) for x, y in arc] for arc in simplified]
+    xs = [x for arc in degree_arcs for x, _ in arc]
+    ys = [y for arc in degree_arcs for _, y in arc]
+    bbox = [min(xs), min(ys), max(xs), max(ys)]
+    quantized, transform = quantize_arcs(degree_arcs, bbox, size)
+    properties = [feature_properties(feature, provinces) for feature in features]
+
+    topology = {
+        "type": "Topology",
+        "bbox": bbox,
+        "transform": transform,
+        "objects": {
+            "regions": {
+                "type": "GeometryCollection",
+                "geometries": [{"type": "Polygon", "arcs": polygon, "properties": props}
+                               for polygon, props in zip(polygons, properties)]
+            }
+        },
+        "arcs": [delta_encode(arc) for arc in quantized]
+    }
+
+    # TopoJSON 라이브러리 없이 바로 쓸 수 있도록 같은 좌표로 GeoJSON도 만든다
+    sx, sy = transform["scale"]
+    tx, ty = transform["translate"]
+    coordinate_arcs = [[[round(x * sx + tx, digits), round(y * sy + ty, digits)] for x, y in arc] for arc in quantized]
+    geojson = {
+        "type": "FeatureCollection",
+        "bbox": bbox,
+        "features": [{
+            "type": "Feature",
+            "properties": props,
+            "geometry": {"type": "Polygon",
+                         "coordinates": [assemble_ring(coordinate_arcs, refs) for refs in polygon]}
+        } for polygon, props in zip(polygons, properties)]
+    }
+    return topology, geojson
+
+def write_json(file_path, data):
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    with open(file_path, mode="w", encoding="utf-8") as file:
+        file.write(text)
+    return len(text.encode("utf-8"))
+
+# 파일을 PARSE_REPEAT번 json.loads 했을 때의 최소 시간 (브라우저 JSON.parse 비용의 대략적인 비교용)
+def parse_time(file_path):
+    with open(file_path, mode="r", encoding="utf-8") as file:
+        text = file.read()
+    best = None
+    for _ in range(PARSE_REPEAT):
+        started = time.perf_counter()
+        json.loads(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def build(geojson_file=GEOJSON_FILE, hu_file=HU_FILE, output_dir=OUTPUT_DIR, resolutions=RESOLUTIONS):
+    with open(geojson_file, mode="r", encoding="utf-8") as file:
+        features = json.load(file)["features"]
+    provinces = load_provinces(hu_file)
+    arcs, polygons = build_topology(features)
+    os.makedirs(output_dir, exist_ok=True)
+
+    base_size = os.path.getsize(geojson_file)
+    base_parse = parse_time(geojson_file)
+    report = {"source": {"file": os.path.basename(geojson_file), "bytes": base_size, "parse_ms": base_parse * 1000},
+              "arcs": len(arcs), "resolutions": {}}
+    print(f"{'source':<24}{base_size / 1024:>10.1f} KB{base_parse * 1000:>10.2f} ms  ({len(arcs)} shared arcs)")
+
+    for name, (tolerance, size) in resolutions.items():
+        digits = max(4, len(str(size)))
+        topology, geojson = build_resolution(features, arcs, polygons, provinces, tolerance, size, digits)
+        entry = {"tolerance": tolerance, "quantization": size}
+        for kind, data in (("topojson", topology), ("geojson", geojson)):
+            file_path = os.path.join(output_dir, f"korea.{name}.{kind}")
+            size_bytes = write_json(file_path, data)
+            parse_ms = parse_time(file_path) * 1000
+            entry[kind] = {"bytes": size_bytes, "parse_ms": parse_ms,
+                           "bytes_saved": 1 - size_bytes / base_size, "parse_saved": 1 - parse_ms / (base_parse * 1000)}
+            print(f"{os.path.basename(file_path):<24}{size_bytes / 1024:>10.1f} KB{parse_ms:>10.2f} ms  "
+                  f"(-{entry[kind]['bytes_saved']:.0%} bytes, -{entry[kind]['parse_saved']:.0%} parse)")
+        report["resolutions"][name] = entry
+
+    with open(os.path.join(output_dir, "report.json"), mode="w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="korea.geojson을 해상도별로 단순화/양자화한 TopoJSON, GeoJSON으로 변환합니다.")
+    parser.add_argument("--geojson", default=GEOJSON_FILE)
+    parser.add_argument("--hu", default=HU_FILE, help="시도 이름을 가져올 hu.csv")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+    build(args.geojson, args.hu, args.output_dir)
+
+if __name__ == "__main__":
+    main()
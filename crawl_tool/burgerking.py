@@ -1,10 +1,11 @@
-import requests
 import csv
+from crawler_core import StoreRecord, default_client
 
 # 상수 정의
 URL = "https://www.burgerking.co.kr/burgerking/BKR0343.json"
 DATA_COUNT = 600
 CSV_FILE = "burgerking_stores.csv"
+BRAND = "bgk"
 
 # 요청 데이터와 헤더 정의
 PAYLOAD = {
@@ -18,8 +19,9 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36 Edg/132.0.0.0"
 }
 
-def fetch_store_data():
-    response = requests.post(URL, data=PAYLOAD, headers=HEADERS)
+def fetch_store_data(client=None):
+    client = client or default_client()
+    response = client.post(URL, data=PAYLOAD, headers=HEADERS)
     if response.status_code != 200:
         raise Exception(f"Failed to fetch data: {response.status_code}")
     return response.json()
@@ -27,6 +29,11 @@ def fetch_store_data():
 def extract_store_info(response_data):
     return response_data.get("body", {}).get("storInfo", [])
 
+# 공통 러너(crawl_all.py)에서 사용하는 플러그인 진입점
+def iter_records(client):
+    for store in extract_store_info(fetch_store_data(client)):
+        yield StoreRecord(BRAND, store.get("storNm", ""), store.get("storAddr", ""), store.get("storCd", ""))
+
 def save_to_csv(store_info):
     with open(CSV_FILE, mode="w", encoding="utf-8-sig", newline="") as file:
         writer = csv.writer(file)
@@ -1,4 +1,6 @@
+import argparse
 import pandas as pd
+from join_keys import join_column
 
 # 변수 설정
 file_a = "hu.csv"  # A 파일 이름
@@ -12,17 +14,36 @@ compare_col_b2 = "SIG_KOR_NM"  # B 파일에서 비교할 두 번째 열 이름
 source_col_b = "SIG_CD"  # B 파일에서 복사할 열 이름
 target_col_a = "sig_cd"  # A 파일에서 데이터를 복사할 대상 열 이름
 
-# CSV 파일 읽기
-df_a = pd.read_csv(file_a)
-df_b = pd.read_csv(file_b)
+def compare_files(path_a, path_b, output_file=None, verbose=False):
+    # CSV 파일 읽기
+    df_a = pd.read_csv(path_a)
+    df_b = pd.read_csv(path_b)
 
-# 데이터 비교 및 값 복사
-for index_a, row_a in df_a.iterrows():
-    for _, row_b in df_b.iterrows():
-        if (str(row_a[compare_col_a1]).replace(" ", "") == str(row_b[compare_col_b1]).replace(" ", "") and 
-            str(row_a[compare_col_a2]).replace(" ", "") == str(row_b[compare_col_b2]).replace(" ", "")):
-            df_a.at[index_a, target_col_a] = str(row_b[source_col_b])
+    # 정규화된 키 인덱스로 값 복사
+    df_a, report = join_column(
+        df_a, df_b,
+        [compare_col_a1, compare_col_a2],
+        [compare_col_b1, compare_col_b2],
+        source_col_b, target_col_a
+    )
 
-# 결과 저장
-df_a.to_csv(file_a, index=False, encoding="utf-8-sig")
-print(f"Data copied successfully and saved to {file_a}")
+    # 결과 저장
+    output_file = output_file or path_a
+    df_a.to_csv(output_file, index=False, encoding="utf-8-sig")
+    print(f"Data copied successfully and saved to {output_file}")
+    print(report.summary() if verbose else
+          f"Matched rows: {report.matched}, unmatched keys: {len(report.unmatched)}, "
+          f"ambiguous keys: {len(report.ambiguous)}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="A 파일의 sig_cd를 B 파일 기준으로 채웁니다.")
+    parser.add_argument("--file-a", default=file_a)
+    parser.add_argument("--file-b", default=file_b)
+    parser.add_argument("--output", default=None, help="지정하지 않으면 A 파일을 덮어씁니다.")
+    parser.add_argument("--verbose", action="store_true", help="매칭 실패/중복 키를 모두 출력합니다.")
+    args = parser.parse_args()
+    compare_files(args.file_a, args.file_b, args.output, args.verbose)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import csv
+import argparse
+import importlib
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from crawler_core import HttpClient
+from region_names import parse_address, make_div
+from filter_csv import load_sample_areas
+import instrument
+
+try:
+    from geo_resolver import RegionResolver
+except ImportError:  # shapely가 없으면 주소 문자열로만 지역을 정한다
+    RegionResolver = None
+
+# 러너가 실행하는 브랜드 플러그인 모듈 (각 모듈은 BRAND, iter_records(client)를 제공)
+PLUGINS = ["burgerking", "lotteria", "mcdonald", "momstouch", "subway"]
+OUTPUT_HEADER = ["store", "addr", "prov", "area", "div"]
+FAIL_HEADER = ["store", "addr", "prov", "area", "div", "original_file"]
+DATA_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+
+def load_plugin(name):
+    return importlib.import_module(name)
+
+# 플러그인 하나를 실행하여 레코드 목록을 반환 (단계 이름: crawl:<브랜드>)
+def run_plugin(module, client):
+    with instrument.stage(f"crawl:{module.BRAND}") as stage:
+        records = list(module.iter_records(client))
+        stage.rows_out = len(records)
+    return module.BRAND, records
+
+# StoreRecord를 store,addr,prov,area,div 한 줄로 변환
+def normalize_record(record, region=None):
+    prov, area = region if region else parse_address(record.addr)
+    return [record.name, record.addr, prov, area, make_div(prov, area)]
+
+# 좌표가 있는 레코드는 경계 파일로 지역을 정하고, 나머지는 주소 문자열로 정한다
+def resolve_regions(records, resolver):
+    if resolver is None or not any(record.lat is not None for record in records):
+        return [None] * len(records)
+    resolved = resolver.resolve([(record.addr, record.lng, record.lat) for record in records])
+    return [(prov, area) for _, prov, area in resolved]
+
+# 브랜드 하나의 결과를 data/<YYYY-MM>/<브랜드>.csv로 저장
+# sample_areas가 있으면 filter_csv와 같은 기준으로 실패 행을 fail_rows에 모은다
+def write_brand(brand, records, output_dir, sample_areas=None, fail_rows=None, resolver=None):
+    output_file = os.path.join(output_dir, f"{brand}.csv")
+    saved = 0
+    with instrument.stage(f"write:{brand}") as stage:
+        regions = resolve_regions(records, resolver)
+        with open(output_file, mode="w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(OUTPUT_HEADER)
+            for record, region in zip(records, regions):
+                row = normalize_record(record, region)
+                if sample_areas is not None and row[3] not in sample_areas:
+                    fail_rows.append(row + [f"{brand}.csv"])
+                    continue
+                writer.writerow(row)
+                saved += 1
+        stage.add_file(output_file, rows_in=len(records), rows_out=saved, fail_rows=len(records) - saved)
+    return output_file, saved
+
+def crawl_all(plugins=PLUGINS, month=None, data_root=DATA_ROOT, sample_file=None, max_workers=None):
+    month = month or date.today().strftime("%Y-%m")
+    output_dir = os.path.join(data_root, month)
+    os.makedirs(output_dir, exist_ok=True)
+    sample_areas = load_sample_areas(sample_file) if sample_file else None
+    fail_rows = []
+
+    modules = [load_plugin(name) for name in plugins]
+    resolver = RegionResolver(sample_areas=sample_areas) if RegionResolver is not None else None
+    if resolver is not None and sample_areas is not None:
+        # 좌표로 정한 지역이 sample.csv에 없으면 그 행은 주소 파싱으로 처리된다
+        for sig_cd, prov, area in resolver.unknown_areas(sample_areas):
+            print(f"Warning: boundary {sig_cd} ({prov} {area}) is not in {sample_file}")
+    with HttpClient(pool_size=max(len(modules), 1) * 2) as client:
+        with ThreadPoolExecutor(max_workers=max_workers or len(modules)) as executor:
+            futures = {executor.submit(run_plugin, module, client): module.__name__ for module in modules}
+            for future in as_completed(futures):
+                try:
+                    brand, records = future.result()
+                except Exception as e:
+                    print(f"Error running {futures[future]}: {e}")
+                    continue
+                output_file, saved = write_brand(brand, records, output_dir, sample_areas, fail_rows, resolver)
+                print(f"{brand}: {saved}/{len(records)} stores saved to {output_file}")
+
+    if sample_areas is not None:
+        fail_file = os.path.join(output_dir, "fail.csv")
+        with open(fail_file, mode="w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(FAIL_HEADER)
+            writer.writerows(fail_rows)
+        print(f"{len(fail_rows)} unmatched rows saved to {fail_file}")
+    return output_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="모든 브랜드 크롤러를 동시에 실행하여 data/<YYYY-MM>/ 에 저장합니다.")
+    parser.add_argument("--plugins", nargs="+", default=PLUGINS)
+    parser.add_argument("--month", default=None, help="저장할 폴더 이름 (기본: 이번 달 YYYY-MM)")
+    parser.add_argument("--data-root", default=DATA_ROOT)
+    parser.add_argument("--sample", default=None, help="sample.csv 경로 (지정하면 시군구명 검증 후 fail.csv 생성)")
+    parser.add_argument("--report", default=None, help="단계별 시간/행 수/HTTP 통계를 저장할 JSON 파일")
+    parser.add_argument("--profile", default=None, help="프로파일할 단계 이름 (쉼표 구분, 예: crawl:subway,write:*)")
+    args = parser.parse_args()
+    with instrument.run("crawl_all", args.report, args.profile):
+        crawl_all(args.plugins, args.month, args.data_root, args.sample)
+
+if __name__ == "__main__":
+    main()
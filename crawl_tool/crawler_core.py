@@ -0,0 +1,84 @@
+import time
+from dataclasses import dataclass
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import instrument
+
+# 공통 HTTP 설정
+TIMEOUT = 15
+POOL_SIZE = 8
+MAX_RETRIES = 3
+BACKOFF = 0.5  # 재시도 대기 시간: 0.5s, 1s, 2s ...
+RETRY_STATUS = (429, 500, 502, 503, 504)
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36"
+
+# 모든 크롤러가 공통으로 돌려주는 매장 정보
+@dataclass(slots=True)
+class StoreRecord:
+    brand: str
+    name: str
+    addr: str
+    store_id: str = ""
+    lat: float = None
+    lng: float = None
+
+# 응답마다 호스트별 요청 수/지연 시간을 실행 보고서(instrument)에 기록
+def record_response(response, *args, **kwargs):
+    instrument.record_http(response.url, response.status_code, response.elapsed.total_seconds())
+
+# keep-alive 연결을 재사용하고 실패 시 지수 백오프로 재시도하는 세션
+def make_session(pool_size=POOL_SIZE, retries=MAX_RETRIES, backoff=BACKOFF):
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=None,  # 매장 검색 API는 POST지만 조회용이므로 재시도해도 안전
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    session.hooks["response"].append(record_response)
+    return session
+
+# 세션 + 기본 타임아웃 묶음
+class HttpClient:
+    def __init__(self, pool_size=POOL_SIZE, retries=MAX_RETRIES, backoff=BACKOFF, timeout=TIMEOUT):
+        self.session = make_session(pool_size, retries, backoff)
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        started = time.perf_counter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            instrument.record_http(url, None, time.perf_counter() - started)
+            raise
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# 모듈 단독 실행 시 사용할 기본 클라이언트
+_default_client = None
+
+def default_client():
+    global _default_client
+    if _default_client is None:
+        _default_client = HttpClient()
+    return _default_client
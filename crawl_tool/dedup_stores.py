@@ -0,0 +1,247 @@
+import os
+import re
+import csv
+import argparse
+from difflib import SequenceMatcher
+from build_aggregates import DATA_ROOT, read_csv, region_key
+from region_names import normalize_province
+import instrument
+
+NAME_THRESHOLD = 0.8  # 같은 건물 번호 안에서 이 점수 이상이면 같은 매장
+MAX_GROUP = 200       # 이보다 큰 그룹(대형 상가 건물 등)은 상호명이 같은 행끼리만 비교
+REPORT_HEADER = ["cluster", "kept", "file", "line", "brand", "store", "addr", "block"]
+
+# 입력 형식별 컬럼: 크롤러 결과(store,addr,prov,area,div)와 상가정보
+FORMATS = [
+    {"name": "store", "addr": ["addr"], "prov": "prov", "area": "area", "code": None},
+    {"name": "상호명", "addr": ["도로명주소", "지번주소"], "prov": "시도명", "area": "시군구명", "code": "시군구코드"}
+]
+
+# "남부로 17번길 23" -> "남부로17번길 23" (도로명과 번길을 붙여 쓴 표기와 맞춘다)
+ROAD_SPLIT_PATTERN = re.compile(r"(\S[로길])\s+(\d+번?길)")
+# 도로명 + 건물번호 ("압구정로 328", "강남대로 지하 396")
+ROAD_PATTERN = re.compile(r"([0-9A-Za-z가-힣·.]*[가-힣][0-9A-Za-z가-힣·.]*[로길])\s+(?:지하\s*)?(\d+(?:-\d+)?)")
+# 법정동/리 + 지번 ("신사동 660-5", "와우리 산 12", 숫자 뒤에 "가"가 붙는 "명동2가 3-1", "종로1가 24")
+LOT_PATTERN = re.compile(r"([가-힣][0-9가-힣]*[동리가])\s+(산\s*)?(\d+(?:-\d+)?)")
+NAME_PATTERN = re.compile(r"[\s()\[\]\-_.,·]+")
+DIGIT_PATTERN = re.compile(r"\d+")
+
+# 주소 -> (도로명, 건물번호), (법정동, 지번) 중 찾은 것
+# "서울 강남구 압구정로 328 (신사동) 서울 강남구 신사동 660-5"처럼 둘 다 있으면 둘 다 반환한다
+def canonical_address(addr):
+    text = ROAD_SPLIT_PATTERN.sub(r"\1\2", " ".join(addr.split()))
+    head = text.split("(", 1)[0]
+    road = ROAD_PATTERN.search(head) or ROAD_PATTERN.search(text)
+    lot = LOT_PATTERN.search(text)
+    keys = []
+    if road:
+        keys.append((road.group(1), road.group(2)))
+    if lot:
+        keys.append(("@" + lot.group(1), ("산" if lot.group(2) else "") + lot.group(3)))
+    return keys
+
+# 상호명 비교용 정규화: 공백/기호 제거, 소문자, 끝의 "점" 제거
+def normalize_name(name):
+    name = NAME_PATTERN.sub("", name).lower()
+    return name[:-1] if name.endswith("점") and len(name) > 1 else name
+
+def is_same_store(a, b, threshold=NAME_THRESHOLD):
+    (brand_a, name_a), (brand_b, name_b) = a, b
+    if brand_a and brand_b and brand_a != brand_b:
+        return False
+    if name_a == name_b:
+        return True
+    # "서울역점"/"서울역2호점", "2층고척스카이돔점"/"4층고척스카이돔점"은 다른 매장
+    if DIGIT_PATTERN.findall(name_a) != DIGIT_PATTERN.findall(name_b):
+        return False
+    return SequenceMatcher(None, name_a, name_b).ratio() >= threshold
+
+class UnionFind:
+    def __init__(self):
+        self.parent = []
+
+    def add(self):
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # 먼저 나온 행이 대표가 되도록 작은 번호를 루트로 둔다
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+# (시군구코드 또는 지역 키, 도로명/법정동) 블록 -> 건물번호/지번 그룹 -> 행 번호 목록
+# 비교는 같은 그룹 안에서만 하므로 전체 행 수에 거의 비례하는 시간이 걸린다
+class DuplicateIndex:
+    def __init__(self, sig_codes=None, threshold=NAME_THRESHOLD):
+        self.sig_codes = sig_codes or {}
+        self.threshold = threshold
+        self.groups = {}
+        self.records = []  # (파일 번호, 줄 번호, brand, 상호명, 주소, 블록)
+        self.keys = []     # (brand, 정규화한 상호명)
+        self.union_find = UnionFind()
+
+    def region(self, prov, area, code=""):
+        if code:
+            return code
+        key = region_key(normalize_province(prov), area)
+        return self.sig_codes.get(key, key)
+
+    def add(self, file_index, line, brand, name, addr, prov, area, code=""):
+        record_id = self.union_find.add()
+        region = self.region(prov, area, code)
+        # 도로명/지번을 찾지 못한 주소("경기 시흥시" 등)는 주소와 상호명이 모두 같은 행끼리만 묶는다
+        keys = canonical_address(addr) or [("", "#" + "".join(addr.split()) + "|" + normalize_name(name))]
+        self.records.append((file_index, line, brand, name, addr, f"{region} {keys[0][0]}".strip()))
+        self.keys.append((brand, normalize_name(name)))
+        for place, number in keys:
+            self.groups.setdefault((region, place, number), []).append(record_id)
+        return record_id
+
+    def compare_group(self, members):
+        keys = self.keys
+        if len(members) > MAX_GROUP:
+            first = {}
+            for member in members:
+                other = first.setdefault(keys[member], member)
+                if other != member:
+                    self.union_find.union(other, member)
+            return
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if is_same_store(keys[a], keys[b], self.threshold):
+                    self.union_find.union(a, b)
+
+    # 중복 묶음 목록 [[행 번호, ...]] (첫 번째가 남길 행)
+    def clusters(self):
+        for members in self.groups.values():
+            if len(members) > 1:
+                self.compare_group(members)
+        clusters = {}
+        for record_id in range(len(self.records)):
+            clusters.setdefault(self.union_find.find(record_id), []).append(record_id)
+        return [members for members in clusters.values() if len(members) > 1]
+
+def detect_format(header):
+    for columns in FORMATS:
+        if columns["name"] in header and columns["prov"] in header and columns["area"] in header:
+            return columns
+    raise Exception(f"Unknown store file header: {header}")
+
+# 헤더와 데이터 행 (빈 줄은 건너뜀), 색인과 중복 제거가 같은 번호를 쓰도록 두 곳 모두 이 함수로 읽는다
+def iter_rows(file):
+    reader = csv.reader(file)
+    header = next(reader, [])
+    return header, (row for row in reader if row)
+
+# 파일 한 개를 읽어서 색인에 추가 (상가정보 원본도 한 줄씩 읽으므로 메모리는 색인 크기만큼만 쓴다)
+def index_file(index, file_index, file_path, brand=""):
+    with instrument.stage(f"dedup:{os.path.basename(file_path)}") as stage:
+        with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+            header, rows = iter_rows(file)
+            columns = detect_format(header)
+            count = 0
+            for line, values in enumerate(rows):
+                row = dict(zip(header, values))
+                addr = " ".join(row.get(column) or "" for column in columns["addr"]).strip()
+                code = row.get(columns["code"]) or "" if columns["code"] else ""
+                index.add(file_index, line, brand, row.get(columns["name"]) or "", addr,
+                          row.get(columns["prov"]) or "", row.get(columns["area"]) or "", code)
+                count += 1
+        stage.add_file(file_path, rows_in=count)
+    return count
+
+# hu.csv의 지역 키 -> 시군구코드 (크롤러 결과를 상가정보와 같은 블록에 넣기 위해 사용)
+def load_sig_codes(hu_file):
+    return {region_key(row["prov"], row["area"]): row["sig_cd"]
+            for row in read_csv(hu_file) if row.get("sig_cd")} if hu_file else {}
+
+def brand_of(file_path):
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return "" if name.startswith("소상공인") else name
+
+def find_duplicates(file_paths, brands=None, hu_file=None, threshold=NAME_THRESHOLD):
+    index = DuplicateIndex(load_sig_codes(hu_file), threshold)
+    brands = brands or [brand_of(path) for path in file_paths]
+    for file_index, (file_path, brand) in enumerate(zip(file_paths, brands)):
+        index_file(index, file_index, file_path, brand)
+    return index, index.clusters()
+
+def save_report(index, clusters, file_paths, report_file):
+    os.makedirs(os.path.dirname(report_file) or ".", exist_ok=True)
+    with open(report_file, mode="w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(REPORT_HEADER)
+        for cluster_id, members in enumerate(clusters, 1):
+            for position, record_id in enumerate(members):
+                file_index, line, brand, name, addr, block = index.records[record_id]
+                writer.writerow([cluster_id, int(position == 0), os.path.basename(file_paths[file_index]),
+                                 line + 1, brand, name, addr, block])
+
+# 묶음마다 첫 행만 남기고 나머지를 뺀 파일을 쓴다 {입력 파일: 뺀 행 수}
+def write_deduped(index, clusters, file_paths, output_paths):
+    dropped = [set() for _ in file_paths]
+    for members in clusters:
+        for record_id in members[1:]:
+            file_index, line = index.records[record_id][:2]
+            dropped[file_index].add(line)
+    for file_path, output_path, lines in zip(file_paths, output_paths, dropped):
+        with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+            header, rows = iter_rows(file)
+            rows = [row for line, row in enumerate(rows) if line not in lines]
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, mode="w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+    return {file_path: len(lines) for file_path, lines in zip(file_paths, dropped)}
+
+# 브랜드 파일 하나의 중복을 합친다 (pipeline의 dedup:<브랜드> 단계)
+def dedup_file(input_file, output_file, report_file, brand=None, hu_file=None):
+    index, clusters = find_duplicates([input_file], [brand or brand_of(input_file)], hu_file)
+    save_report(index, clusters, [input_file], report_file)
+    return write_deduped(index, clusters, [input_file], [output_file])[input_file]
+
+def main():
+    parser = argparse.ArgumentParser(description="주소를 정규화해서 같은 매장이 여러 번 나온 행을 찾습니다.")
+    parser.add_argument("files", nargs="*", help="매장 CSV (크롤러 결과 또는 상가정보), 기본: data/<월>/ 의 브랜드 파일")
+    parser.add_argument("--month", default=None, help="data/ 아래 폴더 이름 (files를 지정하지 않았을 때)")
+    parser.add_argument("--hu", default=None, help="지역 키 -> 시군구코드에 쓸 hu.csv (기본: data/<월>/hu.csv)")
+    parser.add_argument("--report", default="duplicates.csv")
+    parser.add_argument("--merge", default=None, metavar="OUTPUT_DIR",
+                        help="중복을 뺀 파일을 이 폴더에 같은 이름으로 저장 (입력 폴더를 주면 덮어씀)")
+    parser.add_argument("--threshold", type=float, default=NAME_THRESHOLD)
+    args = parser.parse_args()
+
+    files = args.files
+    hu_file = args.hu
+    if not files:
+        import build_aggregates
+        month_dir = os.path.join(DATA_ROOT, args.month) if args.month else max(
+            os.path.join(DATA_ROOT, name) for name in os.listdir(DATA_ROOT)
+            if os.path.isfile(os.path.join(DATA_ROOT, name, "hu.csv")))
+        files = [os.path.join(month_dir, f"{brand}.csv") for brand in build_aggregates.BRANDS
+                 if os.path.exists(os.path.join(month_dir, f"{brand}.csv"))]
+        hu_file = hu_file or os.path.join(month_dir, "hu.csv")
+
+    index, clusters = find_duplicates(files, hu_file=hu_file, threshold=args.threshold)
+    save_report(index, clusters, files, args.report)
+    duplicates = sum(len(members) - 1 for members in clusters)
+    print(f"{len(index.records)} rows, {len(index.groups)} groups, {len(clusters)} clusters, "
+          f"{duplicates} duplicate rows -> {args.report}")
+
+    if args.merge:
+        outputs = [os.path.join(args.merge, os.path.basename(path)) for path in files]
+        for file_path, count in write_deduped(index, clusters, files, outputs).items():
+            if count:
+                print(f"{os.path.basename(file_path)}: removed {count} rows")
+
+if __name__ == "__main__":
+    main()
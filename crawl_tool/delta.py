@@ -0,0 +1,163 @@
+import os
+import csv
+import json
+import hashlib
+import argparse
+from collections import Counter
+from filter_csv import load_sample_areas, process_csv
+
+# 브랜드 고유 매장 코드 컬럼 (있으면 이 값으로 매장을 식별)
+ID_COLUMNS = ["storecd", "storCd"]
+DELTA_FILES = ("added", "removed", "changed")
+FAIL_HEADER = ["store", "addr", "prov", "area", "div", "original_file"]
+
+def read_rows(file_path):
+    with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        return header, [row for row in reader if row]
+
+def write_rows(file_path, header, rows):
+    with open(file_path, mode="w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def normalize_text(text):
+    return "".join(text.split()).lower()
+
+# 매장 식별 키 함수: 매장 코드가 있으면 코드, 없으면 정규화한 이름+주소
+def make_key_func(header):
+    for column in ID_COLUMNS:
+        if column in header:
+            index = header.index(column)
+            return lambda row: row[index] if index < len(row) and row[index] else normalize_text("|".join(row[:2]))
+    return lambda row: normalize_text(row[0]) + "|" + normalize_text(row[1] if len(row) > 1 else "")
+
+# 행 전체 내용의 지문 (같은 매장의 정보가 바뀌었는지 확인)
+def row_fingerprint(row):
+    return hashlib.sha1("\x1f".join(field.strip() for field in row).encode("utf-8")).hexdigest()
+
+# 키 -> 그 키의 행 목록 (같은 키의 행이 여러 개일 수 있다)
+def group_rows(rows, key_of):
+    groups = {}
+    for row in rows:
+        groups.setdefault(key_of(row), []).append(row)
+    return groups
+
+# 이전/현재 스냅샷을 비교하여 추가/삭제/변경된 매장을 찾는다
+# 같은 키의 행은 순서대로 짝을 짓고, 남는 행은 추가/삭제로 본다
+# changed는 (이전 행, 새 행) 쌍의 목록
+def diff_snapshots(previous_file, current_file):
+    prev_header, prev_rows = read_rows(previous_file)
+    header, rows = read_rows(current_file)
+    if prev_header != header:
+        raise Exception(f"Header mismatch: {prev_header} != {header}")
+
+    key_of = make_key_func(header)
+    previous = group_rows(prev_rows, key_of)
+    current = group_rows(rows, key_of)
+
+    added, removed, changed = [], [], []
+    for key, current_rows in current.items():
+        previous_rows = previous.get(key, [])
+        changed += [(old, new) for old, new in zip(previous_rows, current_rows)
+                    if row_fingerprint(old) != row_fingerprint(new)]
+        added += current_rows[len(previous_rows):]
+    for key, previous_rows in previous.items():
+        removed += previous_rows[len(current.get(key, [])):]
+    summary = {
+        "previous": os.path.basename(previous_file),
+        "current": os.path.basename(current_file),
+        "previous_count": len(prev_rows),
+        "current_count": len(rows),
+        "added": len(added),
+        "removed": len(removed),
+        "changed": len(changed),
+        "unchanged": len(rows) - len(added) - len(changed)
+    }
+    return header, added, removed, changed, summary
+
+# 비교 결과를 delta 폴더에 저장 (added.csv, removed.csv, changed.csv, summary.json)
+def save_delta(delta_dir, header, added, removed, changed, summary):
+    os.makedirs(delta_dir, exist_ok=True)
+    write_rows(os.path.join(delta_dir, "added.csv"), header, added)
+    write_rows(os.path.join(delta_dir, "removed.csv"), header, removed)
+    # changed.csv는 이전/새 행을 모두 남기되 구분 컬럼을 붙인다
+    write_rows(os.path.join(delta_dir, "changed.csv"), header + ["version"],
+               [old + ["old"] for old, _ in changed] + [new + ["new"] for _, new in changed])
+    with open(os.path.join(delta_dir, "summary.json"), mode="w", encoding="utf-8") as file:
+        json.dump(summary, file, ensure_ascii=False, indent=2)
+
+def load_delta(delta_dir):
+    header, added = read_rows(os.path.join(delta_dir, "added.csv"))
+    _, removed = read_rows(os.path.join(delta_dir, "removed.csv"))
+    _, changed_rows = read_rows(os.path.join(delta_dir, "changed.csv"))
+    old_rows = [row[:-1] for row in changed_rows if row[-1] == "old"]
+    new_rows = [row[:-1] for row in changed_rows if row[-1] == "new"]
+    return header, added, removed, list(zip(old_rows, new_rows))
+
+# 이전 달의 정제 결과(store,addr,prov,area,div)에 delta만 반영
+# 추가/변경된 행만 filter_csv.process_csv로 정제하므로 비용이 변경량에 비례한다
+def apply_delta(previous_output, delta_dir, sample_file, output_file, fail_file=None):
+    header, added, removed, changed = load_delta(delta_dir)
+    filename = os.path.basename(output_file)
+
+    # 삭제/변경 전 행은 원본의 (이름, 주소)로 이전 결과에서 제거
+    # 이름과 주소가 같은 행이 여러 개면 delta에 나온 개수만큼만 지운다
+    drop = Counter((row[0], row[1]) for row in removed)
+    drop.update((old[0], old[1]) for old, _ in changed)
+
+    # 추가/변경 후 행만 임시 파일로 만들어 정제
+    upsert_dir = os.path.join(delta_dir, "upsert")
+    os.makedirs(upsert_dir, exist_ok=True)
+    upsert_file = os.path.join(upsert_dir, filename)
+    write_rows(upsert_file, header, added + [new for _, new in changed])
+
+    fail_file = fail_file or os.path.join(delta_dir, "fail.csv")
+    with open(fail_file, mode="w", encoding="utf-8-sig", newline="") as file:
+        fail_writer = csv.writer(file)
+        fail_writer.writerow(FAIL_HEADER)
+        process_csv(upsert_file, load_sample_areas(sample_file), fail_writer)
+
+    output_header, previous_rows = read_rows(previous_output)
+    _, new_rows = read_rows(os.path.join(upsert_dir, "filter", filename))
+    kept = []
+    for row in previous_rows:
+        if drop[(row[0], row[1])] > 0:
+            drop[(row[0], row[1])] -= 1
+        else:
+            kept.append(row)
+    write_rows(output_file, output_header, kept + new_rows)
+    print(f"{output_file}: kept {len(kept)}, dropped {len(previous_rows) - len(kept)}, added {len(new_rows)}")
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description="이전 크롤링 결과와 비교하여 변경된 매장만 반영합니다.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = sub.add_parser("diff", help="두 크롤링 결과(*_stores.csv)를 비교")
+    diff_parser.add_argument("previous")
+    diff_parser.add_argument("current")
+    diff_parser.add_argument("--out", required=True, help="delta를 저장할 폴더")
+
+    apply_parser = sub.add_parser("apply", help="이전 달 정제 결과에 delta 반영")
+    apply_parser.add_argument("--previous-output", required=True, help="예: data/2024-12/lotteria.csv")
+    apply_parser.add_argument("--delta", required=True, help="diff로 만든 delta 폴더")
+    apply_parser.add_argument("--sample", default="sample.csv")
+    apply_parser.add_argument("--output", required=True, help="예: data/2025-01/lotteria.csv")
+    apply_parser.add_argument("--fail", default=None, help="정제 실패 행을 저장할 파일")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        header, added, removed, changed, summary = diff_snapshots(args.previous, args.current)
+        save_delta(args.out, header, added, removed, changed, summary)
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        apply_delta(args.previous_output, args.delta, args.sample, args.output, args.fail)
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,129 @@
-import pandas as pd
+import os
+import codecs
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import instrument
 
-# CSV 파일을 불러오기
-input_file = 'hu.csv'  # 불러올 CSV 파일 경로
-output_file = 'hu-utf8.csv'  # 저장할 CSV 파일 경로
+# 기본 입출력 파일 경로
+INPUT_FILE = 'hu.csv'  # 불러올 CSV 파일 경로
+OUTPUT_FILE = 'hu-utf8.csv'  # 저장할 CSV 파일 경로
+OUTPUT_ENCODING = 'utf-8-sig'
+CHUNK_SIZE = 1024 * 1024   # 한 번에 변환하는 바이트 수
+SAMPLE_SIZE = 64 * 1024    # 인코딩 판별에 쓰는 바이트 수
 
-# CSV 파일을 pandas DataFrame으로 불러오기
-df = pd.read_csv(input_file)
+# BOM으로 바로 알 수 있는 인코딩
+BOMS = [(codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16')]
+# BOM이 없을 때 차례로 시도하는 인코딩 (cp949는 euc-kr을 포함한다)
+CANDIDATES = ['utf-8', 'cp949']
 
-# DataFrame을 utf-8-sig 인코딩으로 저장하기
-df.to_csv(output_file, index=False, encoding='utf-8-sig')
+# 파일 앞부분으로 인코딩 판별
+# 앞부분이 모두 ASCII(영문 헤더 등)이면 처음 나오는 ASCII가 아닌 바이트부터 SAMPLE_SIZE만큼 본다
+def detect_encoding(file_path, sample_size=SAMPLE_SIZE):
+    with open(file_path, mode='rb') as file:
+        head = file.read(sample_size)
+        for bom, encoding in BOMS:
+            if head.startswith(bom):
+                return encoding
+        sample = head
+        while sample and sample.isascii():
+            sample = file.read(sample_size)
+        if not sample:
+            return 'utf-8'  # ASCII만 있는 파일
+        start = next(i for i, byte in enumerate(sample) if byte >= 0x80)
+        sample = sample[start:] + file.read(start)
 
-print(f"파일이 {output_file}로 저장되었습니다.")
+    for encoding in CANDIDATES:
+        # 마지막 글자가 잘렸을 수 있으므로 final=False로 디코딩한다
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise Exception(f"Unknown encoding: {file_path}")
+
+# CSV를 파싱하지 않고 바이트 chunk 단위로 utf-8-sig로 변환 (값, 줄바꿈은 그대로 유지)
+# 출력은 임시 파일에 쓴 뒤 바꾸므로 input_file과 output_file이 같아도 된다
+def transcode(input_file, output_file, encoding=None, chunk_size=CHUNK_SIZE, errors='strict'):
+    encoding = encoding or detect_encoding(input_file)
+    if encoding == OUTPUT_ENCODING and os.path.abspath(input_file) == os.path.abspath(output_file):
+        return encoding, 0
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    encoder = codecs.getincrementalencoder(OUTPUT_ENCODING)()
+    temp_file = f"{output_file}.tmp"
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    written = 0
+    try:
+        with open(input_file, mode='rb') as source, open(temp_file, mode='wb') as target:
+            while True:
+                chunk = source.read(chunk_size)
+                text = decoder.decode(chunk, final=not chunk)
+                data = encoder.encode(text, final=not chunk)
+                target.write(data)
+                written += len(data)
+                if not chunk:
+                    break
+        os.replace(temp_file, output_file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    return encoding, written
+
+# CSV 파일을 utf-8-sig 인코딩으로 다시 저장 (encoding이 None이면 앞부분으로 판별)
+def convert(input_file=INPUT_FILE, output_file=OUTPUT_FILE, encoding=None, chunk_size=CHUNK_SIZE, errors='strict'):
+    with instrument.stage(f"enc:{os.path.basename(input_file)}") as stage:
+        source, written = transcode(input_file, output_file, encoding, chunk_size, errors)
+        stage.add_file(input_file, encoding=source, bytes_in=os.path.getsize(input_file), bytes_out=written)
+
+    print(f"파일이 {output_file}로 저장되었습니다. ({source} -> {OUTPUT_ENCODING})")
+    return output_file
+
+def _convert_job(input_file, output_file, encoding, chunk_size, errors):
+    return transcode(input_file, output_file, encoding, chunk_size, errors)
+
+# 폴더 안의 CSV를 여러 프로세스로 변환 (output_dir이 None이면 제자리에서 변환)
+def convert_directory(input_dir, output_dir=None, encoding=None, workers=None, chunk_size=CHUNK_SIZE,
+                      errors='strict', extension='.csv'):
+    output_dir = output_dir or input_dir
+    jobs = [(os.path.join(input_dir, name), os.path.join(output_dir, name))
+            for name in sorted(os.listdir(input_dir)) if name.lower().endswith(extension)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+
+    results = {}
+    with instrument.stage("enc", workers=workers) as stage:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_convert_job, input_file, output_file, encoding, chunk_size, errors): input_file
+                       for input_file, output_file in jobs}
+            for future in as_completed(futures):
+                input_file = futures[future]
+                try:
+                    source, written = future.result()
+                except Exception as e:
+                    print(f"Error converting {input_file}: {e}")
+                    continue
+                results[input_file] = source
+                stage.add_file(input_file, encoding=source, bytes_in=os.path.getsize(input_file), bytes_out=written)
+                print(f"{os.path.basename(input_file)}: {source} -> {OUTPUT_ENCODING}"
+                      + ("" if written else " (already converted)"))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV 파일(또는 폴더)을 utf-8-sig 인코딩으로 다시 저장합니다.")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE, help="CSV 파일 또는 폴더")
+    parser.add_argument("output", nargs="?", default=None,
+                        help=f"출력 파일 또는 폴더 (기본: 파일은 {OUTPUT_FILE}, 폴더는 제자리에서 변환)")
+    parser.add_argument("--encoding", default=None, help="입력 파일 인코딩 (예: cp949, 기본: 자동 판별)")
+    parser.add_argument("--errors", default="strict", choices=["strict", "replace"],
+                        help="변환할 수 없는 바이트 처리 방법")
+    parser.add_argument("--workers", type=int, default=None, help="폴더 변환 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if os.path.isdir(args.input):
+        convert_directory(args.input, args.output, args.encoding, args.workers, args.chunk_size, args.errors)
+    else:
+        convert(args.input, args.output or OUTPUT_FILE, args.encoding, args.chunk_size, args.errors)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import os
+import csv
+import time
+import argparse
+from difflib import SequenceMatcher
+from region_names import ALIAS_TO_PROVINCE, normalize_province, make_div
+
+DATA_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+SIG_TABLE_FILE = os.path.join(DATA_ROOT, "2024-12", "extracted_sig_data.csv")
+FAIL_HEADER = ["store", "addr", "prov", "area", "div", "original_file"]
+AUDIT_HEADER = ["store", "addr", "original_file", "old_prov", "old_area", "new_prov", "new_area",
+                "sig_cd", "score", "runner_up", "runner_up_score", "status"]
+
+THRESHOLD = 0.8  # 이 점수 이상이면 자동으로 고친다
+MARGIN = 0.1     # 2등 후보와 이만큼 차이가 나야 한다 (수원시 -> 어느 구인지 모르는 경우 등)
+TOP_K = 8        # n-gram 색인에서 뽑아 정밀 비교할 후보 수
+HEAD_LENGTH = 12  # 주소 앞부분(시도 제외) 몇 글자로 비교할지
+
+# 표기 길이가 긴 것부터 비교해야 "강원특별자치도춘천시" 같은 붙여쓴 주소도 처리된다
+PROVINCE_PREFIXES = sorted(ALIAS_TO_PROVINCE, key=len, reverse=True)
+
+def compact(text):
+    return "".join(text.split())
+
+# 한 글자 + 두 글자 n-gram (시군구명은 2~7글자라 한 글자도 써야 오타를 잡는다)
+def ngrams(text):
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+# 주소 -> (시도 약칭 또는 "", 시도를 뺀 나머지 앞부분)
+def split_province(addr):
+    words = addr.split()
+    if not words:
+        return "", ""
+    if words[0] in ALIAS_TO_PROVINCE:
+        return normalize_province(words[0]), compact("".join(words[1:]))[:HEAD_LENGTH]
+    text = compact(addr)
+    for prefix in PROVINCE_PREFIXES:
+        if text.startswith(prefix):
+            return ALIAS_TO_PROVINCE[prefix], text[len(prefix):][:HEAD_LENGTH]
+    return "", text[:HEAD_LENGTH]
+
+# 후보 시군구명과 주소 앞부분의 유사도 (후보 길이 +-1 글자 창 중 최대값)
+def similarity(area, head):
+    best = 0.0
+    for length in (len(area) - 1, len(area), len(area) + 1):
+        if length > 0:
+            best = max(best, SequenceMatcher(None, area, head[:length]).ratio())
+    return best
+
+# 시군구 기준표: sample.csv의 (시도명, 시군구명), sig_cd는 extracted_sig_data.csv에서 띄어쓰기를 무시하고 찾는다
+# filter_csv가 sample.csv와 비교하므로 sample.csv에 없는 이름(세종특별자치시, 나뉘기 전의 부천시 등)은 후보로 쓰지 않는다
+# sample.csv가 없을 때만 extracted_sig_data.csv의 이름을 후보로 쓴다
+def load_master(sample_file=None, sig_table_file=SIG_TABLE_FILE):
+    names, sig_cds = {}, {}
+    if sig_table_file and os.path.exists(sig_table_file):
+        with open(sig_table_file, mode="r", encoding="utf-8-sig", newline="") as file:
+            for row in csv.DictReader(file):
+                if row.get("SIG_KOR_NM"):
+                    key = (row["prov"], compact(row["SIG_KOR_NM"]))
+                    names[key] = row["SIG_KOR_NM"]
+                    sig_cds[key] = row.get("SIG_CD", "")
+    if sample_file and os.path.exists(sample_file):
+        names = {}
+        with open(sample_file, mode="r", encoding="utf-8-sig", newline="") as file:
+            for row in csv.DictReader(file):
+                prov = normalize_province(row.get("시도명", ""))
+                names.setdefault((prov, compact(row["시군구명"])), row["시군구명"])
+    return [(prov, area, sig_cds.get((prov, key), "")) for (prov, key), area in names.items()]
+
+# n-gram 역색인으로 후보를 좁힌 뒤 소수의 후보만 정밀 비교한다
+class DistrictIndex:
+    def __init__(self, entries):
+        self.entries = entries
+        self.keys = [compact(area) for _, area, _ in entries]
+        self.postings = {}
+        for index, key in enumerate(self.keys):
+            for gram in ngrams(key):
+                self.postings.setdefault(gram, []).append(index)
+        # 시군구가 하나뿐인 시도 (세종): 주소에 시도만 있어도 그 지역으로 정한다
+        by_province = {}
+        for index, (prov, _, _) in enumerate(entries):
+            by_province.setdefault(prov, []).append(index)
+        self.single = {prov: indexes[0] for prov, indexes in by_province.items() if len(indexes) == 1}
+        self.cache = {}
+
+    def candidates(self, prov, head):
+        counts = {}
+        for gram in ngrams(head):
+            for index in self.postings.get(gram, ()):
+                if not prov or self.entries[index][0] == prov:
+                    counts[index] = counts.get(index, 0) + 1
+        return sorted(counts, key=counts.get, reverse=True)[:TOP_K]
+
+    # 주소 -> [(점수, 기준표 항목)] 점수 내림차순, 같은 (시도, 앞부분)은 한 번만 계산
+    def match(self, addr):
+        prov, head = split_province(addr)
+        cache_key = (prov, head)
+        if cache_key not in self.cache and prov in self.single:
+            self.cache[cache_key] = [(1.0, self.entries[self.single[prov]])]
+        if cache_key not in self.cache:
+            scored = [(similarity(self.keys[index], head), self.entries[index])
+                      for index in self.candidates(prov, head)]
+            scored.sort(key=lambda item: item[0], reverse=True)
+            self.cache[cache_key] = scored
+        return self.cache[cache_key]
+
+# 실패 행 하나를 판정: (status, 1등, 2등)
+def judge(scored, threshold=THRESHOLD, margin=MARGIN):
+    if not scored:
+        return "no_candidate", None, None
+    best = scored[0]
+    runner_up = next((item for item in scored[1:] if item[1][:2] != best[1][:2]), None)
+    if best[0] < threshold:
+        return "low_score", best, runner_up
+    if runner_up and best[0] - runner_up[0] < margin:
+        return "ambiguous", best, runner_up
+    return "accepted", best, runner_up
+
+def read_fail_rows(fail_file):
+    with open(fail_file, mode="r", encoding="utf-8-sig", newline="") as file:
+        return list(csv.DictReader(file))
+
+# 자동으로 고친 행을 filter/<원본 파일>에 이어 붙인다 (filter_csv.process_csv 출력과 같은 형식)
+def append_to_filter(rows, filter_dir):
+    by_file = {}
+    for row in rows:
+        by_file.setdefault(row["original_file"], []).append(row)
+    for filename, file_rows in by_file.items():
+        output_file_path = os.path.join(filter_dir, filename)
+        if not os.path.exists(output_file_path):
+            print(f"Skipping {len(file_rows)} rows: {output_file_path} not found")
+            continue
+        with open(output_file_path, mode="a", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerows([[row["store"], row["addr"], row["prov"], row["area"], row["div"]] for row in file_rows])
+
+def resolve_failures(fail_file, sample_file, audit_file, remaining_file, sig_table_file=SIG_TABLE_FILE,
+                     threshold=THRESHOLD, margin=MARGIN, filter_dir=None):
+    started = time.perf_counter()
+    index = DistrictIndex(load_master(sample_file, sig_table_file))
+    rows = read_fail_rows(fail_file)
+
+    accepted, remaining, audit = [], [], []
+    for row in rows:
+        status, best, runner_up = judge(index.match(row["addr"]), threshold, margin)
+        new_prov, new_area, sig_cd = best[1] if best else ("", "", "")
+        audit.append([row["store"], row["addr"], row.get("original_file", ""), row["prov"], row["area"],
+                      new_prov, new_area, sig_cd, f"{best[0]:.3f}" if best else "",
+                      make_div(*runner_up[1][:2]) if runner_up else "",
+                      f"{runner_up[0]:.3f}" if runner_up else "", status])
+        if status == "accepted":
+            accepted.append(dict(row, prov=new_prov, area=new_area, div=make_div(new_prov, new_area)))
+        else:
+            remaining.append(row)
+    elapsed = time.perf_counter() - started
+
+    with open(audit_file, mode="w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(AUDIT_HEADER)
+        writer.writerows(audit)
+    with open(remaining_file, mode="w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=FAIL_HEADER, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(remaining)
+    if filter_dir:
+        append_to_filter(accepted, filter_dir)
+
+    print(f"{len(rows)} failed rows: {len(accepted)} resolved, {len(remaining)} left "
+          f"({len(index.cache)} distinct lookups, {elapsed:.3f}s)")
+    return accepted, remaining
+
+def main():
+    parser = argparse.ArgumentParser(description="fail.csv의 시군구명을 기준표와 비교해 자동으로 고칩니다.")
+    parser.add_argument("--fail", default="fail.csv")
+    parser.add_argument("--sample", default="sample.csv")
+    parser.add_argument("--sig-table", default=SIG_TABLE_FILE)
+    parser.add_argument("--audit", default="fail_audit.csv", help="판정 내역을 저장할 파일")
+    parser.add_argument("--remaining", default="fail_remaining.csv", help="고치지 못한 행을 저장할 파일")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--margin", type=float, default=MARGIN)
+    parser.add_argument("--apply", metavar="FILTER_DIR", default=None,
+                        help="고친 행을 이 폴더의 원본 파일 이름 CSV에 이어 붙임 (예: filter)")
+    args = parser.parse_args()
+    resolve_failures(args.fail, args.sample, args.audit, args.remaining, args.sig_table,
+                     args.threshold, args.margin, args.apply)
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,16 @@
 import os
 import csv
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from region_names import parse_address, make_div
+import instrument
 
-def replace_location_name(name):
-    replacements = {
-        "서울": ["서울특별시", "서울", "서울시"],
-        "세종": ["세종특별자치시", "세종", "세종시"],
-        "울산": ["울산광역시", "울산", "울산시"],
-        "인천": ["인천광역시", "인천", "인천시"],
-        "전남": ["전라남도", "전남"],
-        "전북": ["전북특별자치도", "전라북도", "전북"],
-        "제주": ["제주특별자치도", "제주", "제주시"],
-        "충남": ["충청남도", "충남", "충남시"],
-        "충북": ["충청북도", "충북"],
-        "강원": ["강원특별자치도", "강원", "강원도", "강원시"],
-        "경기": ["경기도", "경기"],
-        "경남": ["경상남도", "경남"],
-        "경북": ["경상북도", "경북"],
-        "광주": ["광주광역시", "광주"],
-        "대구": ["대구광역시", "대구", "대구광역", "대구시"],
-        "대전": ["대전광역시", "대전", "대전시"],
-        "부산": ["부산광역시", "부산", "부산시"]
-    }
-
-    for key, values in replacements.items():
-        if name in values:
-            return key
-    return name
+OUTPUT_HEADER = ["store", "addr", "prov", "area", "div"]
+FAIL_HEADER = ["store", "addr", "prov", "area", "div", "original_file"]
+SKIP_FILES = {"sample.csv", "fail.csv"}
+FAIL_BATCH = 1000  # 워커가 fail 행을 모아서 보내는 단위
 
 def load_sample_areas(sample_file_path):
     areas = set()
@@ -35,64 +20,173 @@ def load_sample_areas(sample_file_path):
             areas.add(row['시군구명'])
     return areas
 
-def process_csv(file_path, sample_areas, fail_writer):
-    directory, filename = os.path.split(file_path)
-    output_directory = os.path.join(directory, "filter")
-    os.makedirs(output_directory, exist_ok=True)
-    output_file_path = os.path.join(output_directory, filename)
+# output_file_path를 지정하지 않으면 입력 파일 옆의 filter/ 폴더에 같은 이름으로 저장
+def process_csv(file_path, sample_areas, fail_writer, output_file_path=None):
+    with instrument.stage(f"filter_csv:{os.path.basename(file_path)}") as stage:
+        counts = _process_csv(file_path, sample_areas, fail_writer, output_file_path)
+        stage.rows_in, stage.rows_out, stage.fail_rows = counts
+    return counts
 
-    processed_data = []
-    processed_data.append(["store", "addr", "prov", "area", "div"])
+# 정제한 행을 출력 파일에 바로 쓴다 (파일 크기와 관계없이 메모리 사용량 일정)
+# 반환: (입력 행 수, 저장한 행 수, fail 행 수)
+def _process_csv(file_path, sample_areas, fail_writer, output_file_path=None):
+    directory, filename = os.path.split(file_path)
+    if output_file_path is None:
+        output_file_path = os.path.join(directory, "filter", filename)
+    os.makedirs(os.path.dirname(output_file_path) or ".", exist_ok=True)
+    rows_in = rows_out = fail_rows = 0
 
     with open(file_path, mode='r', encoding='utf-8-sig') as input_file:
         reader = csv.reader(input_file)
-        
+
         # Check if the file is empty or only contains a header
         try:
             headers = next(reader)  # Attempt to read the header
         except StopIteration:
             print(f"No data in file {filename}, skipping...")
-            return
-        
-        for row in reader:
-            store, addr = row[0], row[1]
-            addr_words = addr.split()
-
-            prov = replace_location_name(addr_words[0]) if addr_words else ""
-            area = addr_words[1] if len(addr_words) > 1 else ""
-            
-            if prov == "세종":
-                area = "세종시"
-            elif len(addr_words) > 2 and addr_words[2].endswith("구"):
-                area += f" {addr_words[2]}"
-                
-            div = f"{prov} {area}".strip()
-
-            if area in sample_areas:
-                processed_data.append([store, addr, prov, area, div])
-            else:
-                fail_writer.writerow([store, addr, prov, area, div, filename])
-
-    with open(output_file_path, mode='w', encoding='utf-8-sig', newline='') as output_file:
-        writer = csv.writer(output_file)
-        writer.writerows(processed_data)
+            return rows_in, rows_out, fail_rows
+
+        with open(output_file_path, mode='w', encoding='utf-8-sig', newline='') as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(OUTPUT_HEADER)
+
+            for row in reader:
+                store, addr = row[0], row[1]
+                prov, area = parse_address(addr)
+                div = make_div(prov, area)
+                rows_in += 1
+
+                if area in sample_areas:
+                    writer.writerow([store, addr, prov, area, div])
+                    rows_out += 1
+                else:
+                    fail_writer.writerow([store, addr, prov, area, div, filename])
+                    fail_rows += 1
 
     print(f"Processed file saved at: {output_file_path}")
+    return rows_in, rows_out, fail_rows
+
+# --- 병렬 모드: 워커 프로세스마다 파일 하나씩, fail 행은 큐를 통해 부모 프로세스 한 곳에서 기록 ---
+
+_worker_sample_areas = None
+_worker_fail_queue = None
+
+def _init_worker(sample_file_path, fail_queue):
+    global _worker_sample_areas, _worker_fail_queue
+    _worker_sample_areas = load_sample_areas(sample_file_path)
+    _worker_fail_queue = fail_queue
+
+# 워커 쪽 fail_writer: FAIL_BATCH 행씩 묶어서 (fail 파일 번호, 행 목록)으로 큐에 넣는다
+class QueueFailWriter:
+    def __init__(self, fail_queue, fail_index):
+        self.queue = fail_queue
+        self.fail_index = fail_index
+        self.rows = []
+
+    def writerow(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= FAIL_BATCH:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.queue.put((self.fail_index, self.rows))
+            self.rows = []
+
+def _process_job(file_path, output_file_path, fail_index):
+    fail_writer = QueueFailWriter(_worker_fail_queue, fail_index)
+    try:
+        return _process_csv(file_path, _worker_sample_areas, fail_writer, output_file_path)
+    finally:
+        fail_writer.flush()
+
+# 부모 프로세스의 기록 스레드: 큐에서 받은 행을 fail 파일에 쓴다 (None을 받으면 종료)
+def _drain_fail_queue(fail_queue, fail_writers):
+    while True:
+        item = fail_queue.get()
+        if item is None:
+            return
+        fail_index, rows = item
+        fail_writers[fail_index].writerows(rows)
+
+# jobs: [(입력 파일, 출력 파일, fail 파일 번호)], fail_file_paths: fail 파일 목록
+def process_files(jobs, sample_file_path, fail_file_paths, workers=None):
+    workers = workers or os.cpu_count() or 1
+    fail_files = [open(path, mode='w', encoding='utf-8-sig', newline='') for path in fail_file_paths]
+    try:
+        fail_writers = [csv.writer(file) for file in fail_files]
+        for fail_writer in fail_writers:
+            fail_writer.writerow(FAIL_HEADER)
+
+        if workers <= 1:
+            sample_areas = load_sample_areas(sample_file_path)
+            for file_path, output_file_path, fail_index in jobs:
+                process_csv(file_path, sample_areas, fail_writers[fail_index], output_file_path)
+            return
+
+        fail_queue = multiprocessing.Queue()
+        drain = threading.Thread(target=_drain_fail_queue, args=(fail_queue, fail_writers), daemon=True)
+        drain.start()
+        try:
+            with instrument.stage("filter_csv", workers=workers) as stage, \
+                    ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                        initargs=(sample_file_path, fail_queue)) as executor:
+                futures = {executor.submit(_process_job, *job): job for job in jobs}
+                for future in as_completed(futures):
+                    file_path = futures[future][0]
+                    rows_in, rows_out, fail_rows = future.result()
+                    stage.add_file(file_path, rows_in, rows_out, fail_rows)
+        finally:
+            fail_queue.put(None)
+            drain.join()
+    finally:
+        for file in fail_files:
+            file.close()
+
+def list_input_files(input_dir, fail_file_path=None):
+    skip = SKIP_FILES | ({os.path.basename(fail_file_path)} if fail_file_path else set())
+    return sorted(f for f in os.listdir(input_dir) if f.endswith('.csv') and f not in skip)
+
+# input_dir의 CSV를 output_dir(기본: input_dir/filter)에 정제하고, 실패 행은 fail_file_path에 모은다
+def process_all_csv_in_directory(sample_file_path, input_dir=None, output_dir=None, fail_file_path=None, workers=1):
+    input_dir = input_dir or os.getcwd()
+    output_dir = output_dir or os.path.join(input_dir, "filter")
+    fail_file_path = fail_file_path or os.path.join(input_dir, 'fail.csv')
+    jobs = [(os.path.join(input_dir, name), os.path.join(output_dir, name), 0)
+            for name in list_input_files(input_dir, fail_file_path)]
+    process_files(jobs, sample_file_path, [fail_file_path], workers)
 
-def process_all_csv_in_directory(sample_file_path):
-    sample_areas = load_sample_areas(sample_file_path)
-    current_directory = os.getcwd()
-    fail_file_path = os.path.join(current_directory, 'fail.csv')
+# 여러 폴더(예: 월별 원본)를 한 워커 풀에서 처리, 폴더마다 filter/와 fail.csv를 따로 만든다
+def process_directories(sample_file_path, input_dirs, output_root=None, workers=None):
+    jobs, fail_file_paths = [], []
+    for index, input_dir in enumerate(input_dirs):
+        if output_root:
+            output_dir = os.path.join(output_root, os.path.basename(os.path.normpath(input_dir)))
+        else:
+            output_dir = os.path.join(input_dir, "filter")
+        os.makedirs(output_dir, exist_ok=True)
+        fail_file_path = os.path.join(output_dir if output_root else input_dir, 'fail.csv')
+        fail_file_paths.append(fail_file_path)
+        jobs.extend((os.path.join(input_dir, name), os.path.join(output_dir, name), index)
+                    for name in list_input_files(input_dir, fail_file_path))
+    process_files(jobs, sample_file_path, fail_file_paths, workers)
 
-    with open(fail_file_path, mode='w', encoding='utf-8-sig', newline='') as fail_file:
-        fail_writer = csv.writer(fail_file)
-        fail_writer.writerow(["store", "addr", "prov", "area", "div", "original_file"])
+def main():
+    parser = argparse.ArgumentParser(description="크롤러 결과 CSV의 시군구명을 sample.csv 기준으로 검증/정제합니다.")
+    parser.add_argument("--sample", default="sample.csv")
+    parser.add_argument("--input-dir", nargs="+", default=None, help="입력 폴더 (기본: 현재 폴더, 여러 개 지정 가능)")
+    parser.add_argument("--output-dir", default=None,
+                        help="출력 폴더 (기본: <입력 폴더>/filter, 입력이 여러 개면 <출력 폴더>/<입력 폴더 이름>)")
+    parser.add_argument("--fail", default=None, help="fail.csv 경로 (입력 폴더가 하나일 때, 기본: <입력 폴더>/fail.csv)")
+    parser.add_argument("--workers", type=int, default=1, help="동시에 처리할 파일 수 (프로세스), 0이면 CPU 수")
+    args = parser.parse_args()
 
-        csv_files = [f for f in os.listdir(current_directory) if f.endswith('.csv') and f != 'sample.csv']
-        for csv_file in csv_files:
-            file_path = os.path.join(current_directory, csv_file)
-            process_csv(file_path, sample_areas, fail_writer)
+    workers = args.workers or os.cpu_count() or 1
+    input_dirs = args.input_dir or [os.getcwd()]
+    if len(input_dirs) == 1:
+        process_all_csv_in_directory(args.sample, input_dirs[0], args.output_dir, args.fail, workers)
+    else:
+        process_directories(args.sample, input_dirs, args.output_dir, workers)
 
 if __name__ == "__main__":
-    sample_file_path = 'sample.csv'
-    process_all_csv_in_directory(sample_file_path)
\ No newline at end of file
+    main()
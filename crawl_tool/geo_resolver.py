@@ -0,0 +1,102 @@
+import os
+import csv
+import json
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from region_names import parse_address, expand_area, normalize_area, normalize_province
+
+DATA_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+GEOJSON_FILE = os.path.join(DATA_ROOT, "korea.geojson")
+SIG_TABLE_FILE = os.path.join(DATA_ROOT, "2024-12", "extracted_sig_data.csv")
+HU_FILE = os.path.join(DATA_ROOT, "2024-12", "hu.csv")
+
+def to_coord(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def read_rows(file_path):
+    with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+        return list(csv.DictReader(file))
+
+# SIG_CD -> (prov, area), area는 크롤러 결과/sample.csv와 같은 표기 (normalize_area 규칙)
+# hu.csv를 우선 사용하고 (군위군은 대구, 세종은 "세종시"), hu.csv에 없는 코드만 extracted_sig_data.csv로 채운다
+# 경계는 하나인데 hu.csv에서 구로 나뉜 시(부천시)는 좌표로 구를 정할 수 없으므로 표에서 뺀다
+def load_sig_table(sig_table_file, hu_file=None):
+    names = {}
+    if sig_table_file:
+        for row in read_rows(sig_table_file):
+            if row.get("SIG_CD"):
+                prov = normalize_province(row["prov"])
+                names[row["SIG_CD"]] = (prov, normalize_area(prov, row["SIG_KOR_NM"]))
+
+    table = {}
+    hu_rows = read_rows(hu_file) if hu_file else []
+    for row in hu_rows:
+        sig_cd = row.get("sig_cd")
+        if not sig_cd:
+            continue
+        area = "".join(row["area"].split())
+        boundary_name = "".join(names.get(sig_cd, ("", ""))[1].split())
+        if boundary_name and boundary_name != area and area.startswith(boundary_name):
+            names.pop(sig_cd, None)
+            continue
+        table[sig_cd] = (row["prov"], expand_area(row["prov"], row["area"]))
+    for sig_cd, region in names.items():
+        table.setdefault(sig_cd, region)
+    return table
+
+# korea.geojson의 시군구 경계를 한 번만 읽고 STRtree로 색인하여
+# 좌표 -> SIG_CD 변환을 묶음 단위로 처리한다. 좌표가 없으면 주소 문자열로 대체한다.
+class RegionResolver:
+    def __init__(self, geojson_file=GEOJSON_FILE, sig_table_file=SIG_TABLE_FILE, hu_file=HU_FILE, sample_areas=None):
+        with open(geojson_file, mode="r", encoding="utf-8") as file:
+            features = json.load(file)["features"]
+        self.codes = np.array([feature["properties"]["SIG_CD"] for feature in features], dtype=object)
+        self.geometries = np.array([shape(feature["geometry"]) for feature in features], dtype=object)
+        shapely.prepare(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+        self.sig_table = load_sig_table(sig_table_file, hu_file)
+        self.sample_areas = sample_areas
+
+    # 경도/위도 배열 -> SIG_CD 배열 (어느 경계에도 속하지 않으면 None)
+    def resolve_points(self, lngs, lats):
+        points = shapely.points(np.asarray(lngs, dtype=float), np.asarray(lats, dtype=float))
+        result = np.full(len(points), None, dtype=object)
+        point_index, geometry_index = self.tree.query(points, predicate="intersects")
+        result[point_index] = self.codes[geometry_index]
+        return result
+
+    # SIG_CD -> (prov, area), 표에 없거나 sample.csv에 없는 지역이면 None (주소 파싱으로 대체)
+    def region_of(self, sig_cd):
+        region = self.sig_table.get(sig_cd)
+        if region and self.sample_areas is not None and region[1] not in self.sample_areas:
+            return None
+        return region
+
+    # 표의 지역 중 sample.csv 시군구명에 없는 것 [(sig_cd, prov, area)]
+    def unknown_areas(self, sample_areas):
+        return [(sig_cd, prov, area) for sig_cd, (prov, area) in sorted(self.sig_table.items())
+                if area not in sample_areas]
+
+    # [(주소, 경도, 위도)] -> [(sig_cd, prov, area)]
+    # 좌표가 있는 행은 한 번에 공간 색인으로 처리하고, 나머지는 주소 파싱으로 처리한다
+    def resolve(self, rows):
+        results = [None] * len(rows)
+        coords = [(to_coord(lng), to_coord(lat)) for _, lng, lat in rows]
+        with_coords = [i for i, (lng, lat) in enumerate(coords) if lng is not None and lat is not None]
+        if with_coords:
+            codes = self.resolve_points([coords[i][0] for i in with_coords],
+                                        [coords[i][1] for i in with_coords])
+            for i, sig_cd in zip(with_coords, codes):
+                region = self.region_of(sig_cd) if sig_cd else None
+                if region:
+                    results[i] = (sig_cd, region[0], region[1])
+
+        for i, result in enumerate(results):
+            if result is None:
+                prov, area = parse_address(rows[i][0])
+                results[i] = (None, prov, area)
+        return results
@@ -0,0 +1,286 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import cProfile
+import contextvars
+from datetime import datetime
+from urllib.parse import urlsplit
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+# 환경 변수로 모든 모듈의 보고서/프로파일을 켤 수 있다
+# PIPELINE_REPORT=run.json           실행이 끝나면 보고서를 저장
+# PIPELINE_PROFILE=filter_csv,crawl:*  이름이 일치하는 단계만 프로파일 (* 는 접두사 일치)
+# PIPELINE_PROFILER=cprofile|pyinstrument
+REPORT_ENV = "PIPELINE_REPORT"
+PROFILE_ENV = "PIPELINE_PROFILE"
+PROFILER_ENV = "PIPELINE_PROFILER"
+PROFILE_DIR = "profiles"
+
+# 현재 프로세스의 최대 RSS (바이트), 측정할 수 없으면 None
+def peak_rss():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return None
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+# 호스트별 HTTP 요청 수/상태 코드/지연 시간
+class HttpStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.status = {}
+        self.latencies = []
+
+    def add(self, status, elapsed):
+        self.count += 1
+        if status is None:
+            self.errors += 1
+        else:
+            self.status[str(status)] = self.status.get(str(status), 0) + 1
+        if elapsed is not None:
+            self.latencies.append(elapsed)
+
+    def to_dict(self):
+        latencies = self.latencies
+        return {
+            "requests": self.count,
+            "errors": self.errors,
+            "status": self.status,
+            "latency_mean_s": sum(latencies) / len(latencies) if latencies else None,
+            "latency_p50_s": percentile(latencies, 0.5),
+            "latency_p95_s": percentile(latencies, 0.95),
+            "latency_max_s": max(latencies) if latencies else None
+        }
+
+# 단계 하나의 측정값, 사용하는 쪽에서 rows_in/rows_out/fail_rows를 늘려 준다
+class Stage:
+    def __init__(self, name, **meta):
+        self.name = name
+        self.meta = meta
+        self.rows_in = 0
+        self.rows_out = 0
+        self.fail_rows = 0
+        self.files = []
+        self.http = {}
+        self.wall_s = None
+        self.cpu_s = None
+        self.process_peak_rss = None
+        self.profile = None
+        self.error = None
+
+    def add_file(self, path, rows_in=0, rows_out=0, fail_rows=0, **extra):
+        self.files.append(dict(path=path, rows_in=rows_in, rows_out=rows_out, fail_rows=fail_rows, **extra))
+        self.rows_in += rows_in
+        self.rows_out += rows_out
+        self.fail_rows += fail_rows
+
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "fail_rows": self.fail_rows,
+            # 단계가 끝난 시점까지의 프로세스 최대 RSS (이 단계만의 사용량이 아님)
+            "process_peak_rss": self.process_peak_rss
+        }
+        if self.meta:
+            data["meta"] = self.meta
+        if self.files:
+            data["files"] = self.files
+        if self.http:
+            data["http"] = {host: stats.to_dict() for host, stats in self.http.items()}
+        if self.profile:
+            data["profile"] = self.profile
+        if self.error:
+            data["error"] = self.error
+        return data
+
+# 실행 한 번의 보고서: 단계 목록 + 전체 HTTP 통계
+class RunReport:
+    def __init__(self, name, profile=None, profiler=None, profile_dir=PROFILE_DIR):
+        self.name = name
+        self.started = datetime.now()
+        self.wall_started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self.stages = []
+        self.http = {}
+        self.lock = threading.Lock()
+        # 진행 중인 단계 스택, contextvars라서 asyncio 작업과 asyncio.to_thread, bind()로 감싼 함수에 이어진다
+        self.stack = contextvars.ContextVar(f"instrument.stack.{id(self)}", default=())
+        profile = profile if profile is not None else os.environ.get(PROFILE_ENV, "")
+        self.profile_patterns = [p.strip() for p in profile.split(",") if p.strip()] if isinstance(profile, str) else list(profile)
+        self.profiler = profiler or os.environ.get(PROFILER_ENV, "cprofile")
+        self.profile_dir = profile_dir
+
+    # 현재 컨텍스트에서 진행 중인 단계 (없으면 None)
+    def current_stage(self):
+        stack = self.stack.get()
+        return stack[-1] if stack else None
+
+    def should_profile(self, name):
+        for pattern in self.profile_patterns:
+            if pattern == "*" or pattern == name or (pattern.endswith("*") and name.startswith(pattern[:-1])):
+                return True
+        return False
+
+    @contextmanager
+    def stage(self, name, **meta):
+        current = Stage(name, **meta)
+        with self.lock:
+            self.stages.append(current)
+        previous = self.stack.get()
+        self.stack.set(previous + (current,))
+        profiler = self.start_profiler(name)
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield current
+        except BaseException as e:
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.wall_s = time.perf_counter() - wall_started
+            current.cpu_s = time.process_time() - cpu_started  # 프로세스 전체 CPU (다른 스레드 포함)
+            current.process_peak_rss = peak_rss()
+            current.profile = self.stop_profiler(name, profiler)
+            self.stack.set(previous)
+
+    # cProfile은 이 단계를 연 스레드만, pyinstrument는 호출 스택 샘플링으로 측정한다
+    def start_profiler(self, name):
+        if not self.should_profile(name):
+            return None
+        if self.profiler == "pyinstrument" and pyinstrument is not None:
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            return profiler
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # 다른 단계가 이미 프로파일 중 (Python 3.12+는 하나만 허용)
+            return None
+        return profiler
+
+    def stop_profiler(self, name, profiler):
+        if profiler is None:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            path = os.path.join(self.profile_dir, f"{self.name}.{safe_name}.prof")
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = os.path.join(self.profile_dir, f"{self.name}.{safe_name}.html")
+            with open(path, mode="w", encoding="utf-8") as file:
+                file.write(profiler.output_html())
+        return path
+
+    # 요청 한 건 기록 (status가 None이면 연결 오류/타임아웃)
+    def record_http(self, url, status, elapsed):
+        host = urlsplit(url).netloc or url
+        current = self.current_stage()
+        with self.lock:
+            self.http.setdefault(host, HttpStats()).add(status, elapsed)
+            if current is not None:
+                current.http.setdefault(host, HttpStats()).add(status, elapsed)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "argv": sys.argv,
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_s": time.perf_counter() - self.wall_started,
+            "cpu_s": time.process_time() - self.cpu_started,
+            "peak_rss": peak_rss(),
+            "stages": [stage.to_dict() for stage in self.stages],
+            "http": {host: stats.to_dict() for host, stats in self.http.items()}
+        }
+
+    def save(self, file_path):
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path, mode="w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+        return file_path
+
+# 프로세스 전체에서 공유하는 보고서 (모듈 단독 실행 시 자동 생성)
+# PIPELINE_REPORT가 지정되어 있으면 프로세스 종료 시 저장한다
+_report = None
+_report_lock = threading.Lock()
+
+def get_report():
+    global _report
+    if _report is None:
+        with _report_lock:
+            if _report is None:
+                _report = RunReport(os.path.splitext(os.path.basename(sys.argv[0] or "run"))[0] or "run")
+                if os.environ.get(REPORT_ENV):
+                    atexit.register(_report.save, os.environ[REPORT_ENV])
+    return _report
+
+# 실행 단위: 새 보고서를 만들고, 끝나면 report_file(또는 PIPELINE_REPORT)에 저장
+@contextmanager
+def run(name, report_file=None, profile=None, profiler=None):
+    global _report
+    report = RunReport(name, profile, profiler)
+    previous, _report = _report, report
+    try:
+        yield report
+    finally:
+        _report = previous
+        report_file = report_file or os.environ.get(REPORT_ENV)
+        if report_file:
+            print(f"Run report saved to {report.save(report_file)}")
+
+# 모듈에서 사용하는 단축 함수
+def stage(name, **meta):
+    return get_report().stage(name, **meta)
+
+def current_stage():
+    return get_report().current_stage()
+
+# 현재 단계를 이어받아 실행하도록 함수를 감싼다 (ThreadPoolExecutor.submit/map은 컨텍스트를 넘기지 않는다)
+# 호출마다 컨텍스트를 복사하므로 여러 스레드에서 동시에 불러도 된다
+def bind(fn):
+    context = contextvars.copy_context()
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+def record_http(url, status, elapsed):
+    get_report().record_http(url, status, elapsed)
+
+# 현재 단계가 있으면 입력 행 수를 늘린다 (store_reader처럼 단계 안쪽에서 행을 읽는 코드용)
+def count_rows_in(count):
+    current = current_stage()
+    if current is not None:
+        current.rows_in += count
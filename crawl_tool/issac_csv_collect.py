@@ -1,38 +1,40 @@
 import os
+import argparse
 import pandas as pd
 import glob
 from concurrent.futures import ThreadPoolExecutor
+from store_reader import filter_contains, chunksize_for_memory, parse_memory
+import instrument
 
 # 추출할 컬럼 리스트
 COLUMNS_TO_KEEP = ['상호명', '도로명주소', '시도명', '시군구명', '행정동명']
+PATTERN = '이삭토스트'
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)  # ThreadPoolExecutor 기본값과 동일
 
 # 필터링 조건에 맞는 데이터를 처리하는 함수
-def process_csv(file_path):
-    try:
-        print(f"Processing file: {file_path}")  # 현재 처리 중인 파일 이름 출력
-        # CSV 읽기 (low_memory=False로 경고 방지)
-        df = pd.read_csv(file_path, encoding='utf-8', low_memory=False)
-
-        # 필요한 컬럼만 추출
-        df = df[COLUMNS_TO_KEEP]
-
-        # 조건에 맞는 데이터 필터링
-        filtered_df = df[df['상호명'].str.contains('이삭토스트', na=False)]
-
-        return filtered_df
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return pd.DataFrame(columns=COLUMNS_TO_KEEP)
+def process_csv(file_path, max_memory=None, workers=1):
+    with instrument.stage(f"issac_csv_collect:{os.path.basename(file_path)}") as stage:
+        try:
+            print(f"Processing file: {file_path}")  # 현재 처리 중인 파일 이름 출력
+            # 필요한 컬럼만 chunk 단위로 읽으면서 조건에 맞는 행만 남김
+            chunksize = chunksize_for_memory(file_path, max_memory, workers)
+            result = filter_contains(file_path, PATTERN, columns=COLUMNS_TO_KEEP, chunksize=chunksize)
+        except Exception as e:
+            print(f"Error processing {file_path}: {e}")
+            stage.error = str(e)
+            result = pd.DataFrame(columns=COLUMNS_TO_KEEP)
+        stage.rows_out = len(result)
+        return result
 
 # 폴더 내 모든 CSV 파일 처리
-def process_all_csv(folder_path, output_file):
+def process_all_csv(folder_path, output_file, max_memory=None, max_workers=MAX_WORKERS):
     # 폴더 내 모든 CSV 파일 찾기
     csv_files = glob.glob(os.path.join(folder_path, r"*.csv"))
 
-    # 스레드 풀 생성
-    with ThreadPoolExecutor() as executor:
+    # 스레드 풀 생성 (메모리 한도는 스레드 수만큼 나눠서 사용)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # 모든 CSV 파일을 병렬로 처리
-        results = list(executor.map(process_csv, csv_files))
+        results = list(executor.map(lambda path: process_csv(path, max_memory, max_workers), csv_files))
 
     # 결과 병합
     final_df = pd.concat(results, ignore_index=True)
@@ -41,9 +43,17 @@ def process_all_csv(folder_path, output_file):
     final_df.to_csv(output_file, index=False, encoding='utf-8-sig')
     print(f"Filtered data saved to {output_file}")
 
+def main():
+    parser = argparse.ArgumentParser(description="상가정보에서 이삭토스트 매장을 추출합니다.")
+    parser.add_argument("--folder", default=r".\소상공인시장진흥공단_상가(상권)정보_20240930",
+                        help="CSV 파일이 있는 폴더 경로")
+    parser.add_argument("--output", default="issac.csv", help="결과를 저장할 파일 경로")
+    parser.add_argument("--max-memory", default=None, help="전체 메모리 한도 (예: 512M, 2G)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
 
+    max_memory = parse_memory(args.max_memory) if args.max_memory else None
+    process_all_csv(args.folder, args.output, max_memory, args.workers)
 
-# 사용 예시
-folder_path = r".\소상공인시장진흥공단_상가(상권)정보_20240930"  # CSV 파일이 있는 폴더 경로
-output_file = "issac.csv"  # 결과를 저장할 파일 경로
-process_all_csv(folder_path, output_file)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import pandas as pd
+
+# 키 정규화 방식: 문자열로 바꾼 뒤 공백 제거 ("수원시 장안구" == "수원시장안구")
+def normalize_key(value):
+    return str(value).replace(" ", "")
+
+# DataFrame의 여러 열을 한 번에 정규화하여 튜플 키 Series로 반환
+def normalize_key_columns(df, columns):
+    normalized = [df[col].astype(str).str.replace(" ", "", regex=False) for col in columns]
+    if len(normalized) == 1:
+        return normalized[0]
+    return pd.Series(list(zip(*normalized)), index=df.index)
+
+# 조인 결과 리포트 (매칭 실패 키, 중복 키)
+class JoinReport:
+    def __init__(self, matched, unmatched, ambiguous):
+        self.matched = matched        # 매칭된 A 파일 행 수
+        self.unmatched = unmatched    # 매칭되지 않은 A 파일의 키 목록
+        self.ambiguous = ambiguous    # B 파일에서 같은 키가 여러 번 나온 경우 {키: [값, ...]}
+
+    def summary(self):
+        lines = [f"Matched rows: {self.matched}",
+                 f"Unmatched keys: {len(self.unmatched)}",
+                 f"Ambiguous keys: {len(self.ambiguous)}"]
+        for key in self.unmatched:
+            lines.append(f"  unmatched: {key}")
+        for key, values in self.ambiguous.items():
+            lines.append(f"  ambiguous: {key} -> {values}")
+        return "\n".join(lines)
+
+# B 파일로부터 {정규화된 키: 값} 인덱스 생성
+# 같은 키가 여러 번 나오면 기존 이중 루프와 동일하게 마지막 값을 사용한다
+def build_index(df, key_columns, value_column):
+    keys = normalize_key_columns(df, key_columns)
+    values = df[value_column].astype(str)
+
+    index = {}
+    seen = {}
+    for key, value in zip(keys, values):
+        index[key] = value
+        seen.setdefault(key, []).append(value)
+
+    ambiguous = {key: vals for key, vals in seen.items() if len(vals) > 1}
+    return index, ambiguous
+
+# A 파일의 target_column을 B 파일의 source_column 값으로 채운다
+# 매칭되지 않는 행은 기존 값을 그대로 유지한다
+def join_column(df_a, df_b, keys_a, keys_b, source_column, target_column):
+    index, ambiguous = build_index(df_b, keys_b, source_column)
+    normalized_a = normalize_key_columns(df_a, keys_a)
+    mapped = normalized_a.map(index)
+    matched_mask = mapped.notna()
+
+    result = df_a.copy()
+    if target_column in result.columns:
+        current = result[target_column]
+        if matched_mask.any():
+            current = current.astype(object)
+        result[target_column] = current.where(~matched_mask, mapped)
+    else:
+        result[target_column] = mapped
+
+    unmatched = list(dict.fromkeys(normalized_a[~matched_mask]))
+    report = JoinReport(int(matched_mask.sum()), unmatched, ambiguous)
+    return result, report
@@ -2,61 +2,287 @@ from selenium import webdriver
 from selenium.webdriver.edge.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.edge.options import Options
-import time
+from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, parse_qsl
+import argparse
+import json
+import re
 import os
 import csv
+import time
+from crawler_core import default_client
+import instrument
 
 # 상수 정의
-WEBDRIVER_PATH = os.path.join("C:\\", "msedgedriver.exe")
+WEBDRIVER_PATH = os.environ.get("MSEDGEDRIVER", os.path.join("C:\\", "msedgedriver.exe"))
 OUTPUT_FILE = "kfc_stores.csv"
 URL = "https://www.kfckorea.com/store/findStore"
+WAIT_TIMEOUT = 10  # 페이지 요소가 나타날 때까지 기다리는 최대 시간(초)
+STORE_WAIT_TIMEOUT = 3  # 매장 목록이 바뀌기를 기다리는 최대 시간(초), 매장이 없는 동네 대비
+STORE_SETTLE_TIME = 1  # 빈 목록은 이 시간(초) 동안 그대로일 때만 매장이 없는 것으로 본다 (목록을 비운 뒤 다시 채우는 중일 수 있음)
+
+REGION_SELECT = ".select-region select"
+TOWN_SELECT = ".select-region select.town"
+
+# 매장 목록을 한 번의 스크립트 실행으로 읽는다 (WebElement 왕복 최소화)
+READ_STORES_SCRIPT = """
+return Array.from(document.querySelectorAll('.store-item')).map(function (item) {
+    var name = item.querySelector('.top a');
+    var num = item.querySelector('li.num');
+    var addr = num ? num.previousElementSibling : null;
+    return [name ? name.innerText.trim() : '', addr ? addr.innerText.trim() : ''];
+});
+"""
+
+# XHR 응답(JSON)에서 매장명/주소를 찾을 때 사용하는 키 후보
+XHR_NAME_KEYS = ("storeName", "storeNm", "storNm", "name")
+XHR_ADDR_KEYS = ("storeAddr", "addr", "address", "storAddr", "adres")
+STORE_ITEM_PATTERN = re.compile(
+    r'class="store-item".*?class="top".*?<a[^>]*>(.*?)</a>.*?<li[^>]*>([^<]*)</li>\s*<li class="num"',
+    re.DOTALL
+)
 
 # WebDriver 옵션 설정
-def setup_webdriver():
+def setup_webdriver(driver_path=WEBDRIVER_PATH, headless=False, capture_network=False):
     options = Options()
-    # options.add_argument("--headless")
+    if headless:
+        options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("window-size=1920x1080")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36")
-    service = Service(WEBDRIVER_PATH)
+    if capture_network:
+        # 페이지가 보내는 XHR을 확인하기 위해 네트워크 로그 수집
+        options.set_capability("ms:loggingPrefs", {"performance": "ALL"})
+    # driver_path가 비어 있으면 Selenium Manager가 드라이버를 찾는다
+    service = Service(driver_path) if driver_path else Service()
     return webdriver.Edge(service=service, options=options)
 
 def navigate_to_region_search_tab(driver):
     driver.get(URL)
-    time.sleep(2)
-    tab_region_search = driver.find_element(By.XPATH, "//ul[@class='tab']/li/a[text()='지역검색']")
+    wait = WebDriverWait(driver, WAIT_TIMEOUT)
+    tab_region_search = wait.until(EC.element_to_be_clickable(
+        (By.XPATH, "//ul[@class='tab']/li/a[text()='지역검색']")))
     tab_region_search.click()
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, REGION_SELECT)))
+
+# <select>의 (value, text) 목록 (빈 값 제외)
+def read_options(driver, selector):
+    select_box = driver.find_element(By.CSS_SELECTOR, selector)
+    return [(option.get_attribute("value"), option.text)
+            for option in select_box.find_elements(By.TAG_NAME, "option")
+            if option.get_attribute("value")]
 
-def extract_store_data(driver):
+def read_stores(driver):
+    return [tuple(store) for store in driver.execute_script(READ_STORES_SCRIPT)]
+
+# 지역 선택 후 동네 목록이 새로 채워질 때까지 대기
+def select_region(driver, region_value):
+    region_select = Select(driver.find_element(By.CSS_SELECTOR, REGION_SELECT))
+    if region_select.first_selected_option.get_attribute("value") == region_value:
+        return read_options(driver, TOWN_SELECT)
+    town_select = driver.find_element(By.CSS_SELECTOR, TOWN_SELECT)
+    previous = town_select.get_attribute("innerHTML")
+    region_select.select_by_value(region_value)
+    try:
+        WebDriverWait(driver, WAIT_TIMEOUT).until(
+            lambda d: d.find_element(By.CSS_SELECTOR, TOWN_SELECT).get_attribute("innerHTML") != previous)
+    except TimeoutException:
+        pass  # 이전 지역과 동네 목록이 같은 경우
+    return read_options(driver, TOWN_SELECT)
+
+# WebDriverWait 조건: 이전과 다른 매장 목록이 나타나거나, 빈 목록이 STORE_SETTLE_TIME 동안 유지되면 끝
+class StoreListSettled:
+    def __init__(self, previous_stores, settle_time=STORE_SETTLE_TIME):
+        self.previous_stores = previous_stores
+        self.settle_time = settle_time
+        self.stores = None
+        self.empty_since = None
+
+    def __call__(self, driver):
+        stores = read_stores(driver)
+        if stores and stores != self.previous_stores:
+            self.stores = stores
+            return True
+        if stores:  # 아직 이전 동네의 목록
+            self.empty_since = None
+            return False
+        now = time.monotonic()
+        if self.empty_since is None:
+            self.empty_since = now
+        if now - self.empty_since >= self.settle_time:
+            self.stores = stores
+            return True
+        return False
+
+# 동네 선택 후 .store-item 목록이 새 동네의 목록으로 바뀔 때까지 대기
+def select_town(driver, town_value, previous_stores):
+    Select(driver.find_element(By.CSS_SELECTOR, TOWN_SELECT)).select_by_value(town_value)
+    condition = StoreListSettled(previous_stores)
+    try:
+        WebDriverWait(driver, STORE_WAIT_TIMEOUT, poll_frequency=0.1).until(condition)
+    except TimeoutException:
+        pass  # 목록이 그대로인 경우 (이전 동네와 매장이 같음)
+    return condition.stores if condition.stores is not None else read_stores(driver)
+
+# regions [(value, text)] 에 해당하는 매장 정보 수집
+def extract_store_data(driver, regions=None):
     store_data = []
-    select_box = driver.find_element(By.CSS_SELECTOR, ".select-region select")
-    options = select_box.find_elements(By.TAG_NAME, "option")
-    region_options = [option for option in options if option.get_attribute("value")]
-
-    for region_option in region_options:
-        region_option.click()
-        time.sleep(0.2)
-        town_select_box = driver.find_element(By.CSS_SELECTOR, ".select-region select.town")
-        town_options = town_select_box.find_elements(By.TAG_NAME, "option")
-        town_list = [town_option for town_option in town_options if town_option.get_attribute("value")]
-
-        for town_option in town_list:
-            town_option.click()
-            time.sleep(0.2)
-            store_items = driver.find_elements(By.CSS_SELECTOR, ".store-item")
-
-            for store_item in store_items:
-                store_name = store_item.find_element(By.CSS_SELECTOR, ".top a").text
-                store_address = store_item.find_element(By.CSS_SELECTOR, "li.num").find_element(By.XPATH, "preceding-sibling::li[1]").text
-                store_data.append((store_name, store_address, region_option.text, town_option.text))
-
-        select_box = driver.find_element(By.CSS_SELECTOR, ".select-region select")
-        options = select_box.find_elements(By.TAG_NAME, "option")
-        region_options = [option for option in options if option.get_attribute("value")]
+    if regions is None:
+        regions = read_options(driver, REGION_SELECT)
+
+    stores = read_stores(driver)
+    for region_value, region_text in regions:
+        for town_value, town_text in select_region(driver, region_value):
+            stores = select_town(driver, town_value, stores)
+            for store_name, store_address in stores:
+                store_data.append((store_name, store_address, region_text, town_text))
 
     return store_data
 
+# 지역을 workers개로 나누어 브라우저 여러 개에서 동시에 수집
+def extract_store_data_parallel(workers, driver_path=WEBDRIVER_PATH, headless=True):
+    driver = setup_webdriver(driver_path, headless)
+    try:
+        navigate_to_region_search_tab(driver)
+        regions = read_options(driver, REGION_SELECT)
+    finally:
+        driver.quit()
+
+    shards = [regions[i::workers] for i in range(workers)]
+
+    def run_shard(shard):
+        worker_driver = setup_webdriver(driver_path, headless)
+        try:
+            navigate_to_region_search_tab(worker_driver)
+            return extract_store_data(worker_driver, shard)
+        finally:
+            worker_driver.quit()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_shard, shards))
+
+    # 원래 지역 순서대로 정렬
+    order = {text: index for index, (_, text) in enumerate(regions)}
+    store_data = [row for result in results for row in result]
+    store_data.sort(key=lambda row: order.get(row[2], len(order)))
+    return store_data
+
+# 네트워크 로그에서 XHR 요청 목록 추출
+def read_xhr_requests(driver):
+    requests_seen = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message.get("method") != "Network.requestWillBeSent":
+            continue
+        params = message["params"]
+        if params.get("type") != "XHR":
+            continue
+        request = params["request"]
+        requests_seen.append({
+            "url": request["url"],
+            "method": request["method"],
+            "headers": request.get("headers", {}),
+            "postData": request.get("postData", "")
+        })
+    return requests_seen
+
+# XHR 파라미터와 본문 형식: JSON 객체 본문이면 "json", 폼/쿼리 문자열이면 "form"
+def parse_request_params(request):
+    post_data = request["postData"]
+    if post_data:
+        try:
+            data = json.loads(post_data)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict):
+            return data, "json"
+    return dict(parse_qsl(post_data or request["url"].partition("?")[2])), "form"
+
+# JSON 본문에 숫자로 들어 있던 값은 <option> 값(문자열)을 숫자로 바꿔서 넣는다
+def same_type(template_value, value):
+    return int(value) if isinstance(template_value, int) and value.isdigit() else value
+
+# 동네 하나를 선택했을 때 나가는 XHR을 찾아 요청 템플릿으로 저장
+# 동네 값이 들어간 파라미터 이름을 기억해 두었다가 다른 동네 값으로 바꿔서 재사용한다
+def capture_store_request(driver, region_value, town_value):
+    driver.get_log("performance")  # 이전 로그 비우기
+    towns = select_region(driver, region_value)
+    town_value = town_value or towns[0][0]
+    select_town(driver, town_value, read_stores(driver))
+
+    for request in reversed(read_xhr_requests(driver)):
+        params, body_format = parse_request_params(request)
+        town_keys = [key for key, value in params.items() if str(value) == town_value]
+        region_keys = [key for key, value in params.items() if str(value) == region_value]
+        if town_keys:
+            return dict(request, params=params, body_format=body_format, town_key=town_keys[0],
+                        region_key=region_keys[0] if region_keys else None)
+    raise Exception("Failed to find the store list XHR")
+
+# 캡처한 요청 템플릿으로 동네 매장 목록을 직접 요청
+def fetch_town_via_xhr(template, region_value, town_value, client=None):
+    client = client or default_client()
+    params = dict(template["params"])
+    params[template["town_key"]] = same_type(params[template["town_key"]], town_value)
+    if template["region_key"]:
+        params[template["region_key"]] = same_type(params[template["region_key"]], region_value)
+    headers = {key: value for key, value in template["headers"].items() if not key.startswith(":")}
+    if template["method"] == "POST" and template["body_format"] == "json":
+        response = client.post(template["url"], data=json.dumps(params, ensure_ascii=False).encode("utf-8"),
+                               headers=headers)
+    elif template["method"] == "POST":
+        response = client.post(template["url"], data=urlencode(params), headers=headers)
+    else:
+        response = client.get(template["url"].partition("?")[0], params=params, headers=headers)
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch town {town_value}: {response.status_code}")
+    return parse_xhr_response(response.text)
+
+# XHR 응답이 JSON이면 매장 dict를, HTML 조각이면 .store-item을 찾는다
+def parse_xhr_response(text):
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [(re.sub(r"\s+", " ", name).strip(), addr.strip()) for name, addr in STORE_ITEM_PATTERN.findall(text)]
+
+    stores = []
+    pending = [data]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, list):
+            pending.extend(reversed(item))
+        elif isinstance(item, dict):
+            name = next((item[key] for key in XHR_NAME_KEYS if item.get(key)), None)
+            addr = next((item[key] for key in XHR_ADDR_KEYS if item.get(key)), None)
+            if name and addr:
+                stores.append((name, addr))
+            else:
+                pending.extend(reversed(list(item.values())))
+    return stores
+
+# 네트워크 모드: 동네 목록만 브라우저에서 읽고, 매장 목록은 XHR을 직접 동시에 요청
+def extract_store_data_network(driver, workers=8):
+    regions = read_options(driver, REGION_SELECT)
+    template = capture_store_request(driver, regions[0][0], None)
+
+    jobs = []
+    for region_value, region_text in regions:
+        for town_value, town_text in select_region(driver, region_value):
+            jobs.append((region_value, region_text, town_value, town_text))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(instrument.bind(lambda job: fetch_town_via_xhr(template, job[0], job[2])), jobs))
+
+    store_data = []
+    for (_, region_text, _, town_text), stores in zip(jobs, results):
+        for store_name, store_address in stores:
+            store_data.append((store_name, store_address, region_text, town_text))
+    return store_data
+
 def save_to_csv(store_data):
     with open(OUTPUT_FILE, mode="w", encoding="utf-8-sig", newline="") as file:
         writer = csv.writer(file)
@@ -64,14 +290,30 @@ def save_to_csv(store_data):
         writer.writerows(store_data)
 
 def main():
-    driver = setup_webdriver()
-    try:
-        navigate_to_region_search_tab(driver)
-        store_data = extract_store_data(driver)
-        save_to_csv(store_data)
-        print(f"Data saved to {OUTPUT_FILE}")
-    finally:
-        driver.quit()
+    parser = argparse.ArgumentParser(description="KFC 매장 목록 수집")
+    parser.add_argument("--driver-path", default=WEBDRIVER_PATH,
+                        help="msedgedriver 경로 (빈 문자열이면 Selenium Manager 사용)")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--workers", type=int, default=1, help="동시에 띄울 브라우저 수")
+    parser.add_argument("--mode", choices=["dom", "network"], default="dom",
+                        help="dom: 화면에서 매장 목록 읽기, network: 캡처한 XHR을 직접 요청")
+    args = parser.parse_args()
+
+    if args.mode == "dom" and args.workers > 1:
+        store_data = extract_store_data_parallel(args.workers, args.driver_path, args.headless)
+    else:
+        driver = setup_webdriver(args.driver_path, args.headless, capture_network=args.mode == "network")
+        try:
+            navigate_to_region_search_tab(driver)
+            if args.mode == "network":
+                store_data = extract_store_data_network(driver, max(args.workers, 1))
+            else:
+                store_data = extract_store_data(driver)
+        finally:
+            driver.quit()
+
+    save_to_csv(store_data)
+    print(f"Data saved to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import quote, urlsplit
+from instrument import percentile
+
+# serve_api.py에 keep-alive 연결 여러 개로 요청을 보내 처리량과 지연 시간을 잰다
+# 예) python load_test.py --spawn --connections 50 --duration 20
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+ACCEPT_ENCODING = "br, gzip"
+REVALIDATE_RATE = 0.5  # 이미 받은 URL을 다시 요청할 때 If-None-Match를 붙이는 비율 (브라우저 캐시 흉내)
+
+class Connection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, path, etag=None, accept_encoding=ACCEPT_ENCODING):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Accept-Encoding: {accept_encoding}"]
+        if etag:
+            lines.append(f"If-None-Match: {etag}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        body = await self.reader.readexactly(int(headers.get("content-length") or 0))
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, headers, body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+# 요청할 URL 목록: 월 목록, 최신 월 집계, 구 단위 매장 조각 (실제 화면처럼 조각 요청이 가장 많다)
+async def discover_paths(host, port):
+    connection = Connection(host, port)
+    try:
+        _, _, body = await connection.request("/api/months")
+        month = json.loads(body)["latest"]
+        if month is None:
+            raise Exception("No months with aggregates (run build_aggregates.py first)")
+        # 매장 조각 목록을 읽어야 하므로 압축 없이 받는다
+        status, _, body = await connection.request(f"/api/{month}/regions", accept_encoding="identity")
+        if status != 200:
+            raise Exception(f"/api/{month}/regions returned {status}")
+        # sig_cd가 없는 구도 "시도_시군구" 조각으로 요청한다
+        shards = sorted({shard for region in json.loads(body)["views"]["district"] for shard in region["shards"]})
+    finally:
+        connection.close()
+    return month, shards
+
+def make_mix(month, shards):
+    return ([(f"/api/{month}/stores/{quote(shard)}", 8) for shard in shards]
+            + [(f"/api/{month}/regions", 2 * len(shards) // 10 or 1), ("/api/months", len(shards) // 10 or 1),
+               ("/api/notice", len(shards) // 10 or 1)])
+
+class Result:
+    def __init__(self):
+        self.latencies = []
+        self.status = {}
+        self.bytes = 0
+        self.errors = 0
+
+async def worker(host, port, mix, deadline, limit, result, seed):
+    rng = random.Random(seed)
+    paths = [path for path, _ in mix]
+    weights = [weight for _, weight in mix]
+    etags = {}
+    connection = Connection(host, port)
+    try:
+        while time.perf_counter() < deadline and (limit is None or limit[0] > 0):
+            if limit is not None:
+                limit[0] -= 1
+            path = rng.choices(paths, weights)[0]
+            etag = etags.get(path) if rng.random() < REVALIDATE_RATE else None
+            started = time.perf_counter()
+            try:
+                status, headers, body = await connection.request(path, etag)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                result.errors += 1
+                connection.close()
+                continue
+            result.latencies.append(time.perf_counter() - started)
+            result.status[status] = result.status.get(status, 0) + 1
+            result.bytes += len(body)
+            if headers.get("etag"):
+                etags[path] = headers["etag"]
+    finally:
+        connection.close()
+
+async def run_load(host, port, connections, duration, requests=None, seed=0):
+    month, shards = await discover_paths(host, port)
+    mix = make_mix(month, shards)
+    result = Result()
+    limit = [requests] if requests else None
+    started = time.perf_counter()
+    deadline = started + (duration if not requests else float("inf"))
+    await asyncio.gather(*(worker(host, port, mix, deadline, limit, result, seed + i) for i in range(connections)))
+    elapsed = time.perf_counter() - started
+    return month, len(mix), elapsed, result
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise Exception(f"Server did not start on {host}:{port}")
+
+def main():
+    parser = argparse.ArgumentParser(description="serve_api.py 부하 테스트 (localhost)")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--connections", type=int, default=20, help="동시 keep-alive 연결 수")
+    parser.add_argument("--duration", type=float, default=10, help="측정 시간 (초)")
+    parser.add_argument("--requests", type=int, default=None, help="지정하면 시간 대신 요청 수만큼 보냄")
+    parser.add_argument("--spawn", action="store_true", help="serve_api.py를 직접 띄워서 측정")
+    parser.add_argument("--output", default=None, help="결과 JSON")
+    args = parser.parse_args()
+
+    address = urlsplit(args.url)
+    host, port = address.hostname, address.port or 80
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, os.path.join(TOOL_DIR, "serve_api.py"),
+                                   "--host", host, "--port", str(port)])
+    try:
+        if server is not None:
+            wait_for_port(host, port)
+        month, url_count, elapsed, result = asyncio.run(
+            run_load(host, port, args.connections, args.duration, args.requests))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    count = len(result.latencies)
+    summary = {
+        "url": args.url,
+        "month": month,
+        "urls": url_count,
+        "connections": args.connections,
+        "elapsed_s": elapsed,
+        "requests": count,
+        "errors": result.errors,
+        "requests_per_s": count / elapsed if elapsed else None,
+        "status": {str(status): total for status, total in sorted(result.status.items())},
+        "bytes": result.bytes,
+        "latency_p50_ms": (percentile(result.latencies, 0.5) or 0) * 1000,
+        "latency_p95_ms": (percentile(result.latencies, 0.95) or 0) * 1000,
+        "latency_p99_ms": (percentile(result.latencies, 0.99) or 0) * 1000,
+        "latency_max_ms": max(result.latencies, default=0) * 1000
+    }
+    print(f"{count} requests in {elapsed:.1f}s ({summary['requests_per_s']:.0f} req/s), "
+          f"{result.errors} errors, status {summary['status']}, {result.bytes / 1024 ** 2:.1f} MB")
+    print(f"latency p50 {summary['latency_p50_ms']:.2f} ms, p95 {summary['latency_p95_ms']:.2f} ms, "
+          f"p99 {summary['latency_p99_ms']:.2f} ms, max {summary['latency_max_ms']:.2f} ms")
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
-import requests
 import json
 import html
 import csv
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from crawler_core import StoreRecord, default_client
+import instrument
 
 # 상수 정의
 URL = "https://www.lotteeatz.com/searchStore/getStoresListAjax"
 CSV_FILE = "lotteria_stores.csv"
+BRAND = "lotteria"
 HEADERS = {
     "Content-Type": "application/json",
     "Accept": "text/html, */*; q=0.01",
@@ -34,23 +38,141 @@ PAYLOAD = {
     "limit": 2000
 }
 
-def fetch_store_data():
-    response = requests.post(URL, json=PAYLOAD, headers=HEADERS)
+# 페이지 모드 설정
+PAGE_SIZE = 200
+CONCURRENCY = 1  # 한 번에 요청할 페이지 수
+MAX_PAGES = 200  # 종료 조건이 깨졌을 때를 위한 안전장치
+
+# 응답 HTML 안의 <input type="hidden" name="storeList_JSON" value="...">
+STORE_JSON_MARKER = '<input type="hidden" name="storeList_JSON" value="'
+DECODE_CHUNK = 64 * 1024  # 한 번에 unescape 할 글자 수
+ENTITY_MAX = 10  # "&#x0000d;" 같은 HTML 엔티티의 최대 길이
+
+def fetch_store_data(client=None, page=1, limit=None):
+    client = client or default_client()
+    payload = dict(PAYLOAD, page=page, limit=limit or PAYLOAD["limit"])
+    response = client.post(URL, json=payload, headers=HEADERS)
     if response.status_code != 200:
-        raise Exception(f"Failed to fetch data: {response.status_code}")
+        raise Exception(f"Failed to fetch data (page {page}): {response.status_code}")
     return response.text
 
+# storeList_JSON 값의 (시작, 끝) 위치, 문서를 자르거나 복사하지 않는다
+def find_store_json(response_text):
+    start = response_text.find(STORE_JSON_MARKER)
+    if start < 0:
+        raise Exception("Failed to find storeList_JSON")
+    start += len(STORE_JSON_MARKER)
+    end = response_text.find('"', start)  # 값 안의 따옴표는 &quot; 로 들어 있다
+    if end < 0:
+        raise Exception("storeList_JSON value is not terminated")
+    return start, end
+
+# 값 영역을 DECODE_CHUNK 글자씩 unescape 해서 돌려준다 (엔티티가 조각 경계에서 잘리지 않게 조정)
+def iter_unescaped(response_text, start, end):
+    position = start
+    while position < end:
+        stop = min(position + DECODE_CHUNK, end)
+        if stop < end:
+            amp = response_text.rfind("&", max(position, stop - ENTITY_MAX), stop)
+            if amp > position and response_text.find(";", amp, stop) < 0:
+                stop = amp
+        yield html.unescape(response_text[position:stop])
+        position = stop
+
+# JSON 배열의 원소를 하나씩 raw_decode 해서 돌려준다
+# 버퍼에는 아직 해석하지 못한 레코드 하나와 다음 조각만 남는다
+def iter_store_info(response_text):
+    start, end = find_store_json(response_text)
+    decoder = json.JSONDecoder()
+    chunks = iter_unescaped(response_text, start, end)
+    buffer = ""
+    position = 0
+    started = False
+    exhausted = False
+
+    while True:
+        # 공백, 배열 시작/구분 기호 건너뛰기
+        while position < len(buffer) and buffer[position] in " \t\r\n,[":
+            started = started or buffer[position] == "["
+            position += 1
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        if position < len(buffer):
+            if not started:
+                raise Exception("storeList_JSON is not a JSON array")
+            try:
+                store, position = decoder.raw_decode(buffer, position)
+                yield store
+                continue
+            except json.JSONDecodeError as e:
+                if exhausted:
+                    raise Exception("Failed to decode JSON") from e
+        # 레코드가 다음 조각까지 이어지는 경우: 처리한 앞부분을 버리고 조각을 더 읽는다
+        try:
+            buffer = buffer[position:] + next(chunks)
+            position = 0
+        except StopIteration:
+            if exhausted or position >= len(buffer):
+                raise Exception("storeList_JSON ended before the closing bracket")
+            exhausted = True
+
 def extract_store_info(response_text):
-    try:
-        hidden_input = response_text.split('<input type="hidden" name="storeList_JSON" value="')[1]
-        raw_json = hidden_input.split('" />')[0]
-        decoded_json = html.unescape(raw_json)
-        return json.loads(decoded_json)
-    except (IndexError, json.JSONDecodeError) as e:
-        raise Exception("Failed to extract or decode JSON") from e
-
-def save_to_csv(store_data):
-    with open(CSV_FILE, mode="w", encoding="utf-8-sig", newline="") as file:
+    return list(iter_store_info(response_text))
+
+def store_key(store):
+    return store.get("storecd") or json.dumps(store, sort_keys=True, ensure_ascii=False)
+
+# page를 1부터 늘려 가며 빈 페이지(또는 한 페이지 크기보다 적은 페이지)가 나올 때까지 요청
+# 한 페이지 크기는 요청한 limit이 아니라 1페이지에 실제로 온 매장 수 (서버가 limit을 줄여서 줄 수 있다)
+# concurrency > 1 이면 그만큼의 페이지를 동시에 요청한다
+# 서버가 page를 무시하고 이미 받은 매장만 다시 돌려주면 한 번에 받는 방식으로 나머지를 받는다
+def iter_stores_paged(client=None, limit=PAGE_SIZE, concurrency=CONCURRENCY):
+    client = client or default_client()
+    seen = set()
+    page_size = None
+    page = 1
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while page <= MAX_PAGES:
+            pages = range(page, min(page + concurrency, MAX_PAGES + 1))
+            for number, text in zip(pages, executor.map(
+                    instrument.bind(lambda n: fetch_store_data(client, n, limit)), pages)):
+                count = new = 0
+                for store in iter_store_info(text):
+                    count += 1
+                    key = store_key(store)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    new += 1
+                    yield store
+                if page_size is None:
+                    page_size = count
+                if count == 0 or count < page_size:
+                    return
+                if new == 0:
+                    print(f"Page {number} repeats earlier stores, fetching the full list in one request")
+                    for store in iter_stores_single(client):
+                        if store_key(store) not in seen:
+                            seen.add(store_key(store))
+                            yield store
+                    return
+            page += concurrency
+    raise Exception(f"Stopped after {MAX_PAGES} pages of {page_size} stores without reaching the end of the list")
+
+# 기존 방식: limit 2000으로 한 번에 요청
+def iter_stores_single(client=None):
+    yield from iter_store_info(fetch_store_data(client))
+
+# 공통 러너(crawl_all.py)에서 사용하는 플러그인 진입점
+def iter_records(client):
+    for store in iter_stores_paged(client):
+        point = (store.get("geo") or {}).get("point") or {}
+        yield StoreRecord(BRAND, store.get("storeNm") or "", (store.get("adres") or {}).get("adres") or "",
+                          store.get("storecd") or "", point.get("lat"), point.get("lng"))
+
+def save_to_csv(store_data, csv_file=CSV_FILE):
+    count = 0
+    with open(csv_file, mode="w", encoding="utf-8-sig", newline="") as file:
         writer = csv.writer(file)
         writer.writerow(["storeNm", "adres", "detailAdres", "storecd"])
         for store in store_data:
@@ -60,12 +182,24 @@ def save_to_csv(store_data):
                 store.get("adres", {}).get("detailAdres"),
                 store.get("storecd")
             ])
+            count += 1
+    return count
 
 def main():
-    response_text = fetch_store_data()
-    store_data = extract_store_info(response_text)
-    save_to_csv(store_data)
-    print(f"Data saved to {CSV_FILE}")
+    parser = argparse.ArgumentParser(description="롯데리아 매장 목록 수집")
+    parser.add_argument("--mode", choices=["paged", "single"], default="paged",
+                        help="paged: page를 끝까지 요청 (기본), single: limit 2000 한 번 요청")
+    parser.add_argument("--limit", type=int, default=PAGE_SIZE, help="페이지당 매장 수")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--output", default=CSV_FILE)
+    args = parser.parse_args()
+
+    if args.mode == "paged":
+        stores = iter_stores_paged(limit=args.limit, concurrency=args.concurrency)
+    else:
+        stores = iter_stores_single()
+    count = save_to_csv(stores, args.output)
+    print(f"{count} stores saved to {args.output}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,16 +1,52 @@
-from selenium import webdriver
-from selenium.webdriver.edge.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.edge.options import Options
-import time
+import re
 import csv
+import html
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from crawler_core import StoreRecord, default_client
+import instrument
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.edge.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.edge.options import Options
+except ImportError:  # http 백엔드만 사용할 때는 selenium이 없어도 된다
+    webdriver = None
 
 WEBDRIVER_PATH = "C:\\msedgedriver.exe"
 CSV_FILE = "mcdonalds_stores.csv"
 URL = "https://www.mcdonalds.co.kr/kor/store/list.do"
+BRAND = "mcdonalds"
+
+# 매장 목록 페이지의 javascript:page(n)이 제출하는 검색 폼과 같은 값
+PAGE_PARAM = "page"
+SEARCH_PARAMS = {
+    "lat": "",
+    "lng": "",
+    "search_key": "",
+    "search_word": ""
+}
+HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "Referer": URL
+}
+CONCURRENCY = 4  # 한 번에 요청할 페이지 수
+MAX_PAGES = 500  # 종료 조건이 깨졌을 때를 위한 안전장치
+
+# td.tdName 칸 하나씩 잘라서 그 안의 dl.name strong.tit a (매장명), dd.road (도로명 주소)를 찾는다
+# 도로명 주소가 없는 칸에서 다음 매장의 주소를 가져오지 않도록 칸 밖으로 넘어가지 않는다
+CELL_PATTERN = re.compile(r'<td class="tdName">(.*?)</td>', re.DOTALL)
+NAME_PATTERN = re.compile(r'<dl class="name">.*?<strong class="tit">\s*<a[^>]*>(.*?)</a>', re.DOTALL)
+ROAD_PATTERN = re.compile(r'<dd class="road">(.*?)</dd>', re.DOTALL)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+SPACE_PATTERN = re.compile(r"\s+")
 
 # WebDriver 설정
 def setup_webdriver():
+    if webdriver is None:
+        raise Exception("selenium is not installed; use --backend http")
     options = Options()
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
@@ -18,6 +54,44 @@ def setup_webdriver():
     service = Service(WEBDRIVER_PATH)
     return webdriver.Edge(service=service, options=options)
 
+# 태그 제거 + 공백 정리 (Selenium의 .text와 같은 결과)
+def clean_text(text):
+    return SPACE_PATTERN.sub(" ", html.unescape(TAG_PATTERN.sub("", text))).strip()
+
+# 도로명 주소가 없는 매장은 주소를 비워 둔다
+def extract_store_info(html_content):
+    store_info = []
+    for cell in CELL_PATTERN.findall(html_content):
+        name = NAME_PATTERN.search(cell)
+        if name is None:
+            continue
+        road = ROAD_PATTERN.search(cell)
+        store_info.append([clean_text(name.group(1)), clean_text(road.group(1)) if road else ""])
+    return store_info
+
+# 목록 페이지 하나를 직접 요청
+def fetch_page(page, client=None):
+    client = client or default_client()
+    data = dict(SEARCH_PARAMS, **{PAGE_PARAM: page})
+    response = client.post(URL, data=data, headers=HEADERS)
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch page {page}: {response.status_code}")
+    return extract_store_info(response.text)
+
+# 브라우저 없이 페이지를 CONCURRENCY개씩 동시에 요청하고, 첫 빈 페이지에서 멈춘다
+def fetch_store_data_http(client=None, concurrency=CONCURRENCY):
+    store_data = []
+    page = 1
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while page <= MAX_PAGES:
+            pages = range(page, min(page + concurrency, MAX_PAGES + 1))
+            for stores in executor.map(instrument.bind(lambda n: fetch_page(n, client)), pages):
+                if not stores:
+                    return store_data
+                store_data.extend(stores)
+            page += concurrency
+    return store_data
+
 def fetch_store_data(driver):
     store_data = []
     driver.get(URL)
@@ -48,7 +122,24 @@ def save_to_csv(store_info):
         for store in store_info:
             writer.writerow(store)
 
+# 공통 러너(crawl_all.py)에서 사용하는 플러그인 진입점
+def iter_records(client):
+    for name, road_address in fetch_store_data_http(client):
+        yield StoreRecord(BRAND, name, road_address)
+
 def main():
+    parser = argparse.ArgumentParser(description="맥도날드 매장 목록 수집")
+    parser.add_argument("--backend", choices=["http", "selenium"], default="http",
+                        help="http: 목록 페이지 직접 요청 (기본), selenium: 브라우저로 페이지 이동")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    args = parser.parse_args()
+
+    if args.backend == "http":
+        store_info = fetch_store_data_http(concurrency=args.concurrency)
+        save_to_csv(store_info)
+        print(f"Data saved to {CSV_FILE}")
+        return
+
     driver = setup_webdriver()
     try:
         store_info = fetch_store_data(driver)
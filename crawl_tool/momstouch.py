@@ -1,55 +1,100 @@
-import requests
 import re
 import csv
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from crawler_core import StoreRecord, default_client
+import instrument
 
 # 상수 정의
 URL = "https://momstouch.co.kr/store/inner_shop_list.php"
 CSV_FILE = "momstouch_stores.csv"
+BRAND = "momstouch"
+SIDO_CODES = [f"{sido:03d}" for sido in range(1, 18)]
+CONCURRENCY = 8
+
+# 매장 수가 많은 시도는 s_area_sigun 단위로 나눠서 요청할 수 있다 (예: {"009": ["01", "02"]})
+SIGUN_SHARDS = {}
+
+# 모듈 로드 시 한 번만 컴파일
+LI_PATTERN = re.compile(r"<li>.*?<dt><span.*?>(.*?)</span></dt>.*?<dd>(.*?)</dd>", re.DOTALL)
+CLEAN_PATTERN = re.compile(r"\s*&nbsp;\s*|\\n|\\t")
 
 # 정규식으로 텍스트 클리닝
 def clean_text(text):
-    return re.sub(r"\s*&nbsp;\s*|\\n|\\t", " ", text).strip()
+    return CLEAN_PATTERN.sub(" ", text).strip()
 
-def fetch_store_data(sido):
+def fetch_store_data(sido, client=None, sigun=""):
+    client = client or default_client()
     params = {
-        "s_area_sido": f"{sido:03d}",
-        "s_area_sigun": "",
+        "s_area_sido": sido if isinstance(sido, str) else f"{sido:03d}",
+        "s_area_sigun": sigun,
         "type": "area"
     }
-    response = requests.post(URL, data=params)
+    response = client.post(URL, data=params)
     if response.status_code != 200:
-        raise Exception(f"Failed to fetch data for sido {sido}: {response.status_code}")
+        raise Exception(f"Failed to fetch data for sido {sido} sigun {sigun or '-'}: {response.status_code}")
     return response.text
 
+# 매장을 찾는 대로 하나씩 돌려준다 (전체 목록을 따로 만들지 않음)
+def iter_store_info(html_content):
+    for match in LI_PATTERN.finditer(html_content):
+        yield [clean_text(match.group(1)), clean_text(match.group(2)).replace(",", "")]
+
 def extract_store_info(html_content):
-    store_data = []
-    li_pattern = re.compile(r"<li>.*?<dt><span.*?>(.*?)</span></dt>.*?<dd>(.*?)</dd>", re.DOTALL)
-    matches = li_pattern.findall(html_content)
-
-    for match in matches:
-        name = clean_text(match[0])
-        address = clean_text(match[1]).replace(",", "")
-        store_data.append([name, address])
-    return store_data
-
-def save_to_csv(store_info):
-    with open(CSV_FILE, mode="w", encoding="utf-8-sig", newline="") as file:
+    return list(iter_store_info(html_content))
+
+# 요청 단위 목록: 샤드가 지정된 시도는 시군 단위, 나머지는 시도 단위
+def make_jobs(sido_codes=SIDO_CODES, sigun_shards=SIGUN_SHARDS):
+    return [(sido, sigun) for sido in sido_codes for sigun in sigun_shards.get(sido, [""])]
+
+# 모든 요청을 동시에 보내고, 끝나는 순서대로 매장을 돌려준다
+# 시군 샤드끼리 겹치는 매장은 한 번만 돌려준다
+def iter_stores(client=None, concurrency=CONCURRENCY, jobs=None):
+    client = client or default_client()
+    jobs = jobs if jobs is not None else make_jobs()
+    seen = set()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(instrument.bind(fetch_store_data), sido, client, sigun): (sido, sigun) for sido, sigun in jobs}
+        for future in as_completed(futures):
+            for store in iter_store_info(future.result()):
+                key = tuple(store)
+                if key not in seen:
+                    seen.add(key)
+                    yield store
+
+# 공통 러너(crawl_all.py)에서 사용하는 플러그인 진입점
+def iter_records(client):
+    for name, address in iter_stores(client):
+        yield StoreRecord(BRAND, name, address)
+
+# 파일을 한 번만 열고, 도착하는 매장을 바로 기록한다
+def save_to_csv(stores, csv_file=CSV_FILE):
+    count = 0
+    with open(csv_file, mode="w", encoding="utf-8-sig", newline="") as file:
         writer = csv.writer(file)
         writer.writerow(["storNm", "storAddr"])
-        for store in store_info:
+        for store in stores:
             writer.writerow(store)
+            count += 1
+    return count
 
-def main():
-    with open(CSV_FILE, mode="w", encoding="utf-8-sig", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["storNm", "storAddr"])
+# "009=01,02,03" -> ("009", ["01", "02", "03"])
+def parse_sigun_shard(value):
+    sido, _, siguns = value.partition("=")
+    return sido.zfill(3), [sigun.strip() for sigun in siguns.split(",") if sigun.strip()]
 
-    for sido in range(1, 18):
-        html_content = fetch_store_data(sido)
-        store_info = extract_store_info(html_content)
-        save_to_csv(store_info)
+def main():
+    parser = argparse.ArgumentParser(description="맘스터치 매장 목록 수집")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--sigun", action="append", default=[], metavar="SIDO=SIGUN,...",
+                        help="시도 하나를 s_area_sigun 값별로 나눠서 요청 (여러 번 지정 가능)")
+    parser.add_argument("--output", default=CSV_FILE)
+    args = parser.parse_args()
 
-    print(f"Data saved to {CSV_FILE}")
+    sigun_shards = dict(SIGUN_SHARDS, **dict(parse_sigun_shard(value) for value in args.sigun))
+    stores = iter_stores(concurrency=args.concurrency, jobs=make_jobs(SIDO_CODES, sigun_shards))
+    count = save_to_csv(stores, args.output)
+    print(f"{count} stores saved to {args.output}")
 
 if __name__ == "__main__":
     main()
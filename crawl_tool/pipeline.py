@@ -0,0 +1,318 @@
+import os
+import csv
+import json
+import hashlib
+import argparse
+import threading
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import instrument
+
+DATA_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+STATE_FILE = ".pipeline_state.json"
+RAW_DIR = "raw"    # 크롤러 원본 결과 (store, addr, ...)
+WORK_DIR = "work"  # 중간 결과 (브랜드별 fail, 인코딩 변환한 hu 등)
+HASH_BLOCK = 1024 * 1024
+RAW_HEADER = ["store", "addr", "store_id", "lat", "lng"]
+FAIL_HEADER = ["store", "addr", "prov", "area", "div", "original_file"]
+
+# 단계 하나: 입력 파일이 모두 같고 출력 파일이 기록과 같으면 다시 실행하지 않는다
+class Stage:
+    def __init__(self, name, inputs, outputs, action, always=False):
+        self.name = name
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.action = action
+        self.always = always  # 입력이 없는 단계(크롤링)는 출력이 없거나 강제로 지정했을 때만 실행
+
+# 파일 내용 해시, (크기, 수정 시각)이 기록과 같으면 저장된 해시를 재사용한다
+class HashCache:
+    def __init__(self, known=None):
+        self.known = dict(known or {})
+        self.lock = threading.Lock()
+
+    def digest(self, path):
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        with self.lock:
+            entry = self.known.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha1"]
+        sha1 = hashlib.sha1()
+        with open(path, mode="rb") as file:
+            for block in iter(lambda: file.read(HASH_BLOCK), b""):
+                sha1.update(block)
+        with self.lock:
+            self.known[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": sha1.hexdigest()}
+        return sha1.hexdigest()
+
+    # 다른 스레드가 digest()로 기록하는 중에도 저장할 수 있도록 복사본을 돌려준다
+    def snapshot(self):
+        with self.lock:
+            return dict(self.known)
+
+class Pipeline:
+    def __init__(self, stages, state_file):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file = state_file
+        self.state = {"stages": {}, "hashes": {}}
+        if os.path.exists(state_file):
+            with open(state_file, mode="r", encoding="utf-8") as file:
+                self.state = json.load(file)
+        self.hashes = HashCache(self.state.get("hashes"))
+        self.lock = threading.Lock()
+        # 출력 파일 -> 그 파일을 만드는 단계
+        producers = {os.path.abspath(path): stage.name for stage in stages for path in stage.outputs}
+        self.upstream = {stage.name: {producers[os.path.abspath(path)] for path in stage.inputs
+                                      if os.path.abspath(path) in producers} for stage in stages}
+
+    # 상태 파일 기준 상대 경로 -> 해시 (다른 드라이브에 있으면 절대 경로)
+    def fingerprint(self, paths):
+        base = os.path.dirname(os.path.abspath(self.state_file))
+        result = {}
+        for path in paths:
+            try:
+                key = os.path.relpath(path, base)
+            except ValueError:
+                key = os.path.abspath(path)
+            result[key] = self.hashes.digest(path)
+        return result
+
+    # 다시 실행해야 하는 이유 (필요 없으면 None)
+    def stale_reason(self, stage, forced):
+        if stage.name in forced:
+            return "forced"
+        missing = [path for path in stage.outputs if not os.path.exists(path)]
+        if missing:
+            return f"missing output {os.path.basename(missing[0])}"
+        if stage.always:
+            return None
+        record = self.state["stages"].get(stage.name)
+        if record is None:
+            return "no previous run"
+        if record.get("inputs") != self.fingerprint(stage.inputs):
+            return "inputs changed"
+        if record.get("outputs") != self.fingerprint(stage.outputs):
+            return "outputs modified"
+        return None
+
+    def save_state(self):
+        with self.lock:
+            self.state["hashes"] = self.hashes.snapshot()
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            with open(self.state_file, mode="w", encoding="utf-8") as file:
+                json.dump(self.state, file, ensure_ascii=False, indent=2)
+
+    def run_stage(self, stage, forced, dry_run):
+        reason = self.stale_reason(stage, forced)
+        if reason is None:
+            return "skipped", None
+        if dry_run:
+            return "would run", reason
+        for path in stage.inputs:
+            if not os.path.exists(path):
+                raise Exception(f"{stage.name}: input {path} not found")
+        for path in stage.outputs:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with instrument.stage(f"pipeline:{stage.name}"):
+            stage.action()
+        with self.lock:
+            self.state["stages"][stage.name] = {
+                "inputs": self.fingerprint(stage.inputs),
+                "outputs": self.fingerprint(stage.outputs)
+            }
+        self.save_state()
+        return "ran", reason
+
+    # 선행 단계가 끝난 단계부터 병렬로 실행, 실패한 단계의 하위 단계는 건너뛴다
+    def run(self, targets=None, forced=(), max_workers=4, dry_run=False):
+        selected = self.select(targets)
+        forced = set(forced)
+        done, failed, results = set(), set(), {}
+        pending = set(selected)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            while pending or running:
+                for name in sorted(pending):
+                    upstream = self.upstream[name] & selected
+                    if upstream & failed:
+                        pending.discard(name)
+                        failed.add(name)
+                        results[name] = ("blocked", "upstream failed")
+                    elif upstream <= done:
+                        pending.discard(name)
+                        running[executor.submit(self.run_stage, self.stages[name], forced, dry_run)] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                        done.add(name)
+                        # 다시 실행된 단계의 하위 단계는 입력 해시로 판단한다 (dry run에서는 미리 표시)
+                        if dry_run and results[name][0] == "would run":
+                            forced.update(self.downstream(name))
+                    except Exception as e:
+                        failed.add(name)
+                        results[name] = ("failed", str(e))
+                    status, reason = results[name]
+                    print(f"[{status}] {name}" + (f" ({reason})" if reason else ""))
+        return results
+
+    # targets와 그 선행 단계 전체 (targets가 없으면 모든 단계)
+    def select(self, targets):
+        if not targets:
+            return set(self.stages)
+        selected, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise Exception(f"Unknown stage: {name}")
+            if name not in selected:
+                selected.add(name)
+                stack.extend(self.upstream[name])
+        return selected
+
+    def downstream(self, name):
+        return {other for other, upstream in self.upstream.items() if name in upstream}
+
+# --- 월별 스냅샷 단계 정의 ---
+
+def crawl_action(module_name, output_file):
+    def action():
+        import crawl_all
+        from crawler_core import HttpClient
+        with HttpClient() as client:
+            _, records = crawl_all.run_plugin(crawl_all.load_plugin(module_name), client)
+        with open(output_file, mode="w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(RAW_HEADER)
+            writer.writerows([record.name, record.addr, record.store_id,
+                              "" if record.lat is None else record.lat,
+                              "" if record.lng is None else record.lng] for record in records)
+    return action
+
+def filter_action(raw_file, sample_file, output_file, fail_file):
+    def action():
+        import filter_csv
+        with open(fail_file, mode="w", encoding="utf-8-sig", newline="") as file:
+            fail_writer = csv.writer(file)
+            fail_writer.writerow(FAIL_HEADER)
+            filter_csv.process_csv(raw_file, filter_csv.load_sample_areas(sample_file), fail_writer, output_file)
+    return action
+
+# 브랜드별 fail 파일을 하나의 fail.csv로 합친다 (original_file은 data/<월>/ 의 파일 이름)
+def merge_fail_action(fail_files, output_file):
+    def action():
+        with open(output_file, mode="w", encoding="utf-8-sig", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(FAIL_HEADER)
+            for fail_file in fail_files:
+                with open(fail_file, mode="r", encoding="utf-8-sig", newline="") as file:
+                    reader = csv.reader(file)
+                    next(reader, None)
+                    writer.writerows(reader)
+    return action
+
+def enc_action(source_file, output_file, encoding):
+    def action():
+        import enc
+        enc.convert(source_file, output_file, encoding)
+    return action
+
+def compare_action(hu_file, sig_table_file, output_file):
+    def action():
+        import compare
+        compare.compare_files(hu_file, sig_table_file, output_file)
+    return action
+
+# 같은 매장이 여러 번 나온 행을 합친다 (겹치는 검색어, 주소 표기 차이)
+def dedup_action(input_file, brand, output_file, report_file):
+    def action():
+        import dedup_stores
+        dedup_stores.dedup_file(input_file, output_file, report_file, brand)
+    return action
+
+def aggregate_action(month_dir):
+    def action():
+        import build_aggregates
+        build_aggregates.build(month_dir)
+    return action
+
+# crawl:<브랜드> -> filter:<브랜드> -> dedup:<브랜드> 는 브랜드마다 독립된 가지로 병렬 실행되고,
+# fail/aggregate 단계만 모든 가지의 결과를 기다린다
+def build_stages(month_dir, plugins, sample_file, hu_source=None, hu_encoding=None, sig_table_file=None):
+    import crawl_all
+    stages = []
+    brand_files, fail_files = [], []
+    for module_name in plugins:
+        brand = crawl_all.load_plugin(module_name).BRAND
+        raw_file = os.path.join(month_dir, RAW_DIR, f"{brand}.csv")
+        filtered_file = os.path.join(month_dir, WORK_DIR, f"filtered_{brand}.csv")
+        output_file = os.path.join(month_dir, f"{brand}.csv")
+        fail_file = os.path.join(month_dir, WORK_DIR, f"fail_{brand}.csv")
+        dup_file = os.path.join(month_dir, WORK_DIR, f"dup_{brand}.csv")
+        stages.append(Stage(f"crawl:{brand}", [], [raw_file], crawl_action(module_name, raw_file), always=True))
+        stages.append(Stage(f"filter:{brand}", [raw_file, sample_file], [filtered_file, fail_file],
+                            filter_action(raw_file, sample_file, filtered_file, fail_file)))
+        stages.append(Stage(f"dedup:{brand}", [filtered_file], [output_file, dup_file],
+                            dedup_action(filtered_file, brand, output_file, dup_file)))
+        brand_files.append(output_file)
+        fail_files.append(fail_file)
+
+    fail_output = os.path.join(month_dir, "fail.csv")
+    stages.append(Stage("fail", fail_files, [fail_output], merge_fail_action(fail_files, fail_output)))
+
+    hu_file = os.path.join(month_dir, "hu.csv")
+    if hu_source:
+        hu_utf8 = os.path.join(month_dir, WORK_DIR, "hu-utf8.csv")
+        sig_table_file = sig_table_file or os.path.join(month_dir, "extracted_sig_data.csv")
+        stages.append(Stage("enc:hu", [hu_source], [hu_utf8], enc_action(hu_source, hu_utf8, hu_encoding)))
+        stages.append(Stage("compare:hu", [hu_utf8, sig_table_file], [hu_file],
+                            compare_action(hu_utf8, sig_table_file, hu_file)))
+
+    # 매장 파일이 없는 브랜드(kfc, issac 등 수동 수집분)도 집계 입력으로 추적한다
+    import build_aggregates
+    extra_files = [os.path.join(month_dir, f"{brand}.csv") for brand in build_aggregates.BRANDS
+                   if os.path.join(month_dir, f"{brand}.csv") not in brand_files
+                   and os.path.exists(os.path.join(month_dir, f"{brand}.csv"))]
+    stages.append(Stage("aggregate", brand_files + extra_files + [hu_file],
+                        [os.path.join(month_dir, build_aggregates.AGG_DIR, "regions.json")],
+                        aggregate_action(month_dir)))
+    return stages
+
+def main():
+    import crawl_all
+    parser = argparse.ArgumentParser(description="월별 데이터 스냅샷을 만드는 단계를 변경된 부분만 다시 실행합니다.")
+    parser.add_argument("targets", nargs="*", help="실행할 단계 이름 (기본: 전체, 선행 단계 포함)")
+    parser.add_argument("--month", default=None, help="data/ 아래 폴더 이름 (기본: 이번 달 YYYY-MM)")
+    parser.add_argument("--data-root", default=DATA_ROOT)
+    parser.add_argument("--plugins", nargs="+", default=crawl_all.PLUGINS)
+    parser.add_argument("--sample", default="sample.csv", help="시군구명 검증에 쓸 sample.csv")
+    parser.add_argument("--hu-source", default=None, help="인구/면적 원본 CSV (지정하면 enc, compare 단계 추가)")
+    parser.add_argument("--hu-encoding", default=None, help="인구/면적 원본 인코딩 (예: cp949)")
+    parser.add_argument("--sig-table", default=None, help="기본: data/<월>/extracted_sig_data.csv")
+    parser.add_argument("--force", nargs="*", default=[], help="입력과 관계없이 다시 실행할 단계 (예: crawl:lotteria)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--dry-run", action="store_true", help="실행할 단계만 출력")
+    parser.add_argument("--report", default=None, help="실행 보고서 JSON (instrument)")
+    parser.add_argument("--list", action="store_true", help="단계와 입출력 목록 출력")
+    args = parser.parse_args()
+
+    month_dir = os.path.join(args.data_root, args.month or date.today().strftime("%Y-%m"))
+    stages = build_stages(month_dir, args.plugins, os.path.abspath(args.sample), args.hu_source,
+                          args.hu_encoding, args.sig_table)
+    pipeline = Pipeline(stages, os.path.join(month_dir, STATE_FILE))
+    if args.list:
+        for stage in stages:
+            print(f"{stage.name}: {[os.path.relpath(p) for p in stage.inputs]} -> "
+                  f"{[os.path.relpath(p) for p in stage.outputs]}")
+        return
+    with instrument.run("pipeline", args.report):
+        pipeline.run(args.targets, args.force, args.workers, args.dry_run)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import os
+import sys
+import csv
+import json
+import math
+import time
+import argparse
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from build_geometry import DATA_ROOT, GEOJSON_FILE, HU_FILE, OUTPUT_DIR, TOPOLOGY_GRID, load_provinces, snap_ring
+from build_aggregates import BRANDS, read_csv, region_key
+from snapshot_store import NUMERATOR, DENOMINATOR
+
+GRAPH_FILE = os.path.join(OUTPUT_DIR, "adjacency.npz")
+KM_PER_DEGREE = 111.32
+NEAR_TOLERANCE_KM = 0.05  # 꼭짓점이 달라도 이 거리 안에 있는 경계는 공유한 것으로 본다
+MIN_NEAR_KM = 0.3         # 보조 검사에서 이보다 짧게 겹치면 (모서리만 닿는 경우) 이웃이 아니다
+
+# 경계 선분 (두 끝점을 정렬한 튜플) -> 처음 나온 지역 번호
+# 다른 지역에서 같은 선분이 나오면 두 지역은 경계를 공유하는 이웃이다 (꼭짓점만 닿는 경우는 제외)
+def shared_boundaries(features):
+    segment_owner = {}
+    shared = {}
+    for region, feature in enumerate(features):
+        for ring in feature["geometry"]["coordinates"]:
+            points = snap_ring(ring)
+            for i, start in enumerate(points):
+                end = points[(i + 1) % len(points)]
+                key = (start, end) if start < end else (end, start)
+                owner = segment_owner.setdefault(key, region)
+                if owner != region:
+                    pair = (owner, region) if owner < region else (region, owner)
+                    shared[pair] = shared.get(pair, 0.0) + segment_km(start, end)
+    return shared
+
+# (경도, 위도) -> 대략적인 km 좌표 (위도마다 경도 간격을 줄인다)
+def to_km(coords):
+    return np.column_stack([coords[:, 0] * KM_PER_DEGREE * np.cos(np.radians(coords[:, 1])),
+                            coords[:, 1] * KM_PER_DEGREE])
+
+# 보조 검사: 꼭짓점이 서로 달라 shared_boundaries가 놓친 이웃
+# 경계 상자가 겹치지만 공유 선분이 없는 쌍만, 한쪽 경계가 다른 쪽 경계에서 tolerance_km 안에 있는 길이를 잰다
+def near_boundaries(features, shared, tolerance_km=NEAR_TOLERANCE_KM, min_km=MIN_NEAR_KM):
+    geometries = shapely.transform(np.array([shape(feature["geometry"]) for feature in features]), to_km)
+    boundaries = shapely.boundary(geometries)
+    tree = shapely.STRtree(geometries)
+    left, right = tree.query(geometries)
+    found = {}
+    for i, j in zip(left.tolist(), right.tolist()):
+        if i >= j or (i, j) in shared:
+            continue
+        length = shapely.length(shapely.intersection(boundaries[i], shapely.buffer(boundaries[j], tolerance_km)))
+        if length >= min_km:
+            found[(i, j)] = float(length)
+    return found
+
+# 격자 좌표 선분의 대략적인 길이 (km)
+def segment_km(start, end):
+    (x1, y1), (x2, y2) = start, end
+    lat = math.radians((y1 + y2) / 2 / TOPOLOGY_GRID)
+    dx = (x2 - x1) / TOPOLOGY_GRID * KM_PER_DEGREE * math.cos(lat)
+    dy = (y2 - y1) / TOPOLOGY_GRID * KM_PER_DEGREE
+    return math.hypot(dx, dy)
+
+# 이웃 쌍 -> CSR (indptr, indices, weights), 양방향으로 저장하고 행마다 이웃 번호 순으로 정렬
+def to_csr(shared, size):
+    pairs = np.array(list(shared.keys()), dtype=np.int32).reshape(-1, 2)
+    lengths = np.array(list(shared.values()), dtype=np.float32)
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    weights = np.concatenate([lengths, lengths])
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(size + 1, dtype=np.int32)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32), weights[order]
+
+def build(geojson_file=GEOJSON_FILE, hu_file=HU_FILE, output_file=GRAPH_FILE):
+    started = time.perf_counter()
+    with open(geojson_file, mode="r", encoding="utf-8") as file:
+        features = json.load(file)["features"]
+    provinces = load_provinces(hu_file)
+    shared = shared_boundaries(features)
+    near = near_boundaries(features, shared)
+    indptr, indices, weights = to_csr({**shared, **near}, len(features))
+
+    sig_cds = [feature["properties"]["SIG_CD"] for feature in features]
+    names = [f"{provinces.get(sig_cd, '')} {feature['properties']['SIG_KOR_NM']}".strip()
+             for sig_cd, feature in zip(sig_cds, features)]
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    np.savez_compressed(output_file, sig_cd=np.array(sig_cds), name=np.array(names),
+                        indptr=indptr, indices=indices, weights=weights)
+
+    islands = int(np.sum(np.diff(indptr) == 0))
+    print(f"{output_file}: {len(sig_cds)} regions, {len(indices) // 2} shared boundaries "
+          f"({len(near)} found within {NEAR_TOLERANCE_KM * 1000:.0f} m only), "
+          f"{islands} without neighbors, {os.path.getsize(output_file) / 1024:.1f} KB "
+          f"({time.perf_counter() - started:.2f}s)")
+    return output_file
+
+# CSR 인접 그래프와 벡터화된 이웃 합계/평활 비율 계산
+# values는 (지역 수,) 또는 (지역 수, 열 수) 배열이며 행 순서는 sig_cds와 같다
+class RegionGraph:
+    def __init__(self, sig_cds, names, indptr, indices, weights):
+        self.sig_cds = list(sig_cds)
+        self.names = list(names)
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.index = {sig_cd: i for i, sig_cd in enumerate(self.sig_cds)}
+        self.rows = np.repeat(np.arange(len(self.sig_cds), dtype=np.int32), np.diff(indptr))
+        self.hop_cache = {}
+
+    @classmethod
+    def load(cls, file_path=GRAPH_FILE):
+        with np.load(file_path) as data:
+            return cls(data["sig_cd"].tolist(), data["name"].tolist(), data["indptr"], data["indices"], data["weights"])
+
+    def __len__(self):
+        return len(self.sig_cds)
+
+    def neighbors(self, sig_cd):
+        i = self.index[sig_cd]
+        return [self.sig_cds[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    # 이웃 합계 A @ values (누적합 차이로 행별 구간 합을 구한다)
+    def neighbor_sum(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        gathered = values[self.indices]
+        total = np.zeros((len(gathered) + 1,) + values.shape[1:])
+        np.cumsum(gathered, axis=0, out=total[1:])
+        return total[self.indptr[1:]] - total[self.indptr[:-1]]
+
+    # 지역 간 최단 홉 수 (n x n, max_k보다 멀면 -1)
+    def hops(self, max_k):
+        if max_k in self.hop_cache:
+            return self.hop_cache[max_k]
+        size = len(self)
+        distance = np.full((size, size), -1, dtype=np.int16)
+        np.fill_diagonal(distance, 0)
+        frontier = np.eye(size)
+        for k in range(1, max_k + 1):
+            reached = self.neighbor_sum(frontier) > 0
+            new = reached & (distance < 0)
+            if not new.any():
+                break
+            distance[new] = k
+            frontier = new.astype(np.float64)
+        self.hop_cache[max_k] = distance
+        return distance
+
+    # k홉 이내 지역(자신 포함) 가중치 행렬, 거리 d인 지역의 가중치는 decay ** d
+    def hop_weights(self, k, decay=1.0):
+        distance = self.hops(k)
+        return np.where(distance >= 0, np.power(float(decay), np.maximum(distance, 0)), 0.0)
+
+    # k홉 이내 지역 값의 합 (decay < 1이면 멀수록 작게 더한다)
+    def khop_sum(self, values, k=1, decay=1.0):
+        return self.hop_weights(k, decay) @ np.asarray(values, dtype=np.float64)
+
+    # 이웃 매장 수를 함께 더한 비율 (분모가 0이면 nan)
+    def smoothed_ratio(self, numerator, denominator, k=1, decay=0.5):
+        top = self.khop_sum(numerator, k, decay)
+        bottom = self.khop_sum(denominator, k, decay)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(bottom > 0, top / np.where(bottom > 0, bottom, 1), np.nan)
+
+    # 분모 매장 수가 min_count 이상이 될 때까지 지역마다 홉 수를 늘려서 비율을 구한다
+    # 반환: (비율, 사용한 홉 수), max_k까지 넓혀도 부족하면 max_k를 사용
+    def adaptive_ratio(self, numerator, denominator, min_count=5, max_k=3):
+        numerator = np.asarray(numerator, dtype=np.float64)
+        denominator = np.asarray(denominator, dtype=np.float64)
+        tops = np.stack([self.khop_sum(numerator, k) for k in range(max_k + 1)])
+        bottoms = np.stack([self.khop_sum(denominator, k) for k in range(max_k + 1)])
+        enough = bottoms >= min_count
+        chosen = np.where(enough.any(axis=0), enough.argmax(axis=0), max_k)
+        columns = np.arange(len(self))
+        top, bottom = tops[chosen, columns], bottoms[chosen, columns]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(bottom > 0, top / np.where(bottom > 0, bottom, 1), np.nan), chosen
+
+# 지역 키 -> 그래프 행 번호: hu.csv의 sig_cd를 먼저 쓰고, sig_cd가 없는 행은 그래프 지역 이름("경기 수원시 장안구")으로 찾는다
+def region_rows(graph, hu_rows):
+    rows = {}
+    for row in hu_rows:
+        if row.get("sig_cd") in graph.index:
+            rows.setdefault(region_key(row["prov"], row["area"]), graph.index[row["sig_cd"]])
+    for i, name in enumerate(graph.names):
+        prov, _, area = name.partition(" ")
+        rows.setdefault(region_key(prov, area), i)
+    return rows
+
+# data/<월>/ 의 브랜드별 매장 수를 그래프의 지역 순서에 맞춘 (지역 수, 브랜드 수) 배열로 만든다
+# 구 단위로 찾지 못하면 시 단위(경기 부천시소사구 -> 경기 부천시)로 찾고, 그래도 없는 매장은 지역별로 알린다
+def load_counts(graph, month_dir):
+    rows = region_rows(graph, read_csv(os.path.join(month_dir, "hu.csv")))
+    counts = np.zeros((len(graph), len(BRANDS)))
+    unmatched = {}
+    for brand_index, brand in enumerate(BRANDS):
+        for store in read_csv(os.path.join(month_dir, f"{brand}.csv")):
+            prov, area = store.get("prov", ""), store.get("area", "")
+            key = region_key(prov, area)
+            row = rows.get(key, rows.get(region_key(prov, area, False)))
+            if row is None:
+                unmatched.setdefault(key, []).append(store)
+                continue
+            counts[row, brand_index] += 1
+    for key, stores in sorted(unmatched.items()):
+        print(f"Warning: {len(stores)} stores in {key} are not in the graph", file=sys.stderr)
+    if unmatched:
+        print(f"{sum(len(stores) for stores in unmatched.values())} stores not counted", file=sys.stderr)
+    return counts
+
+def brand_sum(counts, brands):
+    return counts[:, [BRANDS.index(brand) for brand in brands]].sum(axis=1)
+
+def format_ratio(value):
+    return "" if np.isnan(value) else f"{value:.3f}"
+
+def main():
+    parser = argparse.ArgumentParser(description="시군구 경계 인접 그래프를 만들고 이웃 평활 버거지수를 계산합니다.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = sub.add_parser("build", help="korea.geojson에서 인접 그래프(CSR) 생성")
+    build_parser.add_argument("--geojson", default=GEOJSON_FILE)
+    build_parser.add_argument("--hu", default=HU_FILE, help="지역 이름에 붙일 시도를 가져올 hu.csv")
+    build_parser.add_argument("--output", default=GRAPH_FILE)
+
+    neighbor_parser = sub.add_parser("neighbors", help="지역의 k홉 이웃 목록")
+    neighbor_parser.add_argument("sig_cd")
+    neighbor_parser.add_argument("--k", type=int, default=1)
+    neighbor_parser.add_argument("--graph", default=GRAPH_FILE)
+
+    smooth_parser = sub.add_parser("smooth", help="지역별 원래 비율과 이웃 평활 비율")
+    smooth_parser.add_argument("--month", default="2024-12", help="data/ 아래 폴더 이름")
+    smooth_parser.add_argument("--graph", default=GRAPH_FILE)
+    smooth_parser.add_argument("--k", type=int, default=1)
+    smooth_parser.add_argument("--decay", type=float, default=0.5, help="홉마다 곱하는 이웃 가중치")
+    smooth_parser.add_argument("--min-count", type=int, default=None,
+                               help="지정하면 분모 매장 수가 이 값 이상이 될 때까지 홉 수를 늘림 (--k가 최대)")
+    smooth_parser.add_argument("--num", nargs="+", default=NUMERATOR)
+    smooth_parser.add_argument("--den", nargs="+", default=DENOMINATOR)
+    smooth_parser.add_argument("--output", default=None, help="결과 CSV (기본: 화면 출력)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.geojson, args.hu, args.output)
+        return
+
+    graph = RegionGraph.load(args.graph)
+    if args.command == "neighbors":
+        distance = graph.hops(args.k)[graph.index[args.sig_cd]]
+        for j in np.argsort(distance, kind="stable"):
+            if distance[j] > 0:
+                print(f"{distance[j]} {graph.sig_cds[j]} {graph.names[j]}")
+        return
+
+    counts = load_counts(graph, os.path.join(DATA_ROOT, args.month))
+    numerator, denominator = brand_sum(counts, args.num), brand_sum(counts, args.den)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+    if args.min_count is not None:
+        smoothed, used_k = graph.adaptive_ratio(numerator, denominator, args.min_count, args.k)
+    else:
+        smoothed = graph.smoothed_ratio(numerator, denominator, args.k, args.decay)
+        used_k = np.full(len(graph), args.k)
+
+    rows = [[sig_cd, name, int(top), int(bottom), format_ratio(r), format_ratio(s), int(k)]
+            for sig_cd, name, top, bottom, r, s, k
+            in zip(graph.sig_cds, graph.names, numerator, denominator, raw, smoothed, used_k)]
+    header = ["sig_cd", "name", "numerator", "denominator", "ratio", "smoothed", "k"]
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        print(f"Saved {len(rows)} regions to {args.output}")
+    else:
+        print(",".join(header))
+        for row in rows:
+            print(",".join(map(str, row)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import re
+import numpy as np
+import pandas as pd
+
+# 시도명 표기 -> 통일된 약칭
+PROVINCE_ALIASES = {
+    "서울": ["서울특별시", "서울", "서울시"],
+    "세종": ["세종특별자치시", "세종", "세종시"],
+    "울산": ["울산광역시", "울산", "울산시"],
+    "인천": ["인천광역시", "인천", "인천시"],
+    "전남": ["전라남도", "전남"],
+    "전북": ["전북특별자치도", "전라북도", "전북"],
+    "제주": ["제주특별자치도", "제주", "제주시"],
+    "충남": ["충청남도", "충남", "충남시"],
+    "충북": ["충청북도", "충북"],
+    "강원": ["강원특별자치도", "강원", "강원도", "강원시"],
+    "경기": ["경기도", "경기"],
+    "경남": ["경상남도", "경남"],
+    "경북": ["경상북도", "경북"],
+    "광주": ["광주광역시", "광주"],
+    "대구": ["대구광역시", "대구", "대구광역", "대구시"],
+    "대전": ["대전광역시", "대전", "대전시"],
+    "부산": ["부산광역시", "부산", "부산시"]
+}
+
+# 역방향 조회 테이블 (표기 -> 약칭), 모듈 로드 시 한 번만 생성
+# 같은 표기가 여러 번 나오면 기존 선형 탐색과 동일하게 먼저 나온 약칭을 사용
+ALIAS_TO_PROVINCE = {}
+for _key, _values in PROVINCE_ALIASES.items():
+    for _value in _values:
+        ALIAS_TO_PROVINCE.setdefault(_value, _key)
+
+SEJONG = "세종"
+SEJONG_AREA = "세종시"
+CITY_DISTRICT_PATTERN = re.compile(r"^(.+?시)(.+구)$")
+
+# 시도명을 통일하는 함수 (테이블에 없으면 그대로 반환)
+def normalize_province(name):
+    return ALIAS_TO_PROVINCE.get(name, name)
+
+# 시도 약칭과 시군구명으로 최종 area를 만든다
+# 세종은 항상 "세종시", "XX시 YY구" 형태는 하나의 area로 합친다
+def normalize_area(prov, area, district=""):
+    if prov == SEJONG:
+        return SEJONG_AREA
+    if district and district.endswith("구"):
+        return f"{area} {district}"
+    return area
+
+# hu.csv의 붙여 쓴 시군구명을 normalize_area와 같은 표기로 ("수원시장안구" -> "수원시 장안구")
+def expand_area(prov, area):
+    match = CITY_DISTRICT_PATTERN.match(area)
+    if match:
+        return normalize_area(prov, match.group(1), match.group(2))
+    return normalize_area(prov, area)
+
+# 주소 문자열을 (prov, area)로 분해
+def parse_address(addr):
+    addr_words = addr.split()
+    prov = normalize_province(addr_words[0]) if addr_words else ""
+    area = addr_words[1] if len(addr_words) > 1 else ""
+    district = addr_words[2] if len(addr_words) > 2 else ""
+    return prov, normalize_area(prov, area, district)
+
+# prov, area로 div 문자열 생성
+def make_div(prov, area):
+    return f"{prov} {area}".strip()
+
+# 고유값만 변환한 뒤 코드로 다시 펼치는 방식의 벡터화 변환
+def _map_unique(series, func):
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([func(value) for value in uniques] + [np.nan], dtype=object)
+    # factorize는 결측값을 -1로 표시하므로 마지막 원소(np.nan)를 가리킨다
+    return pd.Series(mapped[codes], index=series.index, name=series.name)
+
+# 시도명 Series 전체를 통일 (df['시도명'].apply(...)의 대체)
+def normalize_province_series(series):
+    return _map_unique(series, normalize_province)
+
+# 주소 Series를 prov, area 두 Series로 분해
+def parse_address_series(series):
+    parsed = _map_unique(series.fillna(""), parse_address)
+    prov = parsed.str[0].rename("prov")
+    area = parsed.str[1].rename("area")
+    return prov, area
@@ -0,0 +1,357 @@
+import os
+import re
+import gzip
+import json
+import asyncio
+import hashlib
+import argparse
+import mimetypes
+from collections import OrderedDict
+from email.utils import formatdate
+from urllib.parse import unquote, urlsplit
+from build_aggregates import AGG_DIR, DATA_ROOT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# data/ 아래 스냅샷을 읽기 전용으로 제공하는 HTTP 서버
+#   GET /api/months                    집계가 있는 월 목록
+#   GET /api/<월>/regions              지역별 매장 수 (agg/regions.json)
+#   GET /api/<월>/stores/<조각>        구 단위 매장 목록 (agg/stores/<조각>.json, 조각은 sig_cd 또는 "시도_시군구")
+#   GET /api/notice                    공지사항 (notice.txt)
+#   그 밖의 경로는 STATIC_PATTERNS에 맞는 사이트 파일만 (index.html, script.js, data/<월>/agg, data/geo ...)
+SITE_ROOT = os.path.dirname(DATA_ROOT)
+CACHE_BYTES = 64 * 1024 * 1024   # 메모리 캐시 최대 크기 (원본 + 압축본 합계)
+MIN_COMPRESS = 512               # 이보다 작은 응답은 압축하지 않는다
+MAX_HEADER = 64 * 1024
+KEEPALIVE_TIMEOUT = 15
+MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+SHARD_PATTERN = re.compile(r"^[\w-]+$")  # build_aggregates.shard_id: 5자리 sig_cd 또는 "경기_부천시소사구"
+# 정적 파일로 내보낼 경로 (SITE_ROOT 기준), 저장소의 다른 파일(crawl_tool, requests.jsonl, snapshots.sqlite 등)은 404
+STATIC_PATTERNS = [re.compile(pattern) for pattern in (
+    r"index\.html", r"script\.js", r"[\w-]+\.(css|png|ico|svg)",
+    r"data/notice\.txt", r"data/korea\.geojson", r"data/geo/[\w.-]+\.(geojson|topojson)",
+    r"data/\d{4}-\d{2}/[\w-]+\.csv",  # script.js loadCSV
+    r"data/\d{4}-\d{2}/agg/regions\.json", r"data/\d{4}-\d{2}/agg/stores/[\w-]+\.json")]
+COMPRESSIBLE = ("text/", "application/json", "application/javascript", "application/geo+json", "image/svg")
+# 월별 집계는 다시 만들 수 있으므로 짧게 캐시하고 ETag로 확인한다
+CACHE_CONTROL = {"api": "public, max-age=60", "dynamic": "no-cache", "static": "public, max-age=300"}
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 500: "Internal Server Error"}
+
+mimetypes.add_type("application/geo+json", ".geojson")
+mimetypes.add_type("application/json", ".topojson")
+
+# 응답 본문 하나: 원본, 미리 압축한 gzip/brotli, ETag
+class Payload:
+    def __init__(self, body, content_type, version=None):
+        self.body = body
+        self.content_type = content_type
+        self.version = version
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.encoded = {}
+        if len(body) >= MIN_COMPRESS and content_type.startswith(COMPRESSIBLE):
+            self.encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.encoded["br"] = brotli.compress(body, quality=11)
+
+    @property
+    def size(self):
+        return len(self.body) + sum(len(data) for data in self.encoded.values())
+
+    # Accept-Encoding에 맞는 (인코딩, 본문), br > gzip > 원본 순으로 고른다
+    def select(self, accept_encoding):
+        accepted = {}
+        for part in accept_encoding.lower().split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip()] = quality
+        for encoding in ("br", "gzip"):
+            if encoding in self.encoded and accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding, self.encoded[encoding]
+        return None, self.body
+
+# 파일 경로 -> Payload LRU 캐시, 파일의 (수정 시각, 크기)가 바뀌면 다시 읽는다
+class PayloadCache:
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.loading = {}
+
+    def get(self, key, version):
+        payload = self.entries.get(key)
+        if payload is None or payload.version != version:
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, key, payload):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+        if payload.size > self.max_bytes:
+            return payload
+        self.entries[key] = payload
+        self.bytes += payload.size
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.size
+        return payload
+
+    # 캐시에 없으면 loader를 스레드에서 실행 (같은 키를 동시에 요청하면 한 번만 읽는다)
+    async def load(self, key, version, loader):
+        payload = self.get(key, version)
+        if payload is not None:
+            return payload
+        task = self.loading.get((key, version))
+        if task is None:
+            self.misses += 1
+            task = self.loading[(key, version)] = asyncio.ensure_future(asyncio.to_thread(loader))
+            try:
+                return self.put(key, await task)
+            finally:
+                self.loading.pop((key, version), None)
+        return await task
+
+# 매장이 없는 구의 조각 (build_aggregates는 빈 조각 파일을 만들지 않는다)
+EMPTY_SHARD = Payload(b"{}", "application/json; charset=utf-8")
+
+def file_version(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size) if os.path.isfile(path) else None
+
+def content_type_of(path):
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return content_type + "; charset=utf-8" if content_type.startswith(("text/", "application/j")) else content_type
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 압축 프록시가 붙이는 약한 ETag(W/"...")도 같은 값으로 본다
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+class ApiServer:
+    def __init__(self, data_root=DATA_ROOT, site_root=SITE_ROOT, cache_bytes=CACHE_BYTES):
+        self.data_root = os.path.abspath(data_root)
+        self.site_root = os.path.abspath(site_root)
+        self.cache = PayloadCache(cache_bytes)
+        self.shard_names = {}  # regions.json 경로 -> (ETag, 그 달 집계에 나오는 조각 이름 집합)
+
+    def months(self):
+        if not os.path.isdir(self.data_root):
+            return []
+        return sorted(name for name in os.listdir(self.data_root) if MONTH_PATTERN.match(name)
+                      and os.path.isfile(os.path.join(self.data_root, name, AGG_DIR, "regions.json")))
+
+    async def file_payload(self, path):
+        version = file_version(path)
+        if version is None:
+            return None
+
+        def loader():
+            with open(path, mode="rb") as file:
+                return Payload(file.read(), content_type_of(path), version)
+        return await self.cache.load(path, version, loader)
+
+    # 그 달 regions.json에 나오는 조각 이름 (regions.json이 없으면 None), regions.json이 바뀔 때만 다시 해석한다
+    async def known_shards(self, agg_dir):
+        path = os.path.join(agg_dir, "regions.json")
+        payload = await self.file_payload(path)
+        if payload is None:
+            return None
+        cached = self.shard_names.get(path)
+        if cached is None or cached[0] != payload.etag:
+            data = json.loads(payload.body)
+            names = {shard for regions in data.get("views", {}).values() for region in regions
+                     for shard in region.get("shards", [])}
+            cached = self.shard_names[path] = (payload.etag, names)
+        return cached[1]
+
+    async def months_payload(self):
+        months = self.months()
+        # 월 목록은 폴더 구성에 따라 바뀌므로 목록 자체를 버전으로 쓴다
+        version = tuple(months)
+        return await self.cache.load("months", version, lambda: Payload(
+            json.dumps({"months": months, "latest": months[-1] if months else None}).encode("utf-8"),
+            "application/json; charset=utf-8", version))
+
+    def static_path(self, path):
+        relative = unquote(path).lstrip("/") or "index.html"
+        parts = relative.split("/")
+        if any(part in ("", "..") or part.startswith(".") for part in parts):
+            return None
+        if not any(pattern.fullmatch(relative) for pattern in STATIC_PATTERNS):
+            return None
+        full_path = os.path.normpath(os.path.join(self.site_root, *parts))
+        return full_path if full_path.startswith(self.site_root + os.sep) else None
+
+    # 경로 -> (Payload, 캐시 종류) 또는 (상태 코드, None)
+    async def route(self, path):
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts[0] == "api":
+            if parts[1:] == ["months"]:
+                return await self.months_payload(), "dynamic"
+            if parts[1:] == ["notice"]:
+                return await self.file_payload(os.path.join(self.data_root, "notice.txt")) or 404, "dynamic"
+            if len(parts) >= 3 and MONTH_PATTERN.match(parts[1]):
+                agg_dir = os.path.join(self.data_root, parts[1], AGG_DIR)
+                if parts[2:] == ["regions"]:
+                    return await self.file_payload(os.path.join(agg_dir, "regions.json")) or 404, "api"
+                if len(parts) == 4 and parts[2] == "stores" and SHARD_PATTERN.match(parts[3]):
+                    known = await self.known_shards(agg_dir)
+                    if known is None:
+                        return 404, None
+                    payload = await self.file_payload(os.path.join(agg_dir, "stores", f"{parts[3]}.json"))
+                    # 매장이 하나도 없는 구는 조각 파일이 없으므로 빈 객체를 돌려준다 (regions.json에 없는 이름은 404)
+                    if payload is None and parts[3] in known:
+                        payload = EMPTY_SHARD
+                    return payload or 404, "api"
+            return 404, None
+        full_path = self.static_path(path)
+        if full_path is None:
+            return 404, None
+        return await self.file_payload(full_path) or 404, "static"
+
+    async def respond(self, method, target, headers):
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        path = urlsplit(target).path
+        try:
+            payload, kind = await self.route(path)
+        except Exception as e:
+            print(f"Error serving {path}: {e}")
+            return 500, {}, b""
+        if not isinstance(payload, Payload):
+            return payload, {}, b""
+
+        response_headers = {
+            "Content-Type": payload.content_type,
+            "ETag": payload.etag,
+            "Cache-Control": CACHE_CONTROL[kind],
+            "Vary": "Accept-Encoding"
+        }
+        if etag_matches(headers.get("if-none-match"), payload.etag):
+            return 304, response_headers, b""
+        encoding, body = payload.select(headers.get("accept-encoding", ""))
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+        return 200, response_headers, body
+
+    # 연결 하나: HTTP/1.1 keep-alive로 요청을 차례로 처리한다
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                        ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                request_line = lines[0].split()
+                if len(request_line) != 3:
+                    await self.write_response(writer, "GET", 400, {}, b"", False)
+                    break
+                method, target, version = request_line
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                # 본문이 있는 요청(POST 등)은 읽어서 버린다, 길이를 알 수 없으면 400으로 끊는다
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.write_response(writer, method, 400, {}, b"", False)
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                status, response_headers, body = await self.respond(method, target, headers)
+                await self.write_response(writer, method, status, response_headers, body, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def write_response(self, writer, method, status, headers, body, keep_alive):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                 f"Date: {formatdate(usegmt=True)}",
+                 "Server: burgercalc-api",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if status != 304:
+            lines.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD" and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+    # 시작할 때 최신 월의 집계와 매장 조각을 미리 읽어 압축해 둔다
+    async def warm(self, month=None):
+        months = self.months()
+        month = month or (months[-1] if months else None)
+        if month is None:
+            return 0
+        agg_dir = os.path.join(self.data_root, month, AGG_DIR)
+        paths = [os.path.join(agg_dir, "regions.json")]
+        shard_dir = os.path.join(agg_dir, "stores")
+        if os.path.isdir(shard_dir):
+            paths += [os.path.join(shard_dir, name) for name in os.listdir(shard_dir) if name.endswith(".json")]
+        for path in paths:
+            await self.file_payload(path)
+        return len(paths)
+
+async def serve(host, port, data_root=DATA_ROOT, site_root=SITE_ROOT, cache_bytes=CACHE_BYTES, warm=True):
+    api = ApiServer(data_root, site_root, cache_bytes)
+    if warm:
+        count = await api.warm()
+        print(f"Warmed {count} payloads ({api.cache.bytes / 1024:.1f} KB cached, "
+              f"brotli {'on' if brotli is not None else 'off'})")
+    server = await asyncio.start_server(api.handle, host, port, limit=MAX_HEADER)
+    print(f"Serving {api.data_root} on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="data/ 스냅샷을 캐시/압축해서 제공하는 로컬 API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-root", default=DATA_ROOT)
+    parser.add_argument("--site-root", default=SITE_ROOT, help="정적 파일 폴더 (index.html, script.js)")
+    parser.add_argument("--cache-mb", type=int, default=CACHE_BYTES // (1024 * 1024))
+    parser.add_argument("--no-warm", action="store_true", help="시작할 때 최신 월 집계를 미리 읽지 않음")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.data_root, args.site_root,
+                          args.cache_mb * 1024 * 1024, not args.no_warm))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
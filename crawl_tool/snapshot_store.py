@@ -0,0 +1,286 @@
+import os
+import sys
+import csv
+import json
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime
+from build_aggregates import BRANDS, DATA_ROOT, read_csv, region_key, to_float
+
+DB_FILE = os.path.join(DATA_ROOT, "snapshots.sqlite")
+
+# index.html 기본 선택과 같은 버거지수 분자/분모
+NUMERATOR = ["bgk", "kfc", "mcdonalds", "subway"]
+DENOMINATOR = ["issac", "lotteria", "momstouch"]
+
+# brand/prov/area는 사전 테이블의 정수 id로 저장하고, 월별 매장 수는 (brand, sig_cd, month) 색인으로 조회
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS brands (id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS provinces (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS areas (
+    id INTEGER PRIMARY KEY,
+    prov_id INTEGER NOT NULL REFERENCES provinces(id),
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    sig_cd TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS months (
+    id INTEGER PRIMARY KEY,
+    month TEXT NOT NULL UNIQUE,
+    source_hash TEXT NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS region_stats (
+    month_id INTEGER NOT NULL REFERENCES months(id),
+    area_id INTEGER NOT NULL REFERENCES areas(id),
+    people REAL,
+    land REAL,
+    PRIMARY KEY (month_id, area_id)
+);
+CREATE TABLE IF NOT EXISTS counts (
+    brand_id INTEGER NOT NULL REFERENCES brands(id),
+    sig_cd TEXT NOT NULL,
+    month_id INTEGER NOT NULL REFERENCES months(id),
+    area_id INTEGER NOT NULL REFERENCES areas(id),
+    stores INTEGER NOT NULL,
+    PRIMARY KEY (brand_id, sig_cd, month_id, area_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS counts_area_month ON counts (area_id, month_id);
+CREATE INDEX IF NOT EXISTS counts_month ON counts (month_id);
+CREATE TABLE IF NOT EXISTS stores (
+    month_id INTEGER NOT NULL REFERENCES months(id),
+    brand_id INTEGER NOT NULL REFERENCES brands(id),
+    area_id INTEGER REFERENCES areas(id),
+    name TEXT NOT NULL,
+    addr TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stores_brand_area_month ON stores (brand_id, area_id, month_id);
+CREATE INDEX IF NOT EXISTS stores_month ON stores (month_id);
+"""
+
+def connect(db_file=DB_FILE):
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+# 사전 테이블에서 id를 찾고 없으면 추가
+def dictionary_id(conn, table, column, value):
+    row = conn.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()
+    if row:
+        return row[0]
+    return conn.execute(f"INSERT INTO {table} ({column}) VALUES (?)", (value,)).lastrowid
+
+# 지역 키(script.js constructKey와 같은 "prov area")로 areas id를 찾고 없으면 추가
+def area_id(conn, prov, area, sig_cd=""):
+    key = region_key(prov, area)
+    row = conn.execute("SELECT id, sig_cd FROM areas WHERE key = ?", (key,)).fetchone()
+    if row:
+        if sig_cd and not row[1]:
+            conn.execute("UPDATE areas SET sig_cd = ? WHERE id = ?", (sig_cd, row[0]))
+        return row[0]
+    prov_id = dictionary_id(conn, "provinces", "name", prov)
+    return conn.execute("INSERT INTO areas (prov_id, key, name, sig_cd) VALUES (?, ?, ?, ?)",
+                        (prov_id, key, area, sig_cd)).lastrowid
+
+def month_files(month_dir):
+    names = ["hu.csv"] + [f"{brand}.csv" for brand in BRANDS]
+    return [os.path.join(month_dir, name) for name in names if os.path.exists(os.path.join(month_dir, name))]
+
+def source_hash(files):
+    sha1 = hashlib.sha1()
+    for file_path in files:
+        sha1.update(os.path.basename(file_path).encode("utf-8"))
+        with open(file_path, mode="rb") as file:
+            sha1.update(file.read())
+    return sha1.hexdigest()
+
+def delete_month(conn, month_id):
+    for table in ("counts", "stores", "region_stats"):
+        conn.execute(f"DELETE FROM {table} WHERE month_id = ?", (month_id,))
+    conn.execute("DELETE FROM months WHERE id = ?", (month_id,))
+
+# data/<월>/ 폴더 하나를 적재, 같은 내용이 이미 들어 있으면 건너뛴다
+def ingest_month(conn, month_dir, force=False):
+    month = os.path.basename(os.path.normpath(month_dir))
+    files = month_files(month_dir)
+    if not files:
+        return "empty"
+    digest = source_hash(files)
+    existing = conn.execute("SELECT id, source_hash FROM months WHERE month = ?", (month,)).fetchone()
+    if existing and existing[1] == digest and not force:
+        return "unchanged"
+
+    with conn:
+        if existing:
+            delete_month(conn, existing[0])
+        month_id = conn.execute("INSERT INTO months (month, source_hash, ingested_at) VALUES (?, ?, ?)",
+                                (month, digest, datetime.now().isoformat(timespec="seconds"))).lastrowid
+
+        for row in read_csv(os.path.join(month_dir, "hu.csv")):
+            region = area_id(conn, row["prov"], row["area"], row.get("sig_cd", ""))
+            conn.execute("INSERT OR REPLACE INTO region_stats VALUES (?, ?, ?, ?)",
+                         (month_id, region, to_float(row.get("people")), to_float(row.get("land"))))
+
+        areas = {}
+        for brand in BRANDS:
+            rows = read_csv(os.path.join(month_dir, f"{brand}.csv"))
+            if not rows:
+                continue
+            brand_id = dictionary_id(conn, "brands", "code", brand)
+            counts = {}
+            store_rows = []
+            for row in rows:
+                prov, area = row.get("prov", ""), row.get("area", "")
+                key = (prov, area)
+                if key not in areas:
+                    areas[key] = area_id(conn, prov, area) if prov or area else None
+                region = areas[key]
+                store_rows.append((month_id, brand_id, region, row.get("store", ""), row.get("addr", "")))
+                if region is not None:
+                    counts[region] = counts.get(region, 0) + 1
+            conn.executemany("INSERT INTO stores VALUES (?, ?, ?, ?, ?)", store_rows)
+            sig_cds = dict(conn.execute("SELECT id, sig_cd FROM areas"))
+            conn.executemany("INSERT INTO counts VALUES (?, ?, ?, ?, ?)",
+                             [(brand_id, sig_cds[region], month_id, region, count) for region, count in counts.items()])
+    return "ingested"
+
+def ingest(conn, data_root=DATA_ROOT, months=None, force=False):
+    months = months or sorted(name for name in os.listdir(data_root)
+                              if os.path.isdir(os.path.join(data_root, name)) and month_files(os.path.join(data_root, name)))
+    return {month: ingest_month(conn, os.path.join(data_root, month), force) for month in months}
+
+# "서울 강남구" 또는 "11680" -> areas id 목록 (시 단위 이름이면 하위 구 전체)
+def find_areas(conn, region):
+    if region.isdigit():
+        return [row[0] for row in conn.execute("SELECT id FROM areas WHERE sig_cd = ?", (region,))]
+    prov, _, area = region.partition(" ")
+    key = region_key(prov, area) if area else None
+    rows = conn.execute("SELECT id FROM areas WHERE key = ?", (key,)).fetchall() if key else []
+    if rows:
+        return [row[0] for row in rows]
+    # "경기 수원시"처럼 구를 합친 이름이면 접두사로 찾는다
+    return [row[0] for row in conn.execute("SELECT id FROM areas WHERE key LIKE ?", (f"{region.replace(' ', '%')}%",))]
+
+def ratio(counts, numerator, denominator):
+    top = sum(counts.get(brand, 0) for brand in numerator)
+    bottom = sum(counts.get(brand, 0) for brand in denominator)
+    return top / bottom if bottom else None
+
+# 지역의 월별 브랜드 매장 수, 버거지수, 인구
+def trend(conn, region, numerator=NUMERATOR, denominator=DENOMINATOR):
+    ids = find_areas(conn, region)
+    if not ids:
+        raise Exception(f"Unknown region: {region}")
+    marks = ",".join("?" * len(ids))
+    result = {month: {"month": month, "counts": {}, "people": None}
+              for (month,) in conn.execute("SELECT month FROM months ORDER BY month")}
+    for month, brand, stores in conn.execute(f"""
+            SELECT m.month, b.code, SUM(c.stores) FROM counts c
+            JOIN months m ON m.id = c.month_id JOIN brands b ON b.id = c.brand_id
+            WHERE c.area_id IN ({marks}) GROUP BY m.month, b.code""", ids):
+        result[month]["counts"][brand] = stores
+    for month, people in conn.execute(f"""
+            SELECT m.month, SUM(s.people) FROM region_stats s JOIN months m ON m.id = s.month_id
+            WHERE s.area_id IN ({marks}) GROUP BY m.month""", ids):
+        result[month]["people"] = people
+    for entry in result.values():
+        entry["ratio"] = ratio(entry["counts"], numerator, denominator)
+    return list(result.values())
+
+# 두 달 사이 지역별 매장 수 변화 [(prov, area, brand, before, after)]
+def diff(conn, month_a, month_b, brand=None, prov=None):
+    query = """
+        SELECT p.name, a.name, b.code,
+               SUM(CASE WHEN m.month = ? THEN c.stores ELSE 0 END) AS before,
+               SUM(CASE WHEN m.month = ? THEN c.stores ELSE 0 END) AS after
+        FROM counts c
+        JOIN months m ON m.id = c.month_id JOIN brands b ON b.id = c.brand_id
+        JOIN areas a ON a.id = c.area_id JOIN provinces p ON p.id = a.prov_id
+        WHERE m.month IN (?, ?)"""
+    params = [month_a, month_b, month_a, month_b]
+    if brand:
+        query += " AND b.code = ?"
+        params.append(brand)
+    if prov:
+        query += " AND p.name = ?"
+        params.append(prov)
+    query += " GROUP BY c.area_id, c.brand_id HAVING before != after ORDER BY p.name, a.name, b.code"
+    return conn.execute(query, params).fetchall()
+
+# 두 달 사이 추가/삭제된 매장 (상호명+주소 기준)
+def store_diff(conn, month_a, month_b, brand, region=None):
+    query = """
+        SELECT m.month, s.name, s.addr FROM stores s
+        JOIN months m ON m.id = s.month_id JOIN brands b ON b.id = s.brand_id
+        WHERE b.code = ? AND m.month IN (?, ?)"""
+    params = [brand, month_a, month_b]
+    if region:
+        ids = find_areas(conn, region)
+        query += f" AND s.area_id IN ({','.join('?' * len(ids))})"
+        params.extend(ids)
+    stores = {month_a: set(), month_b: set()}
+    for month, name, addr in conn.execute(query, params):
+        stores[month].add((name, addr))
+    return sorted(stores[month_b] - stores[month_a]), sorted(stores[month_a] - stores[month_b])
+
+def main():
+    parser = argparse.ArgumentParser(description="월별 매장 스냅샷을 SQLite에 적재하고 추이/변화를 조회합니다.")
+    parser.add_argument("--db", default=DB_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = sub.add_parser("ingest", help="data/<월>/ 폴더 적재 (이미 같은 내용이면 건너뜀)")
+    ingest_parser.add_argument("months", nargs="*")
+    ingest_parser.add_argument("--data-root", default=DATA_ROOT)
+    ingest_parser.add_argument("--force", action="store_true")
+
+    sub.add_parser("months", help="적재된 월 목록")
+
+    trend_parser = sub.add_parser("trend", help="지역의 월별 매장 수와 버거지수")
+    trend_parser.add_argument("region", help='"서울 강남구" 또는 시군구코드')
+    trend_parser.add_argument("--num", nargs="+", default=NUMERATOR)
+    trend_parser.add_argument("--den", nargs="+", default=DENOMINATOR)
+    trend_parser.add_argument("--json", action="store_true")
+
+    diff_parser = sub.add_parser("diff", help="두 달 사이 변화")
+    diff_parser.add_argument("month_a")
+    diff_parser.add_argument("month_b")
+    diff_parser.add_argument("--brand", default=None)
+    diff_parser.add_argument("--prov", default=None)
+    diff_parser.add_argument("--stores", default=None, metavar="REGION",
+                             help="지역의 추가/삭제 매장 목록 출력 (--brand 필요)")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == "ingest":
+        for month, status in ingest(conn, args.data_root, args.months, args.force).items():
+            print(f"{month}: {status}")
+    elif args.command == "months":
+        for month, ingested_at in conn.execute("SELECT month, ingested_at FROM months ORDER BY month"):
+            print(f"{month} (ingested {ingested_at})")
+    elif args.command == "trend":
+        rows = trend(conn, args.region, args.num, args.den)
+        if args.json:
+            print(json.dumps(rows, ensure_ascii=False, indent=2))
+            return
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["month"] + BRANDS + ["people", "ratio"])
+        for row in rows:
+            writer.writerow([row["month"]] + [row["counts"].get(brand, 0) for brand in BRANDS]
+                            + [row["people"], "" if row["ratio"] is None else f"{row['ratio']:.3f}"])
+    elif args.command == "diff":
+        if args.stores:
+            if not args.brand:
+                parser.error("--stores requires --brand")
+            added, removed = store_diff(conn, args.month_a, args.month_b, args.brand, args.stores)
+            for name, addr in added:
+                print(f"+ {name}, {addr}")
+            for name, addr in removed:
+                print(f"- {name}, {addr}")
+            return
+        for prov, area, brand, before, after in diff(conn, args.month_a, args.month_b, args.brand, args.prov):
+            print(f"{prov} {area} {brand}: {before} -> {after} ({after - before:+d})")
+
+if __name__ == "__main__":
+    main()
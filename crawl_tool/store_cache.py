@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow가 없으면 캐시 없이 CSV를 직접 읽는다
+    pa = None
+    pq = None
+
+# 캐시 폴더 (STORE_CACHE_DIR 환경변수로 변경 가능, STORE_CACHE=0 이면 캐시 사용 안 함)
+CACHE_DIR = os.environ.get("STORE_CACHE_DIR", ".store_cache")
+CACHE_ENABLED = os.environ.get("STORE_CACHE", "1") != "0"
+# 키 방식: "stat" (경로+크기+수정시각) 또는 "hash" (파일 내용 SHA-1)
+CACHE_KEY_MODE = os.environ.get("STORE_CACHE_KEY", "stat")
+
+CONVERT_CHUNKSIZE = 200_000
+HASH_BLOCK = 1024 * 1024
+
+def available():
+    return CACHE_ENABLED and pq is not None
+
+# 파일 내용의 SHA-1
+def file_hash(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, mode="rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# 원본 파일의 상태 정보 (캐시 유효성 판단에 사용)
+def source_info(file_path, mode=CACHE_KEY_MODE):
+    stat = os.stat(file_path)
+    info = {
+        "path": os.path.abspath(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+    if mode == "hash":
+        info["sha1"] = file_hash(file_path)
+    return info
+
+# 캐시 키: 경로/크기/수정시각 (hash 모드이면 내용 해시)
+def cache_key(info, columns):
+    if "sha1" in info:
+        raw = f"{info['sha1']}|{','.join(columns)}"
+    else:
+        raw = f"{info['path']}|{info['size']}|{info['mtime_ns']}|{','.join(columns)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def cache_paths(key, cache_dir=CACHE_DIR):
+    base = os.path.join(cache_dir, key)
+    return base + ".parquet", base + ".json"
+
+# CSV를 chunk 단위로 읽어 Parquet로 변환 (범주형 컬럼은 dictionary 인코딩)
+def convert_csv(file_path, parquet_path, columns, dtypes):
+    schema = pa.schema([
+        (col, pa.dictionary(pa.int32(), pa.string()) if dtypes.get(col) == 'category' else pa.string())
+        for col in columns
+    ])
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    rows = 0
+    reader = pd.read_csv(file_path, encoding='utf-8', usecols=columns,
+                         dtype={col: dtypes.get(col, str) for col in columns},
+                         chunksize=CONVERT_CHUNKSIZE)
+    try:
+        with reader, pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            for chunk in reader:
+                table = pa.Table.from_pandas(chunk[columns], preserve_index=False).cast(schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        # 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 다 쓴 뒤에 이름을 바꾼다
+        os.replace(tmp_path, parquet_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return rows
+
+# 캐시 파일 경로를 반환 (없으면 생성)
+def ensure_cached(file_path, columns, dtypes, cache_dir=CACHE_DIR):
+    info = source_info(file_path)
+    key = cache_key(info, columns)
+    parquet_path, meta_path = cache_paths(key, cache_dir)
+
+    if not os.path.exists(parquet_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        print(f"Building cache for {file_path}")
+        rows = convert_csv(file_path, parquet_path, columns, dtypes)
+        meta = dict(info, columns=list(columns), rows=rows, created=time.time())
+        with open(meta_path, mode="w", encoding="utf-8") as file:
+            json.dump(meta, file, ensure_ascii=False)
+    else:
+        os.utime(meta_path if os.path.exists(meta_path) else parquet_path)  # 마지막 사용 시각 갱신
+    return parquet_path
+
+# 캐시를 메모리 맵으로 열어 chunk 단위로 읽는 제너레이터
+def iter_cached_chunks(file_path, columns, dtypes, chunksize, cache_columns=None, cache_dir=CACHE_DIR):
+    cache_columns = cache_columns or columns
+    parquet_path = ensure_cached(file_path, cache_columns, dtypes, cache_dir)
+    parquet_file = pq.ParquetFile(parquet_path, memory_map=True)
+    for batch in parquet_file.iter_batches(batch_size=chunksize, columns=list(columns)):
+        yield batch.to_pandas()
+
+# 캐시 항목 목록 [(meta, parquet_path, meta_path)]
+def list_entries(cache_dir=CACHE_DIR):
+    entries = []
+    if not os.path.isdir(cache_dir):
+        return entries
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".parquet"):
+            continue
+        parquet_path, meta_path = cache_paths(name[:-len(".parquet")], cache_dir)
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, mode="r", encoding="utf-8") as file:
+                meta = json.load(file)
+        entries.append((meta, parquet_path, meta_path))
+    return entries
+
+# 원본이 사라졌거나 바뀐 캐시인지 확인
+def is_stale(meta):
+    path = meta.get("path")
+    if not path or not os.path.exists(path):
+        return True
+    stat = os.stat(path)
+    if "sha1" in meta:
+        return stat.st_size != meta.get("size")
+    return stat.st_size != meta.get("size") or stat.st_mtime_ns != meta.get("mtime_ns")
+
+def _remove(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+# 캐시 정리: 오래된/원본이 바뀐 항목 삭제, max_bytes를 넘으면 오래 안 쓴 항목부터 삭제
+def clean(cache_dir=CACHE_DIR, remove_all=False, older_than_days=None, max_bytes=None):
+    removed = 0
+    now = time.time()
+    survivors = []
+    for meta, parquet_path, meta_path in list_entries(cache_dir):
+        last_used = os.path.getmtime(meta_path if os.path.exists(meta_path) else parquet_path)
+        expired = older_than_days is not None and now - last_used > older_than_days * 86400
+        if remove_all or expired or is_stale(meta):
+            _remove(parquet_path, meta_path)
+            removed += 1
+        else:
+            survivors.append((last_used, os.path.getsize(parquet_path), parquet_path, meta_path))
+
+    if max_bytes is not None:
+        survivors.sort()  # 오래 안 쓴 순서
+        total = sum(size for _, size, _, _ in survivors)
+        for _, size, parquet_path, meta_path in survivors:
+            if total <= max_bytes:
+                break
+            _remove(parquet_path, meta_path)
+            total -= size
+            removed += 1
+    return removed
+
+def main():
+    # 메모리 크기 해석은 store_reader와 동일한 규칙을 사용
+    from store_reader import parse_memory
+
+    parser = argparse.ArgumentParser(description="상가정보 Parquet 캐시 관리")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="캐시 항목 출력")
+    clean_parser = sub.add_parser("clean", help="오래되었거나 원본이 바뀐 캐시 삭제")
+    clean_parser.add_argument("--all", action="store_true", help="모든 캐시 삭제")
+    clean_parser.add_argument("--older-than", type=float, default=None, help="N일 이상 사용하지 않은 캐시 삭제")
+    clean_parser.add_argument("--max-size", default=None, help="캐시 전체 크기 한도 (예: 5G)")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for meta, parquet_path, _ in list_entries(args.cache_dir):
+            size_mb = os.path.getsize(parquet_path) / 1024 / 1024
+            state = "stale" if is_stale(meta) else "ok"
+            print(f"{size_mb:8.1f} MB  {meta.get('rows', '?'):>9} rows  {state:5}  {meta.get('path', parquet_path)}")
+    else:
+        max_bytes = parse_memory(args.max_size) if args.max_size else None
+        removed = clean(args.cache_dir, args.all, args.older_than, max_bytes)
+        print(f"Removed {removed} cache entries from {args.cache_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import pandas as pd
+import store_cache
+import instrument
+
+# 상가정보 파일에서 실제로 사용하는 컬럼과 타입
+STORE_COLUMNS = ['상호명', '도로명주소', '시도명', '시군구명', '행정동명']
+STORE_DTYPES = {
+    '상호명': str,
+    '도로명주소': str,
+    '시도명': 'category',
+    '시군구명': 'category',
+    '행정동명': 'category'
+}
+
+DEFAULT_CHUNKSIZE = 200_000
+MIN_CHUNKSIZE = 1_000
+# 원본 한 줄 크기 대비 DataFrame으로 읽었을 때의 메모리 배율 (파서 버퍼 포함, 보수적으로 잡음)
+MEMORY_OVERHEAD = 4
+SAMPLE_LINES = 1_000
+
+# "512M", "2G", "1500" (MB) 형태의 메모리 크기를 바이트로 변환
+def parse_memory(text):
+    text = str(text).strip().upper().rstrip("B")
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text) * units["M"])
+
+# 파일 앞부분을 읽어 한 줄 평균 바이트 수를 추정
+def estimate_row_bytes(file_path, sample_lines=SAMPLE_LINES):
+    total = 0
+    count = 0
+    with open(file_path, mode='rb') as file:
+        file.readline()  # 헤더
+        for line in file:
+            total += len(line)
+            count += 1
+            if count >= sample_lines:
+                break
+    return total / count if count else 1
+
+# 메모리 한도(바이트)를 지키는 chunksize 계산
+def chunksize_for_memory(file_path, max_memory, workers=1):
+    if not max_memory:
+        return DEFAULT_CHUNKSIZE
+    budget = max_memory / max(workers, 1)
+    row_bytes = estimate_row_bytes(file_path) * MEMORY_OVERHEAD
+    return max(MIN_CHUNKSIZE, int(budget // row_bytes))
+
+# 필요한 컬럼만 chunk 단위로 읽어서 돌려주는 제너레이터
+# 캐시를 쓸 수 있으면 Parquet 캐시(store_cache)를 거쳐서 읽는다
+# 읽은 행 수는 현재 단계(instrument)의 rows_in에 더해진다
+def iter_chunks(file_path, columns=STORE_COLUMNS, chunksize=DEFAULT_CHUNKSIZE, use_cache=True):
+    if use_cache and store_cache.available() and set(columns) <= set(STORE_COLUMNS):
+        for chunk in store_cache.iter_cached_chunks(file_path, columns, STORE_DTYPES, chunksize,
+                                                    cache_columns=STORE_COLUMNS):
+            instrument.count_rows_in(len(chunk))
+            yield chunk
+        return
+
+    dtypes = {col: STORE_DTYPES.get(col, str) for col in columns}
+    reader = pd.read_csv(file_path, encoding='utf-8', usecols=columns,
+                         dtype=dtypes, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            instrument.count_rows_in(len(chunk))
+            yield chunk[columns]
+
+# 상호명에 pattern이 포함된 행만 모아서 반환
+def filter_contains(file_path, pattern, column='상호명', columns=STORE_COLUMNS,
+                    chunksize=DEFAULT_CHUNKSIZE, regex=False):
+    parts = []
+    for chunk in iter_chunks(file_path, columns, chunksize):
+        mask = chunk[column].str.contains(pattern, na=False, regex=regex)
+        if mask.any():
+            parts.append(chunk[mask].astype(object))
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(parts, ignore_index=True)
+
+# columns 조합의 고유값만 모아서 반환 (transform으로 chunk마다 가공 가능)
+# chunk마다 중복을 뺀 결과만 모아 두었다가 마지막에 한 번 합쳐서 다시 중복을 뺀다
+# 메모리 사용량은 파일 크기가 아니라 chunk별 고유값 개수의 합에 비례한다
+def unique_rows(file_path, columns, chunksize=DEFAULT_CHUNKSIZE, transform=None):
+    parts = []
+    for chunk in iter_chunks(file_path, columns, chunksize):
+        chunk = chunk.astype(object)
+        if transform is not None:
+            chunk = transform(chunk)
+        parts.append(chunk.drop_duplicates())
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(parts, ignore_index=True).drop_duplicates().reset_index(drop=True)
@@ -0,0 +1,67 @@
+import os
+import json
+import argparse
+from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 저장해 둔 응답을 재생하는 로컬 테스트 서버
+# 예) python subway.py --record responses  (실제 사이트 응답 저장)
+#     python stub_server.py responses --port 8765
+#     python subway.py --url http://127.0.0.1:8765/ajaxStoreSearch
+EMPTY_RESPONSE = {"searchResult": []}
+
+def make_handler(response_dir, key_field, fail_every=0):
+    state = {"count": 0}
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            key = form.get(key_field, [""])[0]
+
+            # fail_every > 0 이면 N번째 요청마다 503을 돌려주어 재시도 동작을 확인할 수 있다
+            state["count"] += 1
+            if fail_every and state["count"] % fail_every == 0:
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            path = os.path.join(response_dir, f"{key}.json")
+            if os.path.exists(path):
+                with open(path, mode="rb") as file:
+                    body = file.read()
+            else:
+                body = json.dumps(EMPTY_RESPONSE).encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 응답을 재생하는 stub HTTP 서버")
+    parser.add_argument("response_dir", help="<검색어>.json 파일이 있는 폴더")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--key-field", default="keyword", help="응답 파일을 고를 때 쓰는 폼 필드")
+    parser.add_argument("--fail-every", type=int, default=0, help="N번째 요청마다 503 응답")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port),
+                                 make_handler(args.response_dir, args.key_field, args.fail_every))
+    print(f"Serving {args.response_dir} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
-import requests
-import json
+import os
 import csv
+import json
+import asyncio
+import argparse
+import requests
+from crawler_core import StoreRecord, make_session
 
 # 상수 정의
 URL = "https://www.subway.co.kr/ajaxStoreSearch"
 CSV_FILE = "subway_stores.csv"
+BRAND = "subway"
 KOREAN_REGIONS = [
     "가평", "강릉", "강진", "거제", "거창", "계룡", "고령", "고성", "고성", "고양",
     "고흥", "곡성", "공주", "광명", "광양", "광주", "광주", "구례", "구리", "구미",
@@ -26,19 +31,32 @@ HEADERS = {
     "Content-Type": "application/x-www-form-urlencoded"
 }
 
-def fetch_store_data(region):
+# 동시 요청 수, 초당 요청 수 제한, 재시도 설정
+CONCURRENCY = 8
+RATE_LIMIT = 10  # 초당 최대 요청 수
+MAX_RETRIES = 3
+BACKOFF = 0.5  # 재시도 대기 시간(초), 시도마다 2배씩 증가
+TIMEOUT = 10
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# 겹치는 검색어 제거 (순서 유지)
+def unique_keywords(regions):
+    return list(dict.fromkeys(regions))
+
+def make_payload(region):
     pagination = {
         "pageNo": 1,
         "itemCountPerPage": 1000,
         "displayPageNoCount": 1000
     }
-    payload = {
+    return {
         "keyword": region,
         "page": pagination["pageNo"],
         "pagination": json.dumps(pagination)
     }
 
-    response = requests.post(URL, data=payload, headers=HEADERS)
+def fetch_store_data(region, session=requests, url=URL):
+    response = session.post(url, data=make_payload(region), headers=HEADERS, timeout=TIMEOUT)
     if response.status_code != 200:
         raise Exception(f"Failed to fetch data for region {region}: {response.status_code}")
     return response.json()
@@ -55,6 +73,91 @@ def extract_store_info(data):
         ])
     return store_data
 
+# 여러 검색어에 같은 매장이 나오므로 storCd 기준으로 중복 제거
+def dedup_stores(store_info):
+    seen = set()
+    unique = []
+    for store in store_info:
+        key = store[3] or (store[0], store[1])
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(store)
+    return unique
+
+# 요청 시작 간격을 일정하게 유지하는 호스트 단위 속도 제한
+class RateLimiter:
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_time = 0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self.next_time > now:
+                await asyncio.sleep(self.next_time - now)
+                now = self.next_time
+            self.next_time = now + self.interval
+
+# 실패하면 지수 백오프로 재시도하면서 한 검색어를 요청
+async def fetch_with_retry(region, session, url, semaphore, limiter):
+    async with semaphore:
+        for attempt in range(MAX_RETRIES + 1):
+            await limiter.wait()
+            try:
+                response = await asyncio.to_thread(
+                    session.post, url, data=make_payload(region), headers=HEADERS, timeout=TIMEOUT
+                )
+                if response.status_code == 200:
+                    return region, response.json()
+                if response.status_code not in RETRY_STATUS:
+                    raise Exception(f"Failed to fetch data for region {region}: {response.status_code}")
+                error = Exception(f"Failed to fetch data for region {region}: {response.status_code}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(BACKOFF * 2 ** attempt)
+        raise error
+
+# 모든 검색어를 동시에 요청하고, 검색어 순서대로 결과를 반환
+# session을 넘기지 않으면 동시 요청 수만큼 연결을 유지하는 세션을 새로 만든다
+# (재시도는 여기서 직접 처리하므로 세션 자체의 재시도는 끈다)
+async def fetch_all(regions, url=URL, concurrency=CONCURRENCY, rate=RATE_LIMIT, record_dir=None, session=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=concurrency, retries=0)
+    try:
+        tasks = [fetch_with_retry(region, session, url, semaphore, limiter) for region in regions]
+        results = await asyncio.gather(*tasks)
+    finally:
+        if own_session:
+            session.close()
+
+    if record_dir:
+        save_responses(results, record_dir)
+    return results
+
+# 응답을 검색어별 JSON으로 저장 (stub_server.py에서 재생할 때 사용)
+def save_responses(results, record_dir):
+    os.makedirs(record_dir, exist_ok=True)
+    for region, data in results:
+        with open(os.path.join(record_dir, f"{region}.json"), mode="w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+
+# 공통 러너(crawl_all.py)에서 사용하는 플러그인 진입점
+# client의 세션은 urllib3 재시도가 켜져 있어 fetch_with_retry와 겹치므로, fetch_all이 재시도를 끈 세션을 만들게 한다
+def iter_records(client):
+    results = asyncio.run(fetch_all(unique_keywords(KOREAN_REGIONS)))
+    all_store_info = []
+    for _, data in results:
+        all_store_info.extend(extract_store_info(data))
+    for name, addr1, _, store_cd in dedup_stores(all_store_info):
+        yield StoreRecord(BRAND, name, addr1, store_cd)
+
 def save_to_csv(store_info):
     with open(CSV_FILE, mode="w", encoding="utf-8-sig", newline="") as file:
         writer = csv.writer(file)
@@ -63,14 +166,23 @@ def save_to_csv(store_info):
             writer.writerow(store)
 
 def main():
-    all_store_info = []
+    parser = argparse.ArgumentParser(description="써브웨이 매장 목록 수집")
+    parser.add_argument("--url", default=URL, help="요청 주소 (로컬 stub 서버 테스트용)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=RATE_LIMIT, help="초당 최대 요청 수")
+    parser.add_argument("--record", default=None, help="응답을 저장할 폴더")
+    args = parser.parse_args()
 
-    for region in KOREAN_REGIONS:
-        data = fetch_store_data(region)
-        store_info = extract_store_info(data)
-        all_store_info.extend(store_info)
+    regions = unique_keywords(KOREAN_REGIONS)
+    results = asyncio.run(fetch_all(regions, args.url, args.concurrency, args.rate, args.record))
+
+    all_store_info = []
+    for _, data in results:
+        all_store_info.extend(extract_store_info(data))
 
-    save_to_csv(all_store_info)
+    store_info = dedup_stores(all_store_info)
+    save_to_csv(store_info)
+    print(f"{len(all_store_info)} results, {len(store_info)} unique stores")
     print(f"Data saved to {CSV_FILE}")
 
 if __name__ == "__main__":
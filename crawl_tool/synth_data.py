@@ -0,0 +1,201 @@
+import os
+import csv
+import json
+import random
+import argparse
+from itertools import accumulate
+from region_names import PROVINCE_ALIASES, expand_area
+
+DATA_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+HU_FILE = os.path.join(DATA_ROOT, "2024-12", "hu.csv")
+SIG_TABLE_FILE = os.path.join(DATA_ROOT, "2024-12", "extracted_sig_data.csv")
+
+# 크기 이름 -> 상가정보 행 수
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# 상가정보 CSV 컬럼 (실제 파일과 같은 순서, 파이프라인이 읽지 않는 컬럼도 포함)
+STORE_INFO_COLUMNS = [
+    "상가업소번호", "상호명", "지점명", "상권업종대분류코드", "상권업종대분류명", "상권업종중분류코드",
+    "상권업종중분류명", "상권업종소분류코드", "상권업종소분류명", "표준산업분류코드", "표준산업분류명",
+    "시도코드", "시도명", "시군구코드", "시군구명", "행정동코드", "행정동명", "법정동코드", "법정동명",
+    "지번코드", "대지구분코드", "대지구분명", "지번본번지", "지번부번지", "지번주소", "도로명코드",
+    "도로명", "건물본번지", "건물부번지", "건물관리번호", "건물명", "도로명주소", "구우편번호",
+    "신우편번호", "동정보", "층정보", "호정보", "경도", "위도"
+]
+BRAND_COLUMNS = ["store", "addr", "prov", "area", "div"]
+
+# 업종 (대분류, 중분류, 소분류)
+CATEGORIES = [
+    ("음식", "한식", "백반/한정식"), ("음식", "한식", "국수/만두/칼국수"), ("음식", "분식", "김밥/만두/분식"),
+    ("음식", "패스트푸드", "버거"), ("음식", "패스트푸드", "토스트/샌드위치/샐러드"), ("음식", "카페", "카페"),
+    ("소매", "종합 소매", "편의점"), ("소매", "식료품 소매", "정육점"), ("수리·개인", "이용·미용", "미용실"),
+    ("교육", "일반 교육", "입시·교과학원"), ("보건의료", "의원", "치과의원"), ("부동산", "부동산 서비스", "부동산 중개/대리업")
+]
+STORE_WORDS = ["행복", "우리", "한솔", "미소", "으뜸", "새봄", "소망", "하나", "푸른", "다온", "온새미", "가온",
+               "별빛", "해오름", "바른", "참좋은", "큰길", "동네", "골목", "정직한"]
+STORE_KINDS = ["식당", "분식", "김밥", "카페", "마트", "미용실", "학원", "치과", "부동산", "편의점", "정육점", "국수"]
+FRANCHISES = ["이삭토스트", "맘스터치", "롯데리아", "버거킹", "맥도날드", "써브웨이", "KFC"]
+FRANCHISE_RATE = 0.01  # 프랜차이즈 매장 비율 (그중 이삭토스트가 가장 많음)
+ROAD_SYLLABLES = "가경고광구남내대덕도동두망명문미봉부북사산상서석성송수신아안양연영오옥용원월유은일장정중진창천청평포학한해화효희"
+DONG_SUFFIX = ["동", "1동", "2동", "3동", "읍", "면"]
+
+# 시도 약칭 -> 상가정보에 쓰이는 정식 명칭 (PROVINCE_ALIASES의 첫 번째 표기)
+FULL_PROVINCE = {short: names[0] for short, names in PROVINCE_ALIASES.items()}
+
+# 시군구 목록 [(시도 약칭, 시군구명, 시군구코드, 인구)], 인구 비례로 매장을 배치한다
+def load_districts(hu_file=HU_FILE, sig_table_file=SIG_TABLE_FILE):
+    codes = {}
+    with open(sig_table_file, mode="r", encoding="utf-8-sig", newline="") as file:
+        for row in csv.DictReader(file):
+            if row.get("SIG_CD"):
+                codes[(row["prov"], "".join(row["SIG_KOR_NM"].split()))] = row["SIG_CD"]
+    districts = []
+    with open(hu_file, mode="r", encoding="utf-8-sig", newline="") as file:
+        for row in csv.DictReader(file):
+            # "수원시장안구" -> "수원시 장안구" (상가정보 시군구명 표기)
+            area = expand_area(row["prov"], row["area"])
+            code = row.get("sig_cd") or codes.get((row["prov"], "".join(area.split())), "")
+            districts.append((row["prov"], area, code, float(row.get("people") or 1)))
+    return districts
+
+class Generator:
+    def __init__(self, seed=0, districts=None):
+        self.rng = random.Random(seed)
+        self.districts = districts or load_districts()
+        self.cum_weights = list(accumulate(people for *_, people in self.districts))
+        # 시군구마다 도로명, 행정동 이름을 미리 만들어 둔다
+        self.roads = {}
+        self.dongs = {}
+        for prov, area, _, _ in self.districts:
+            self.roads[(prov, area)] = [self.road_name() for _ in range(40)]
+            self.dongs[(prov, area)] = [self.word(2) + self.rng.choice(DONG_SUFFIX) for _ in range(12)]
+        self.serial = 0
+
+    def word(self, length):
+        return "".join(self.rng.choice(ROAD_SYLLABLES) for _ in range(length))
+
+    def road_name(self):
+        name = self.word(self.rng.randint(2, 3))
+        if self.rng.random() < 0.4:
+            return f"{name}로{self.rng.randint(1, 80)}길"
+        return name + self.rng.choice(["로", "대로", "길"])
+
+    def district(self):
+        return self.rng.choices(self.districts, cum_weights=self.cum_weights)[0]
+
+    def store_name(self):
+        if self.rng.random() < FRANCHISE_RATE:
+            franchise = FRANCHISES[0] if self.rng.random() < 0.4 else self.rng.choice(FRANCHISES)
+            return franchise, f"{self.word(2)}점"
+        return f"{self.rng.choice(STORE_WORDS)}{self.rng.choice(STORE_KINDS)}", ""
+
+    def road_address(self, prov, area, full_province=True):
+        road = self.rng.choice(self.roads[(prov, area)])
+        number = self.rng.randint(1, 300)
+        province = FULL_PROVINCE.get(prov, prov) if full_province else prov
+        if prov == "세종":
+            return f"{province} {road} {number}", road, number
+        return f"{province} {area} {road} {number}", road, number
+
+    # 상가정보 한 줄 -> (시도 약칭, 행)
+    def store_info_row(self):
+        prov, area, code, _ = self.district()
+        name, branch = self.store_name()
+        major, middle, minor = self.rng.choice(CATEGORIES)
+        addr, road, number = self.road_address(prov, area)
+        dong = self.rng.choice(self.dongs[(prov, area)])
+        self.serial += 1
+        lng = 126.0 + self.rng.random() * 3
+        lat = 34.5 + self.rng.random() * 3.5
+        return prov, [
+            f"MA0101{self.serial:014d}", name, branch, "I2", major, "I201", middle, "I20101", minor,
+            "I56111", minor, code[:2], FULL_PROVINCE.get(prov, prov), code, area, f"{code}51000", dong,
+            f"{code}10100", dong, "", "1", "대지", self.rng.randint(1, 999), "", f"{addr} (지번)", "",
+            f"{FULL_PROVINCE.get(prov, prov)} {area} {road}", number, "", "", "", addr, "",
+            f"{self.rng.randint(1000, 63000):05d}", "", f"{self.rng.randint(1, 5)}", "",
+            f"{lng:.6f}", f"{lat:.6f}"
+        ]
+
+    # 크롤러 결과(store,addr,prov,area,div) 한 줄, fail_rate 비율로 시군구를 틀리게 만든다
+    def brand_row(self, brand, fail_rate=0.02):
+        prov, area, _, _ = self.district()
+        addr, _, _ = self.road_address(prov, area, full_province=self.rng.random() < 0.3)
+        if self.rng.random() < fail_rate and len(area) > 1:
+            broken = list(area)
+            broken[0] = self.rng.choice(ROAD_SYLLABLES)
+            addr = addr.replace(area, "".join(broken), 1)
+        return [f"{brand} {self.word(2)}점", addr, prov, area, f"{prov} {area}"]
+
+def write_rows(file_path, header, rows):
+    with open(file_path, mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+# 상가정보 형식: 시도별 파일로 나누어 저장 (실제 배포 파일과 같은 구성)
+def generate_store_info(folder, rows, seed=0):
+    os.makedirs(folder, exist_ok=True)
+    generator = Generator(seed)
+    provinces = sorted({prov for prov, *_ in generator.districts})
+    files = {prov: open(os.path.join(folder, f"소상공인시장진흥공단_상가(상권)정보_{prov}_synthetic.csv"),
+                        mode="w", encoding="utf-8", newline="") for prov in provinces}
+    try:
+        writers = {prov: csv.writer(file) for prov, file in files.items()}
+        for writer in writers.values():
+            writer.writerow(STORE_INFO_COLUMNS)
+        for _ in range(rows):
+            prov, row = generator.store_info_row()
+            writers[prov].writerow(row)
+    finally:
+        for file in files.values():
+            file.close()
+    return folder
+
+# 크롤러 결과 형식: 브랜드별 CSV + sample.csv (filter_csv 입력)
+def generate_brand_files(folder, rows, seed=0, brands=("bgk", "kfc", "mcdonalds", "subway", "lotteria", "momstouch")):
+    os.makedirs(folder, exist_ok=True)
+    generator = Generator(seed)
+    per_brand = max(1, rows // len(brands))
+    for brand in brands:
+        write_rows(os.path.join(folder, f"{brand}.csv"), BRAND_COLUMNS,
+                   (generator.brand_row(brand) for _ in range(per_brand)))
+    write_rows(os.path.join(folder, "sample.csv"), ["시도명", "시군구명"],
+               ((FULL_PROVINCE.get(prov, prov), area) for prov, area, _, _ in generator.districts))
+    return folder
+
+# compare.py 입력: A(hu.csv 형식, rows행) + B(extracted_sig_data.csv 형식)
+def generate_compare_files(folder, rows, seed=0):
+    os.makedirs(folder, exist_ok=True)
+    generator = Generator(seed)
+    write_rows(os.path.join(folder, "extracted_sig_data.csv"), ["prov", "SIG_KOR_NM", "SIG_CD"],
+               ((prov, area, code) for prov, area, code, _ in generator.districts))
+    write_rows(os.path.join(folder, "hu.csv"), ["prov", "area", "people", "land"],
+               ((prov, area, generator.rng.randint(1000, 700000), round(generator.rng.uniform(5, 1800), 2))
+                for prov, area, _, _ in (generator.district() for _ in range(rows))))
+    return folder
+
+# 상가정보 rows행과 그 1/10 크기의 크롤러 결과/비교 파일을 output 아래에 만든다
+def generate(output, rows, seed=0):
+    generate_store_info(os.path.join(output, "store_info"), rows, seed)
+    generate_brand_files(os.path.join(output, "brands"), max(1, rows // 10), seed)
+    generate_compare_files(os.path.join(output, "compare"), max(1, rows // 10), seed)
+    with open(os.path.join(output, "synth_info.json"), mode="w", encoding="utf-8") as file:
+        json.dump({"rows": rows, "seed": seed}, file)
+    return output
+
+def parse_rows(text):
+    return SIZES.get(text.lower()) or int(text)
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 상가정보/크롤러 결과 CSV를 생성합니다.")
+    parser.add_argument("--rows", default="10k", help="상가정보 행 수 (10k, 1m, 10m 또는 숫자)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="기본: bench_data/<rows>")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join("bench_data", args.rows)
+    generate(output, parse_rows(args.rows), args.seed)
+    print(f"Synthetic data saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,45 @@
 import os
+import argparse
 import pandas as pd
 import glob
 from concurrent.futures import ThreadPoolExecutor
+from region_names import normalize_province_series
+from store_reader import unique_rows, chunksize_for_memory, parse_memory
+import instrument
 
 # 추출할 컬럼 리스트
 COLUMNS_TO_KEEP = ['시도명', '시군구명']
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)  # ThreadPoolExecutor 기본값과 동일
 
-# 지역 이름을 통일하는 함수
-def replace_location_name(name):
-    replacements = {
-        "서울": ["서울특별시", "서울", "서울시"],
-        "세종": ["세종특별자치시", "세종", "세종시"],
-        "울산": ["울산광역시", "울산", "울산시"],
-        "인천": ["인천광역시", "인천", "인천시"],
-        "전남": ["전라남도", "전남"],
-        "전북": ["전북특별자치도", "전라북도", "전북"],
-        "제주": ["제주특별자치도", "제주", "제주시"],
-        "충남": ["충청남도", "충남", "충남시"],
-        "충북": ["충청북도", "충북"],
-        "강원": ["강원특별자치도", "강원", "강원도", "강원시"],
-        "경기": ["경기도", "경기"],
-        "경남": ["경상남도", "경남"],
-        "경북": ["경상북도", "경북"],
-        "광주": ["광주광역시", "광주"],
-        "대구": ["대구광역시", "대구", "대구광역", "대구시"],
-        "대전": ["대전광역시", "대전", "대전시"],
-        "부산": ["부산광역시", "부산", "부산시"]
-    }
-
-    for key, values in replacements.items():
-        if name in values:
-            return key
-    return name
+# chunk마다 시도명을 통일하는 함수
+def normalize_chunk(df):
+    df['시도명'] = normalize_province_series(df['시도명'])
+    return df
 
 # 필터링 조건에 맞는 데이터를 처리하는 함수
-def process_csv(file_path):
-    try:
-        print(f"Processing file: {file_path}")  # 현재 처리 중인 파일 이름 출력
-        # CSV 읽기 (low_memory=False로 경고 방지)
-        df = pd.read_csv(file_path, encoding='utf-8', low_memory=False)
-
-        # 필요한 컬럼만 추출
-        df = df[COLUMNS_TO_KEEP]
-
-        # 시도명 통일화
-        df['시도명'] = df['시도명'].apply(replace_location_name)
-
-        # 중복 제거
-        df = df.drop_duplicates()
-
-        return df
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return pd.DataFrame(columns=COLUMNS_TO_KEEP)
+def process_csv(file_path, max_memory=None, workers=1):
+    with instrument.stage(f"unique_area:{os.path.basename(file_path)}") as stage:
+        try:
+            print(f"Processing file: {file_path}")  # 현재 처리 중인 파일 이름 출력
+            # 필요한 컬럼만 chunk 단위로 읽으면서 시도명 통일 후 중복 제거
+            chunksize = chunksize_for_memory(file_path, max_memory, workers)
+            result = unique_rows(file_path, COLUMNS_TO_KEEP, chunksize=chunksize, transform=normalize_chunk)
+        except Exception as e:
+            print(f"Error processing {file_path}: {e}")
+            stage.error = str(e)
+            result = pd.DataFrame(columns=COLUMNS_TO_KEEP)
+        stage.rows_out = len(result)
+        return result
 
 # 폴더 내 모든 CSV 파일 처리
-def process_all_csv(folder_path, output_file):
+def process_all_csv(folder_path, output_file, max_memory=None, max_workers=MAX_WORKERS):
     # 폴더 내 모든 CSV 파일 찾기
     csv_files = glob.glob(os.path.join(folder_path, r"*.csv"))
 
-    # 스레드 풀 생성
-    with ThreadPoolExecutor() as executor:
+    # 스레드 풀 생성 (메모리 한도는 스레드 수만큼 나눠서 사용)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # 모든 CSV 파일을 병렬로 처리
-        results = list(executor.map(process_csv, csv_files))
+        results = list(executor.map(lambda path: process_csv(path, max_memory, max_workers), csv_files))
 
     # 결과 병합
     final_df = pd.concat(results, ignore_index=True)
@@ -74,7 +51,17 @@ def process_all_csv(folder_path, output_file):
     final_df.to_csv(output_file, index=False, encoding='utf-8-sig')
     print(f"Filtered data saved to {output_file}")
 
-# 사용 예시
-folder_path = r".\소상공인시장진흥공단_상가(상권)정보_20240930"  # CSV 파일이 있는 폴더 경로
-output_file = "unique_cities_normalized.csv"  # 결과를 저장할 파일 경로
-process_all_csv(folder_path, output_file)
+def main():
+    parser = argparse.ArgumentParser(description="상가정보에서 (시도명, 시군구명) 고유 조합을 추출합니다.")
+    parser.add_argument("--folder", default=r".\소상공인시장진흥공단_상가(상권)정보_20240930",
+                        help="CSV 파일이 있는 폴더 경로")
+    parser.add_argument("--output", default="unique_cities_normalized.csv", help="결과를 저장할 파일 경로")
+    parser.add_argument("--max-memory", default=None, help="전체 메모리 한도 (예: 512M, 2G)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    max_memory = parse_memory(args.max_memory) if args.max_memory else None
+    process_all_csv(args.folder, args.output, max_memory, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,9 @@ const metropolitanCities = ['서울', '부산', '인천', '대구', '대전', '
 // 사용 가능한 날짜 목록 (데이터 폴더 구조와 연동)
 const dateList = ['2024-12'];
 
+// 지도 경계 파일 (crawl_tool/build_geometry.py로 생성, 없으면 원본 korea.geojson 사용)
+const geojsonResolution = 'medium';
+
 // 지도 배경(타일) 레이어 관련 변수
 let tileLayer;
 let labelLayerGroup; // 지도에 표시하는 라벨들을 묶어서 관리하기 위한 LayerGroup
@@ -43,6 +46,13 @@ let labelLayerGroup; // 지도에 표시하는 라벨들을 묶어서 관리하
 // (중복 fetch 방지)
 let globalGeojsonData = null;
 
+// 미리 집계된 지역별 매장 수 (data/<날짜>/agg/regions.json)
+// 파일이 없으면 null이고, 이 경우 CSV를 직접 불러와 계산한다
+let aggregateData = null;
+
+// 지역별 매장 목록 조각 캐시 ('날짜/sig_cd' -> Promise<{프랜차이즈: [[이름, 주소], ...]}>)
+const storeShardCache = new Map();
+
 
 /************************************************************
  * 초기화 관련 함수
@@ -114,6 +124,14 @@ async function loadCSV(filename) {
 async function loadData() {
     // 기존 데이터 초기화
     franchiseData = {};
+
+    // 집계 파일이 있으면 매장 CSV는 받지 않고, 인구/면적 데이터(hu)만 채운다
+    aggregateData = await loadAggregates();
+    if (aggregateData) {
+        franchiseData.hu = aggregateData.hu;
+        return;
+    }
+
     // 'hu'는 인구(human), 면적(land) 정보가 들어있는 별도 CSV
     const franchises = ['bgk', 'kfc', 'mcdonalds', 'subway', 'issac', 'lotteria', 'momstouch', 'hu'];
 
@@ -123,11 +141,78 @@ async function loadData() {
     }
 }
 
+/**
+ * 미리 집계된 지역별 매장 수(agg/regions.json)를 불러온다.
+ * 뷰(district: 구 단위, city: 'XX시 YY구'를 'XX시'로 합침)별로 key -> 지역 Map을 만들어 둔다.
+ *
+ * @returns {Object|null} 집계 데이터 (파일이 없으면 null)
+ */
+async function loadAggregates() {
+    try {
+        const response = await fetch(`data/${selectedDate}/agg/regions.json`);
+        if (!response.ok) return null;
+        const data = await response.json();
+
+        data.index = {};
+        Object.entries(data.views).forEach(([view, regions]) => {
+            regions.forEach(region => {
+                // counts 배열을 프랜차이즈 코드 -> 매장 수 객체로 변환
+                region.countMap = Object.fromEntries(data.brands.map((f, i) => [f, region.counts[i]]));
+            });
+            data.index[view] = new Map(regions.map(region => [region.key, region]));
+        });
+        return data;
+    } catch (error) {
+        console.error('Failed to load aggregates:', error);
+        return null;
+    }
+}
+
+/**
+ * 지역별 매장 목록 조각(agg/stores/<sig_cd>.json)을 불러온다. (한 번 받은 조각은 재사용)
+ *
+ * @param {string} sigCd - 조각 이름 (행정코드, 코드가 없는 지역은 '부산_영도구' 같은 지역 키)
+ * @returns {Promise<Object>} { 프랜차이즈: [[이름, 주소], ...] }
+ */
+function fetchStoreShard(sigCd) {
+    const cacheKey = `${selectedDate}/${sigCd}`;
+    if (!storeShardCache.has(cacheKey)) {
+        storeShardCache.set(cacheKey, fetch(`data/${selectedDate}/agg/stores/${encodeURIComponent(sigCd)}.json`)
+            .then(response => response.ok ? response.json() : {})
+            .catch(() => ({})));
+    }
+    return storeShardCache.get(cacheKey);
+}
+
+/**
+ * 집계된 지역의 매장 상세 정보를 필요할 때만 불러온다.
+ *
+ * @param {Object} region - 집계 데이터의 지역 객체
+ * @returns {Promise<Object>} { 프랜차이즈: [{ name, address }] }
+ */
+async function loadStoreDetails(region) {
+    const storeDetails = Object.fromEntries(aggregateData.brands.map(f => [f, []]));
+    if (!region) return storeDetails;
+
+    const shards = await Promise.all(region.shards.map(fetchStoreShard));
+    shards.forEach(shard => {
+        Object.entries(shard).forEach(([franchise, stores]) => {
+            storeDetails[franchise].push(...stores.map(([name, address]) => ({ name, address })));
+        });
+    });
+    return storeDetails;
+}
+
 /**
  * korea.geojson을 한 번만 로드하여 반환하는 함수
  */
 async function fetchGeojsonData() {
     try {
+        // 단순화된 경계 파일을 먼저 시도
+        const simplified = await fetch(`data/geo/korea.${geojsonResolution}.geojson`);
+        if (simplified.ok) {
+            return await simplified.json();
+        }
         const response = await fetch('data/korea.geojson');
         return await response.json();
     } catch (error) {
@@ -172,6 +257,13 @@ function getStoreCounts(area, prov) {
     // 현재 클릭된(또는 보여줄) 행정구역을 위한 키
     const targetKey = constructKey({ prov, area: area.replace(/\s+/g, '') });
 
+    // 집계 데이터가 있으면 매장 배열을 다시 순회하지 않고 바로 조회
+    // (매장 상세 정보는 loadStoreDetails로 필요할 때 불러온다)
+    if (aggregateData) {
+        const region = aggregateData.index[separateDistrict ? 'district' : 'city'].get(targetKey);
+        return { counts: region ? { ...region.countMap } : {}, storeDetails: null, region };
+    }
+
     // 프랜차이즈 데이터를 순회하면서 targetKey와 일치하는 매장 수를 계산
     Object.entries(franchiseData).forEach(([franchise, data]) => {
         // 'hu'는 인구/면적 데이터이므로 매장 정보 계산에서 제외
@@ -227,49 +319,62 @@ function calculateRatios() {
         return `${item.prov} ${normalizedArea}`;
     }
 
-    // 먼저 'hu'(인구/면적) 데이터를 regions Map에 넣어둔다
-    franchiseData.hu.forEach(item => {
-        const key = constructKey(item);
-        const displayArea = getDisplayName(item);
-
-        // 아직 해당 key가 없으면 새로 생성
-        if (!regions.has(key)) {
-            regions.set(key, {
-                prov: item.prov,
-                area: displayArea,
-                // 프랜차이즈별 매장 수 기본값: 0
-                counts: Object.fromEntries(Object.keys(franchiseNames).map(f => [f, 0])),
-                land: 0,
-                people: 0
+    if (aggregateData) {
+        // 집계 데이터가 있으면 지역 목록과 매장 수를 그대로 사용 (O(지역 수))
+        aggregateData.views[separateDistrict ? 'district' : 'city'].forEach(region => {
+            regions.set(region.key, {
+                prov: region.prov,
+                area: region.area,
+                counts: { ...region.countMap },
+                land: region.land,
+                people: region.people
             });
-        }
-        const region = regions.get(key);
-        // 면적, 인구 합산
-        region.land += parseFloat(item.land) || 0;
-        region.people += parseFloat(item.people) || 0;
-    });
-
-    // 이후 나머지 프랜차이즈 데이터(hu 제외)로 매장 수를 regions에 누적
-    Object.entries(franchiseData).forEach(([franchise, data]) => {
-        if (franchise === 'hu') return; // 인구/면적 데이터는 skip
-        data.forEach(item => {
+        });
+    } else {
+        // 먼저 'hu'(인구/면적) 데이터를 regions Map에 넣어둔다
+        franchiseData.hu.forEach(item => {
             const key = constructKey(item);
-            if (regions.has(key)) {
-                regions.get(key).counts[franchise]++;
+            const displayArea = getDisplayName(item);
+
+            // 아직 해당 key가 없으면 새로 생성
+            if (!regions.has(key)) {
+                regions.set(key, {
+                    prov: item.prov,
+                    area: displayArea,
+                    // 프랜차이즈별 매장 수 기본값: 0
+                    counts: Object.fromEntries(Object.keys(franchiseNames).map(f => [f, 0])),
+                    land: 0,
+                    people: 0
+                });
             }
+            const region = regions.get(key);
+            // 면적, 인구 합산
+            region.land += parseFloat(item.land) || 0;
+            region.people += parseFloat(item.people) || 0;
         });
-    });
+
+        // 이후 나머지 프랜차이즈 데이터(hu 제외)로 매장 수를 regions에 누적
+        Object.entries(franchiseData).forEach(([franchise, data]) => {
+            if (franchise === 'hu') return; // 인구/면적 데이터는 skip
+            data.forEach(item => {
+                const key = constructKey(item);
+                if (regions.has(key)) {
+                    regions.get(key).counts[franchise]++;
+                }
+            });
+        });
+    }
+
+    // 분자(체크된 프랜차이즈) 목록
+    const numerators = Array.from(document.querySelectorAll('input[name="numerator"]:checked'))
+        .map(checkbox => checkbox.value);
+    // 분모(체크된 프랜차이즈) 목록
+    const denominators = Array.from(document.querySelectorAll('input[name="denominator"]:checked'))
+        .map(checkbox => checkbox.value);
 
     // 선택된 분자/분모(체크박스)를 이용하여 비율 계산
     const regionArray = Array.from(regions.values());
     return regionArray.map(region => {
-        // 분자(체크된 프랜차이즈) 목록
-        const numerators = Array.from(document.querySelectorAll('input[name="numerator"]:checked'))
-            .map(checkbox => checkbox.value);
-        // 분모(체크된 프랜차이즈) 목록
-        const denominators = Array.from(document.querySelectorAll('input[name="denominator"]:checked'))
-            .map(checkbox => checkbox.value);
-
         // 분자 합계
         const numeratorSum = numerators.reduce((sum, f) => sum + (region.counts[f] || 0), 0);
         // 분모 합계
@@ -364,15 +469,20 @@ function updateMapColors(geojsonData, ratios) {
     // GeoJSON 데이터를 processGeojsonData로 가공
     const processedGeojson = processGeojsonData(geojsonData);
 
+    // 행정코드 -> 비율 정보 (feature마다 hu/ratios를 검색하지 않도록 한 번만 만든다)
+    const ratioByKey = new Map(ratios.map(r => [`${r.prov} ${r.area}`, r]));
+    const huBySigCd = new Map(franchiseData.hu.map(item => [item.sig_cd, item]));
+    const findRegion = sigCd => {
+        const huData = huBySigCd.get(sigCd);
+        return huData ? ratioByKey.get(`${huData.prov} ${huData.area}`) : undefined;
+    };
+
     // 실제 지도에 GeoJSON 레이어 생성
     geojsonLayer = L.geoJSON(processedGeojson, {
         // 스타일 지정
         style: function (feature) {
             // feature.properties.sig_cd => 행정코드
-            const huData = franchiseData.hu.find(item => item.sig_cd === feature.properties.sig_cd);
-            const region = ratios.find(r =>
-                huData && r.area === huData.area && r.prov === huData.prov
-            );
+            const region = findRegion(feature.properties.sig_cd);
 
             // ratio 값에 따른 색상 결정 (minValue == maxValue이면 흰색 처리)
             let fillCol = '#ffffff';
@@ -406,14 +516,8 @@ function updateMapColors(geojsonData, ratios) {
                 },
                 // 영역 클릭 시 상세 정보 모달 표시
                 click: function (e) {
-                    // GeoJSON 객체의 행정코드로부터 해당 지역의 인구/면적 데이터를 찾음
-                    const huData = franchiseData.hu.find(item => 
-                        item.sig_cd === feature.properties.sig_cd
-                    );
-                    // 찾은 지역 데이터로부터 계산된 비율 정보를 찾음
-                    const region = ratios.find(r =>
-                        huData && r.area === huData.area && r.prov === huData.prov
-                    );
+                    // GeoJSON 객체의 행정코드로부터 계산된 비율 정보를 찾음
+                    const region = findRegion(feature.properties.sig_cd);
                     
                     // 지역 정보가 있으면 모달 표시를 위한 가상의 테이블 행을 생성
                     if (region) {
@@ -443,12 +547,7 @@ function updateMapColors(geojsonData, ratios) {
             });
 
             // 툴팁 바인딩(지역명, 비율)
-            const huData = franchiseData.hu.find(item =>
-                item.sig_cd === feature.properties.sig_cd
-            );
-            const region = ratios.find(r =>
-                huData && r.area === huData.area && r.prov === huData.prov
-            );
+            const region = findRegion(feature.properties.sig_cd);
             layer.bindTooltip(
                 `${feature.properties.name}<br>비율: ${region ? region.ratio.toFixed(2) : 'N/A'}`,
                 { sticky: true } 
@@ -527,11 +626,16 @@ function updateTable(ratios) {
  * @returns {Object} 가공된 GeoJSON
  */
 function processGeojsonData(geojsonData) {
+    // build_geometry.py 결과물에는 prov/name/sig_cd가 이미 들어 있다
+    if (geojsonData.features.every(feature => feature.properties.name && feature.properties.sig_cd)) {
+        return geojsonData;
+    }
+    const huBySigCd = new Map(franchiseData.hu.map(item => [item.sig_cd, item]));
     return {
         ...geojsonData,
         features: geojsonData.features.map(feature => {
             const sigCd = feature.properties.SIG_CD;
-            const huData = franchiseData.hu.find(item => item.sig_cd === sigCd);
+            const huData = huBySigCd.get(sigCd);
             const areaName = feature.properties.SIG_KOR_NM; 
             const sidonm = huData ? huData.prov : '';
 
@@ -652,7 +756,7 @@ function showDetails(row) {
  * 
  * @param {HTMLElement} element - 클릭된 <span class="franchise-count"> 요소
  */
-function handleStoreClick(element) {
+async function handleStoreClick(element) {
     // 만약 disabled 클래스가 있으면(체크 안 된 항목) 동작 안 함
     if (element.classList.contains('disabled')) return;
 
@@ -662,14 +766,15 @@ function handleStoreClick(element) {
     const modalTitle = document.querySelector('#detail-modal .detail-header h2').textContent;
     const [prov, area] = modalTitle.split(' ');
 
-    // 해당 지역의 매장 상세 정보 가져오기
-    const { storeDetails } = getStoreCounts(area, prov);
-
     // 바로 뒤에 있는 <div class="store-list"> 요소를 찾아 표시/숨김 토글
     const storeListEl = element.nextElementSibling;
 
     if (!storeListEl.style.display || storeListEl.style.display === 'none') {
         storeListEl.style.display = 'block';
+
+        // 해당 지역의 매장 상세 정보 가져오기 (집계 데이터 사용 시 해당 지역 조각만 불러옴)
+        const counts = getStoreCounts(area, prov);
+        const storeDetails = counts.storeDetails || await loadStoreDetails(counts.region);
         storeListEl.innerHTML = `
             <ul style="list-style: none; padding: 0; margin: 10px 0;">
                 ${storeDetails[franchise].map(store => `
@@ -884,8 +989,8 @@ async function showNotice() {
     }
 
     try {
-        // 공지사항 파일(예: notice.txt) 로드
-        const response = await fetch('data/notice.txt?t=' + now);
+        // 공지사항 파일(예: notice.txt) 로드, 매번 서버에 변경 여부(ETag)를 확인한다
+        const response = await fetch('data/notice.txt', { cache: 'no-cache' });
         if (!response.ok) throw new Error('Notice file not found');
 
         // 텍스트 내용 읽어서 모달에 삽입